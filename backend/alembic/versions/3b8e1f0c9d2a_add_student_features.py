@@ -0,0 +1,51 @@
+"""add student_features table
+
+Revision ID: 3b8e1f0c9d2a
+Revises: 672a9336714f
+Create Date: 2026-10-18 10:12:41.205318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8e1f0c9d2a"
+down_revision: Union[str, Sequence[str], None] = "672a9336714f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are backfilled lazily: app/ml/features.py rebuilds a student's
+    # window from emotional_checkins the first time it is missing.
+    op.create_table(
+        "student_features",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("checkin_count", sa.Integer(), nullable=False),
+        sa.Column("mood_sum", sa.Integer(), nullable=False),
+        sa.Column("bad_days", sa.Integer(), nullable=False),
+        sa.Column("pressure_sum", sa.Integer(), nullable=False),
+        sa.Column("recent_moods", sa.JSON(), nullable=False),
+        sa.Column("recent_pressures", sa.JSON(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("student_features")
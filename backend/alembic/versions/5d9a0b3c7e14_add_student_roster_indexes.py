@@ -0,0 +1,51 @@
+"""add student roster indexes
+
+Revision ID: 5d9a0b3c7e14
+Revises: 8c41d7e2a5b6
+Create Date: 2026-10-18 15:02:27.640193
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d9a0b3c7e14"
+down_revision: Union[str, Sequence[str], None] = "8c41d7e2a5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_alerts_user_id_is_resolved",
+        "alerts",
+        ["user_id", "is_resolved"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_assessment_responses_user_id_created_at",
+        "assessment_responses",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_risk_summaries_current_risk_level"),
+        "risk_summaries",
+        ["current_risk_level"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_risk_summaries_current_risk_level"), table_name="risk_summaries"
+    )
+    op.drop_index(
+        "ix_assessment_responses_user_id_created_at",
+        table_name="assessment_responses",
+    )
+    op.drop_index("ix_alerts_user_id_is_resolved", table_name="alerts")
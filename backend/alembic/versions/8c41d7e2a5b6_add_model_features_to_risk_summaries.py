@@ -0,0 +1,31 @@
+"""add model_features to risk_summaries
+
+Revision ID: 8c41d7e2a5b6
+Revises: 3b8e1f0c9d2a
+Create Date: 2026-10-18 12:40:05.117842
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d7e2a5b6"
+down_revision: Union[str, Sequence[str], None] = "3b8e1f0c9d2a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "risk_summaries", sa.Column("model_features", sa.JSON(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("risk_summaries", "model_features")
@@ -0,0 +1,71 @@
+"""add student_dashboard table
+
+Revision ID: 9e2c4a7b1f30
+Revises: 5d9a0b3c7e14
+Create Date: 2026-10-18 16:40:12.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e2c4a7b1f30"
+down_revision: Union[str, Sequence[str], None] = "5d9a0b3c7e14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backfill with scripts/rebuild_dashboard.py; until then, rows are
+    # rebuilt the first time a student's data changes.
+    op.create_table(
+        "student_dashboard",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("risk_level", sa.String(), nullable=True),
+        sa.Column("active_alerts", sa.Integer(), nullable=False),
+        sa.Column("last_assessment_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_checkin_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("mood_avg_7d", sa.Float(), nullable=True),
+        sa.Column("checkin_count", sa.Integer(), nullable=False),
+        sa.Column("mood_total", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index(
+        "ix_student_dashboard_risk_level_user_id",
+        "student_dashboard",
+        ["risk_level", "user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_student_dashboard_last_assessment_date_user_id",
+        "student_dashboard",
+        ["last_assessment_date", "user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_student_dashboard_last_assessment_date_user_id",
+        table_name="student_dashboard",
+    )
+    op.drop_index(
+        "ix_student_dashboard_risk_level_user_id", table_name="student_dashboard"
+    )
+    op.drop_table("student_dashboard")
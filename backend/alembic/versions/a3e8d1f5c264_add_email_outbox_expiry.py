@@ -0,0 +1,46 @@
+"""add email_outbox expires_at
+
+Revision ID: a3e8d1f5c264
+Revises: f7c3e9a2b416
+Create Date: 2026-10-19 11:27:40.551983
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e8d1f5c264"
+down_revision: Union[str, Sequence[str], None] = "f7c3e9a2b416"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Null in the existing rows: their token is plaintext (see
+    # app/services/email_outbox_service.py), new rows store it encrypted
+    op.add_column(
+        "email_outbox",
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Pending reset messages whose 15-minute token has already expired
+    op.execute(
+        "UPDATE email_outbox SET status = 'expired', token = NULL "
+        "WHERE status = 'pending' AND kind = 'password_reset' "
+        "AND created_at < now() - interval '15 minutes'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Encrypted tokens cannot be sent by the previous code
+    op.execute(
+        "UPDATE email_outbox SET status = 'failed', token = NULL "
+        "WHERE status = 'pending' AND expires_at IS NOT NULL"
+    )
+    op.execute("UPDATE email_outbox SET status = 'failed' WHERE status = 'expired'")
+    op.drop_column("email_outbox", "expires_at")
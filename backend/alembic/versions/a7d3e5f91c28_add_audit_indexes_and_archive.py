@@ -0,0 +1,71 @@
+"""add audit log indexes and archive table
+
+Revision ID: a7d3e5f91c28
+Revises: 9e2c4a7b1f30
+Create Date: 2026-10-18 18:21:05.902477
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3e5f91c28"
+down_revision: Union[str, Sequence[str], None] = "9e2c4a7b1f30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("timestamp_id", ["timestamp", "id"]),
+    ("actor_id_timestamp", ["actor_id", "timestamp"]),
+    ("action_timestamp", ["action", "timestamp"]),
+    ("resource_id_timestamp", ["resource_id", "timestamp"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for suffix, columns in INDEXES:
+        op.create_index(f"ix_audit_logs_{suffix}", "audit_logs", columns, unique=False)
+
+    op.create_table(
+        "audit_logs_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("resource_id", sa.String(), nullable=True),
+        sa.Column("details", sa.Text(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["actor_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for suffix, columns in INDEXES:
+        op.create_index(
+            f"ix_audit_logs_archive_{suffix}",
+            "audit_logs_archive",
+            columns,
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for suffix, _ in INDEXES:
+        op.drop_index(
+            f"ix_audit_logs_archive_{suffix}", table_name="audit_logs_archive"
+        )
+    op.drop_table("audit_logs_archive")
+    for suffix, _ in INDEXES:
+        op.drop_index(f"ix_audit_logs_{suffix}", table_name="audit_logs")
@@ -0,0 +1,89 @@
+"""add composite and partial indexes for the hot access paths
+
+Written for PostgreSQL (CREATE INDEX CONCURRENTLY, partial indexes). The
+chain cannot be replayed on SQLite from the start (ee919c602f91 alters
+columns), so check the DDL with `alembic upgrade e4b7c2d9a615:b5f8a1c3d702
+--sql` against a PostgreSQL URI, or apply it to a real database.
+
+Revision ID: b5f8a1c3d702
+Revises: e4b7c2d9a615
+Create Date: 2026-10-18 21:12:44.318206
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5f8a1c3d702"
+down_revision: Union[str, Sequence[str], None] = "e4b7c2d9a615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+COMPOSITE_INDEXES = [
+    (
+        "ix_emotional_checkins_user_id_created_at",
+        "emotional_checkins",
+        ["user_id", "created_at"],
+    ),
+    (
+        "ix_clinical_notes_student_id_created_at",
+        "clinical_notes",
+        ["student_id", "created_at"],
+    ),
+    ("ix_alerts_is_resolved_severity", "alerts", ["is_resolved", "severity"]),
+]
+
+TOKEN_TABLES = ["email_verification_tokens", "password_reset_tokens"]
+
+UNUSED = sa.text("used_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Outside the migration transaction so PostgreSQL can build the indexes
+    # CONCURRENTLY, without blocking writes to tables with millions of rows
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True
+            )
+        for table in TOKEN_TABLES:
+            op.create_index(
+                f"ix_{table}_token_hash_unused",
+                table,
+                ["token_hash"],
+                unique=False,
+                postgresql_where=UNUSED,
+                sqlite_where=UNUSED,
+                postgresql_concurrently=True,
+            )
+
+    # Superseded by the indexes above
+    op.drop_index(
+        op.f("ix_emotional_checkins_user_id"), table_name="emotional_checkins"
+    )
+    for table in TOKEN_TABLES:
+        op.drop_index(op.f(f"ix_{table}_token_hash"), table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TOKEN_TABLES:
+        op.create_index(
+            op.f(f"ix_{table}_token_hash"), table, ["token_hash"], unique=False
+        )
+    op.create_index(
+        op.f("ix_emotional_checkins_user_id"),
+        "emotional_checkins",
+        ["user_id"],
+        unique=False,
+    )
+    for table in TOKEN_TABLES:
+        op.drop_index(f"ix_{table}_token_hash_unused", table_name=table)
+    for name, table, _ in reversed(COMPOSITE_INDEXES):
+        op.drop_index(name, table_name=table)
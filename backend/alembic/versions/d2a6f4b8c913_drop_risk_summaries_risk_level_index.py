@@ -0,0 +1,37 @@
+"""drop the risk_summaries current_risk_level index
+
+Revision ID: d2a6f4b8c913
+Revises: b5f8a1c3d702
+Create Date: 2026-10-19 09:14:52.604118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a6f4b8c913"
+down_revision: Union[str, Sequence[str], None] = "b5f8a1c3d702"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The roster and the report filter on student_dashboard.risk_level; no
+    # query filters risk_summaries by level any more, so the index only
+    # slowed down every risk update
+    op.drop_index(
+        op.f("ix_risk_summaries_current_risk_level"), table_name="risk_summaries"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_risk_summaries_current_risk_level"),
+        "risk_summaries",
+        ["current_risk_level"],
+        unique=False,
+    )
@@ -1 +1,7 @@
 """Init module."""
+
+import time
+
+# Taken when the package is first imported, before app.main pulls in every
+# router and service, so the startup time reported by /health covers them
+import_started = time.perf_counter()
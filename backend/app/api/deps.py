@@ -1,14 +1,18 @@
-from typing import Generator, List
+from typing import AsyncGenerator, Generator, List
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.logging import log_security_event
-from app.db.session import SessionLocal
+from app.core.principal_cache import principal_cache
+from app.db.replica import replica_router
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.models.user import User, UserRole
 from app.schemas.auth import TokenPayload
 
@@ -24,23 +28,21 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(reusable_oauth2),
-) -> User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Con esta funcion Recibimos el token y conexion a DB.
-    Si falla muestra 401
-    Se busca el ID, Si no existe el usuario muestra 404
-    Si no esta activo muestra 400
-    Si todo esta bien retorna el usuario
+    Sesión asíncrona para los endpoints `async def`: la espera a la DB no
+    ocupa un hilo del threadpool.
     """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 
+def _decode_token(token: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (jwt.JWTError, ValidationError) as e:
         log_security_event("INVALID_TOKEN", f"Token validation failed: {str(e)}")
         raise HTTPException(
@@ -48,21 +50,85 @@ def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(User).filter(User.id == token_data.sub).first()
+
+
+def _check_user(user: User, user_id: int) -> User:
     if not user:
-        log_security_event(
-            "USER_NOT_FOUND", f"User with ID {token_data.sub} not in database"
-        )
+        log_security_event("USER_NOT_FOUND", f"User with ID {user_id} not in database")
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         log_security_event(
             "INACTIVE_USER", f"User {user.email} attempted access while inactive"
         )
         raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(reusable_oauth2),
+) -> User:
+    """
+    Con esta funcion Recibimos el token y conexion a DB.
+    Si falla muestra 401
+    Se busca el ID, Si no existe el usuario muestra 404
+    Si no esta activo muestra 400
+    Si todo esta bien retorna el usuario
+    El usuario se guarda en la caché de principales (por id y token), así las
+    siguientes peticiones con el mismo token no consultan la tabla users
+    """
+    token_data = _decode_token(token)
+    # Tags the session's writes for read-your-writes (app/db/replica.py)
+    db.info["user_id"] = token_data.sub
+    user = principal_cache.get(db, token_data.sub, token)
+    if user is not None:
+        return user
 
+    user = db.query(User).filter(User.id == token_data.sub).first()
+    _check_user(user, token_data.sub)
+    principal_cache.put(token_data.sub, token, user)
     return user
 
 
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(reusable_oauth2),
+) -> User:
+    """
+    Igual que get_current_user, para los endpoints asíncronos.
+    """
+    token_data = _decode_token(token)
+    db.info["user_id"] = token_data.sub
+    user = principal_cache.lookup(token_data.sub, token)
+    if user is not None:
+        return await db.merge(user, load=False)
+
+    user = await db.scalar(select(User).where(User.id == token_data.sub))
+    _check_user(user, token_data.sub)
+    principal_cache.put(token_data.sub, token, user)
+    return user
+
+
+def get_read_db(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Generator:
+    """
+    Sesión para lecturas del staff y reportes que toleran unos segundos de
+    retraso: una réplica al día (ver app/db/replica.py) si el usuario no
+    escribió recientemente; si no, la misma sesión del primario.
+    Solo para endpoints de lectura.
+    """
+    replica_db = replica_router.session_for(current_user.id)
+    if replica_db is None:
+        yield db
+        return
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
 class RoleChecker:
     """
     La clase RoleChecker es una fabrica de dependencias que permite reutilizar
@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import (
     alerts,
     assessments,
+    audit,
     auth,
     checkins,
     clinical_notes,
@@ -30,6 +31,7 @@ api_router.include_router(risk.router, prefix="/risk", tags=["risk"])
 
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(students.router, prefix="/students", tags=["students"])
+api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
 api_router.include_router(
     clinical_notes.router, prefix="/clinical-notes", tags=["clinical-notes"]
 )
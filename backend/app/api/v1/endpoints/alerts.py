@@ -2,11 +2,14 @@ from datetime import datetime
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
 from app.services.audit_service import log_access
+from app.services.dashboard_service import dashboard_service
 
 router = APIRouter()
 
@@ -15,7 +18,7 @@ router = APIRouter()
 def read_all_alerts(
     risk_level: str = None,
     status: str = None,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: models.user.User = Depends(deps.get_psychologist_user),
 ) -> Any:
     """
@@ -41,9 +44,9 @@ def read_all_alerts(
 
 
 @router.get("/me", response_model=List[schemas.alert.Alert])
-def read_my_alerts(
-    db: Session = Depends(deps.get_db),
-    current_user: models.user.User = Depends(deps.get_current_user),
+async def read_my_alerts(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.user.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Esta funcion verifica si esta autenticado o no,
@@ -51,11 +54,10 @@ def read_my_alerts(
     y al final ejecuta y retorna lo pedido
     """
 
-    return (
-        db.query(models.alert.Alert)
-        .filter(models.alert.Alert.user_id == current_user.id)
-        .all()
+    result = await db.scalars(
+        select(models.alert.Alert).where(models.alert.Alert.user_id == current_user.id)
     )
+    return result.all()
 
 
 @router.put("/{alert_id}", response_model=schemas.alert.Alert)
@@ -80,6 +82,11 @@ def resolve_alert(
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
+    # Resolver resta una alerta activa del panel; reabrirla la suma
+    if alert.is_resolved != alert_in.is_resolved:
+        dashboard_service.record_alerts(
+            db, alert.user_id, -1 if alert_in.is_resolved else 1
+        )
     alert.is_resolved = alert_in.is_resolved
     if alert_in.is_resolved:
         alert.resolved_at = datetime.utcnow()
@@ -22,7 +22,7 @@ Luego retorna todos los cuestionarios disponibles
     dependencies=[Depends(deps.get_current_user)],
 )
 def read_assessments(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
 ) -> Any:
     return db.query(models.assessment.Assessment).all()
 
@@ -30,7 +30,7 @@ def read_assessments(
 @router.get("/{key}", response_model=schemas.assessment.Assessment)
 def read_assessment_by_key(
     key: str,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: models.user.User = Depends(deps.get_current_user),
 ) -> Any:
     assessment = (
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.api import deps
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_after
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=schemas.common.CursorPage[schemas.audit_log.AuditLogEntry],
+)
+def read_audit_logs(
+    actor_id: Optional[int] = None,
+    action: Optional[str] = None,
+    resource_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    archived: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(deps.get_db),
+    current_user: models.user.User = Depends(deps.get_admin_user),
+) -> Any:
+    """
+    Consulta el registro de auditoría para revisiones de cumplimiento.
+    Solo administradores. Filtros por actor, acción, recurso y rango de fechas
+    (`since` inclusive, `until` exclusiva), cada uno con su índice; del más
+    reciente al más antiguo, paginado por cursor (`next_cursor`).
+    `archived=true` consulta las entradas movidas al archivo por la retención.
+    """
+    if since is not None and until is not None and since > until:
+        raise HTTPException(status_code=400, detail="Rango de fechas inválido")
+    try:
+        position = decode_cursor(cursor) if cursor else None
+        if position is not None:
+            position = (datetime.fromisoformat(position["ts"]), int(position["id"]))
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    entry = models.AuditLogArchive if archived else models.AuditLog
+    query = db.query(entry)
+    if actor_id is not None:
+        query = query.filter(entry.actor_id == actor_id)
+    if action is not None:
+        query = query.filter(entry.action == action)
+    if resource_id is not None:
+        query = query.filter(entry.resource_id == resource_id)
+    if since is not None:
+        query = query.filter(entry.timestamp >= since)
+    if until is not None:
+        query = query.filter(entry.timestamp < until)
+
+    keys = [entry.timestamp, entry.id]
+    if position is not None:
+        query = query.filter(keyset_after(keys, position, descending=True))
+    # One extra row tells whether there is a next page
+    rows = query.order_by(*(k.desc() for k in keys)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor({"ts": last.timestamp.isoformat(), "id": last.id})
+    return {"items": rows, "size": limit, "next_cursor": next_cursor}
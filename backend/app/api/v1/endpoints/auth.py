@@ -5,6 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
@@ -13,33 +15,34 @@ from app.core import security
 from app.core.config import settings
 from app.core.limiter import limiter
 from app.core.logging import log_security_event
+from app.core.principal_cache import principal_cache
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=schemas.auth.Token)
 @limiter.limit("5/minute")
-def login_access_token(
+async def login_access_token(
     # El request:Request es necesario par que el limiter sepa cual es el IP
     request: Request,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     # En el form_data  FastAPI usa OAuth2PasswordRequestForm para obtener datos
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     El limiter impide que alguien intente adivinar contaseñas por medio de scripts
     Solo permite 5 intentos de login por minuto desde la misma IP
+    Es asíncrono: mientras el pool de hashing verifica la contraseña no se
+    ocupa un hilo del threadpool (una avalancha de logins no bloquea al resto)
     """
-    user = (
-        db.query(models.user.User)
-        .filter(models.user.User.email == form_data.username)
-        .first()
+    user = await db.scalar(
+        select(models.user.User).where(models.user.User.email == form_data.username)
     )
     # El verified admite la contraseña como correcta
     # El new hash genera un nuevo hash si la contraseña es correcta pero el hash es viejo
     verified, new_hash = False, None
     if user:
-        verified, new_hash = security.verify_and_update_password(
+        verified, new_hash = await security.verify_and_update_password_async(
             form_data.password, user.hashed_password
         )
     """
@@ -71,8 +74,8 @@ def login_access_token(
     """
     if new_hash:
         user.hashed_password = new_hash
-        db.add(user)
-        db.commit()
+        await db.commit()
+        principal_cache.invalidate(user.id)
 
     log_security_event(
         "LOGIN_SUCCESS", f"User {user.email} logged in successfully", level=10
@@ -250,6 +253,7 @@ def change_required_password(
     """
     db.add(current_user)
     db.commit()
+    principal_cache.invalidate(current_user.id)
     db.refresh(current_user)
 
     log_security_event(
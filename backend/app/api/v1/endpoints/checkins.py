@@ -1,19 +1,23 @@
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
 from app.core.logging import log_security_event
+from app.ml.features import feature_store
+from app.services.dashboard_service import dashboard_service
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=List[schemas.emotional_checkin.EmotionalCheckin])
-def read_my_checkins(
-    db: Session = Depends(deps.get_db),
-    current_user: models.user.User = Depends(deps.get_current_user),
+async def read_my_checkins(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.user.User = Depends(deps.get_current_user_async),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -21,44 +25,53 @@ def read_my_checkins(
     Este def retorna todos los checkins (emociones) del usuario autenticado
     en caso de no estar autenticado retorna un error 401
     """
-    return (
-        db.query(models.emotional_checkin.EmotionalCheckin)
-        .filter(models.emotional_checkin.EmotionalCheckin.user_id == current_user.id)
+    result = await db.scalars(
+        select(models.emotional_checkin.EmotionalCheckin)
+        .where(models.emotional_checkin.EmotionalCheckin.user_id == current_user.id)
         .offset(skip)
         .limit(limit)
-        .all()
     )
+    return result.all()
 
 
 @router.post("/", response_model=schemas.emotional_checkin.EmotionalCheckin)
-def create_checkin(
+async def create_checkin(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     checkin_in: schemas.emotional_checkin.EmotionalCheckinCreate,
-    current_user: models.user.User = Depends(deps.get_current_user),
+    current_user: models.user.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Este def primero verifica que el usuario esté autenticado.
     Recibe los datos con el estado de ánimo, obtiene el id del usuario
     con el current_user para crear el checkin (mood, notes).
-    Add (prepara), Commit (guarda) y luego se refrescan los datos
+    Add (prepara), actualiza las features de riesgo y el panel del
+    estudiante en la misma transacción, Commit (guarda) y luego se refrescan los datos
     para obtener el id del checkin creado.
     Retorna el checkin creado.
     """
     db_obj = models.emotional_checkin.EmotionalCheckin(
         **checkin_in.model_dump(), user_id=current_user.id
     )
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+
+    # Los servicios de features y panel son síncronos: run_sync les da la
+    # vista síncrona de la misma sesión y transacción
+    def record(session: Session) -> None:
+        session.add(db_obj)
+        features = feature_store.record_checkin(session, db_obj)
+        dashboard_service.record_checkin(session, db_obj, features)
+
+    await db.run_sync(record)
+    await db.commit()
+    await db.refresh(db_obj)
     return db_obj
 
 
 @router.get("/{checkin_id}", response_model=schemas.emotional_checkin.EmotionalCheckin)
-def read_checkin(
+async def read_checkin(
     checkin_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.user.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.user.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Este def retorna un checkin (emoción) por su id.
@@ -67,11 +80,7 @@ def read_checkin(
     Si el usuario es Admin, puede acceder a cualquier checkin.
     Si no tiene permisos, retorna error 403.
     """
-    checkin = (
-        db.query(models.emotional_checkin.EmotionalCheckin)
-        .filter(models.emotional_checkin.EmotionalCheckin.id == checkin_id)
-        .first()
-    )
+    checkin = await db.get(models.emotional_checkin.EmotionalCheckin, checkin_id)
 
     if not checkin:
         raise HTTPException(
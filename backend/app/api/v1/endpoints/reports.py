@@ -7,13 +7,14 @@ from sqlalchemy.orm import Session
 
 from app import models
 from app.api import deps
+from app.models.student_dashboard import NO_ASSESSMENT_DATE
 
 router = APIRouter()
 
 
 @router.get("/aggregated", response_model=Dict[str, Any])
 def get_institutional_report(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: models.user.User = Depends(deps.get_staff_user),
 ) -> Any:
     """
@@ -29,19 +30,24 @@ def get_institutional_report(
         .count()
     )
 
-    # Obtiene estadísticas agrupadas por nivel de riesgo
+    # Distribución de riesgo y promedio de ánimo desde el panel materializado
+    # de estudiantes, sin recorrer las tablas de historial. Solo cuentan los
+    # estudiantes evaluados (los que tienen resumen de riesgo)
+    dashboard = models.StudentDashboard
     risk_stats = (
-        db.query(
-            models.RiskSummary.current_risk_level, func.count(models.RiskSummary.id)
-        )
-        .group_by(models.RiskSummary.current_risk_level)
+        db.query(dashboard.risk_level, func.count(dashboard.user_id))
+        .filter(dashboard.last_assessment_date > NO_ASSESSMENT_DATE)
+        .group_by(dashboard.risk_level)
         .all()
     )
 
     risk_dist = {level: count for level, count in risk_stats}
 
-    # Calcula el promedio global de los puntajes de ánimo
-    avg_mood = db.query(func.avg(models.EmotionalCheckin.mood_score)).scalar() or 0.0
+    # Promedio global de los puntajes de ánimo: suma total / cantidad total
+    mood_total, checkin_count = db.query(
+        func.sum(dashboard.mood_total), func.sum(dashboard.checkin_count)
+    ).one()
+    avg_mood = mood_total / checkin_count if checkin_count else 0.0
 
     return {
         "total_population": total_students,
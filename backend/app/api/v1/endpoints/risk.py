@@ -1,18 +1,23 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
+from app.db import session as db_session
+from app.ml.risk_classifier import risk_classifier
+from app.services.rescoring_service import rescoring_service
 
 router = APIRouter()
 
 
 @router.get("/me/summary", response_model=schemas.risk_summary.RiskSummary)
-def read_my_risk_summary(
-    db: Session = Depends(deps.get_db),
-    current_user: models.user.User = Depends(deps.get_current_user),
+async def read_my_risk_summary(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.user.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Retorna el resumen de riesgo del usuario autenicado.
@@ -20,10 +25,10 @@ def read_my_risk_summary(
     """
 
     # Busca el resumen de riesgo en la DB
-    summary = (
-        db.query(models.risk_summary.RiskSummary)
-        .filter(models.risk_summary.RiskSummary.user_id == current_user.id)
-        .first()
+    summary = await db.scalar(
+        select(models.risk_summary.RiskSummary).where(
+            models.risk_summary.RiskSummary.user_id == current_user.id
+        )
     )
 
     # Si no existe, retorna un resumen con valores por defecto
@@ -36,3 +41,55 @@ def read_my_risk_summary(
             "last_updated": "2024-01-01T00:00:00",
         }
     return summary
+
+
+@router.get("/model", response_model=schemas.model_info.ModelInfo)
+def read_active_model(
+    current_user: models.user.User = Depends(deps.get_admin_user),
+) -> Any:
+    """
+    Reporta la versión del modelo de riesgo que sirve este worker.
+    Incluye el checksum verificado y las versiones publicadas en el registro.
+    """
+    active = risk_classifier.active
+    registry = risk_classifier.registry
+    return {
+        "version": active.version,
+        "sha256": active.sha256,
+        "source": active.source,
+        "loaded_at": active.loaded_at,
+        "lookup_table": active.lookup_table is not None,
+        "load_seconds": risk_classifier.load_seconds,
+        "registry_active_version": registry.active_version(),
+        "available_versions": registry.list_versions(),
+    }
+
+
+def _run_rescoring() -> None:
+    db = db_session.SessionLocal()
+    try:
+        rescoring_service.rescore_all(db)
+    finally:
+        db.close()
+        rescoring_service.release_run_lock()
+
+
+@router.post("/rescore", status_code=202)
+def rescore_all_students(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(deps.get_db),
+    current_user: models.user.User = Depends(deps.get_admin_user),
+) -> Any:
+    """
+    Lanza en segundo plano la re-evaluación de todos los resúmenes de riesgo
+    con el modelo activo (ej. tras publicar una nueva versión).
+    Para ejecuciones largas y reanudables usar scripts/rescore_students.py.
+    Responde 409 si ya hay una re-evaluación en curso (de la API o del script).
+    """
+    if not rescoring_service.acquire_run_lock(db.get_bind()):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya hay una re-evaluación en curso",
+        )
+    background_tasks.add_task(_run_rescoring)
+    return {"status": "scheduled", "model_version": risk_classifier.active.version}
@@ -1,92 +1,162 @@
-from typing import Any, List
+from datetime import datetime
+from typing import Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
 from app.api import deps
+from app.core.principal_cache import principal_cache
+from app.ml.explainer import risk_explainer
 from app.ml.risk_classifier import risk_classifier
+from app.models.student_dashboard import assessment_date
 from app.services.audit_service import log_access
+from app.utils.pagination import (
+    calculate_pages,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+)
 
 router = APIRouter()
 
+RISK_LEVELS = ("Low", "Medium", "High")
 
-@router.get("/", response_model=List[schemas.student.StudentSummary])
+# Alerts and assessment responses shown by default in a student's profile
+DETAIL_HISTORY_LIMIT = 50
+
+
+@router.get(
+    "/",
+    response_model=schemas.common.PaginatedResponse[schemas.student.StudentSummary],
+)
 def read_students(
-    db: Session = Depends(deps.get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    risk_level: Optional[str] = None,
+    has_active_alerts: Optional[bool] = None,
+    sort: Literal["id", "last_assessment_desc", "last_assessment_asc"] = "id",
+    include_total: bool = False,
+    db: Session = Depends(deps.get_read_db),
     current_user: models.user.User = Depends(deps.get_staff_user),
 ) -> Any:
     """
-    Retorna una lista con el resumen ejecutivo del estado de cada estudiante.
-    Incluye nivel de riesgo, alertas y última evaluación.
+    Retorna una página con el resumen ejecutivo del estado de cada estudiante.
+    Incluye nivel de riesgo, alertas y última evaluación, leídos del panel
+    materializado `student_dashboard` en una sola consulta.
+
+    Paginación por cursor (keyset): `next_cursor` de la respuesta pide la
+    página siguiente, y las páginas profundas cuestan lo mismo que la primera.
+    Filtros: nivel de riesgo y si tiene alertas activas. Orden: por id o por
+    fecha de la última evaluación (los que no tienen evaluaciones van al final
+    en orden descendente y al principio en ascendente).
+
+    `total` y `pages` solo se calculan con `include_total=true` (un COUNT
+    sobre todos los estudiantes que cumplen el filtro): el frontend los pide
+    en la primera página y no en las siguientes.
     """
+    if risk_level is not None and risk_level not in RISK_LEVELS:
+        raise HTTPException(status_code=400, detail="Nivel de riesgo inválido")
+    try:
+        position = decode_cursor(cursor) if cursor else None
+        if position is not None and position.get("sort") != sort:
+            raise ValueError("El cursor pertenece a otro orden")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Obtiene la lista base de estudiantes
-    students = (
-        db.query(models.user.User)
-        .filter(models.user.User.role == models.user.UserRole.STUDENT)
-        .all()
-    )
+    # Lee el panel materializado (una fila por estudiante, creada con el
+    # usuario y mantenida en cada escritura): filtros y orden sobre sus
+    # columnas tal cual, que los índices de student_dashboard resuelven; de
+    # users solo se toman los datos de cada fila por clave primaria
+    dashboard = models.StudentDashboard
+    conditions = []
+    if risk_level is not None:
+        conditions.append(dashboard.risk_level == risk_level)
+    if has_active_alerts is True:
+        conditions.append(dashboard.active_alerts > 0)
+    elif has_active_alerts is False:
+        conditions.append(dashboard.active_alerts == 0)
 
-    summaries = []
+    total = None
+    if include_total:
+        total = db.query(func.count(dashboard.user_id)).filter(*conditions).scalar()
 
-    # Itera sobre cada estudiante para buscar sus registros en otras tablas
-    for student in students:
-        # Busca el riesgo actual del estudiante
-        risk_summary = (
-            db.query(models.RiskSummary)
-            .filter(models.RiskSummary.user_id == student.id)
-            .first()
-        )
-        # Cuenta las alertas pendientes del estudiante
-        active_alerts = (
-            db.query(models.Alert)
-            .filter(
-                models.Alert.user_id == student.id,
-                models.Alert.is_resolved == False,  # noqa: E712
-            )
-            .count()
-        )
-        # Busca la última evaluación del estudiante
-        last_assessment = (
-            db.query(models.AssessmentResponse)
-            .filter(models.AssessmentResponse.user_id == student.id)
-            .order_by(models.AssessmentResponse.created_at.desc())
-            .first()
-        )
-        # Construye el resumen. Si no tiene evaluaciones, asume fecha nula.
-        summaries.append(
-            {
-                "id": student.id,
-                "email": student.email,
-                "full_name": student.full_name,
-                "role": student.role,
-                "risk_level": (
-                    risk_summary.current_risk_level if risk_summary else "Low"
-                ),
-                "active_alerts": active_alerts,
-                "last_assessment_date": (
-                    last_assessment.created_at if last_assessment else None
-                ),
-            }
+    descending = sort == "last_assessment_desc"
+    if sort == "id":
+        keys = [dashboard.user_id]
+    else:
+        keys = [dashboard.last_assessment_date, dashboard.user_id]
+    query = (
+        db.query(
+            dashboard.user_id.label("id"),
+            models.user.User.email,
+            models.user.User.full_name,
+            models.user.User.role,
+            dashboard.risk_level,
+            dashboard.active_alerts,
+            dashboard.last_assessment_date,
         )
+        .join(models.user.User, models.user.User.id == dashboard.user_id)
+        .filter(*conditions)
+    )
+    if position is not None:
+        values = [position["id"]]
+        if sort != "id":
+            values.insert(0, datetime.fromisoformat(position["date"]))
+        query = query.filter(keyset_after(keys, values, descending))
+    query = query.order_by(*(k.desc() if descending else k for k in keys))
 
-    return summaries
+    # One extra row tells whether there is a next page
+    rows = query.limit(limit + 1).all()
+    page = position["page"] + 1 if position else 1
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_position = {"sort": sort, "id": last.id, "page": page}
+        if sort != "id":
+            next_position["date"] = last.last_assessment_date.isoformat()
+        next_cursor = encode_cursor(next_position)
+
+    items = []
+    for row in rows:
+        item = row._asdict()
+        item["last_assessment_date"] = assessment_date(row.last_assessment_date)
+        items.append(item)
+
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": limit,
+        "pages": None if total is None else calculate_pages(total, limit),
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/{student_id}", response_model=schemas.student.StudentDetail)
 def read_student_detail(
     student_id: int,
+    alerts_limit: int = Query(DETAIL_HISTORY_LIMIT, ge=1, le=500),
+    responses_limit: int = Query(DETAIL_HISTORY_LIMIT, ge=1, le=500),
     db: Session = Depends(deps.get_db),
     current_user: models.user.User = Depends(deps.get_staff_user),
 ) -> Any:
     """
     Carga el expediente completo de un estudiante.
-    Reúne datos de riesgo, alertas, evaluaciones y checkins dispersos en la DB.
+    El estudiante, su resumen de riesgo y su fila del panel se leen en una
+    sola consulta; alertas y evaluaciones se limitan a las más recientes
+    (`alerts_limit`, `responses_limit`) e indican si hay más.
     """
-    # Busca al estudiante por ID, asegurando que tenga el rol STUDENT
+    # Busca al estudiante por ID, asegurando que tenga el rol STUDENT, junto
+    # con su resumen de riesgo y su fila del panel (JOINs en la misma consulta)
     student = (
         db.query(models.user.User)
+        .options(
+            joinedload(models.user.User.risk_summary),
+            joinedload(models.user.User.dashboard),
+        )
         .filter(
             models.user.User.id == student_id,
             models.user.User.role == models.user.UserRole.STUDENT,
@@ -97,7 +167,8 @@ def read_student_detail(
     if not student:
         raise HTTPException(status_code=404, detail="Estudiante no encontrado")
 
-    # Registra el acceso al perfil en el log de auditoría
+    # Registra el acceso al perfil en el log de auditoría (en cola, lo escribe
+    # el proceso de auditoría en segundo plano)
     log_access(
         db=db,
         actor_id=current_user.id,
@@ -106,28 +177,27 @@ def read_student_detail(
         details=f"Viewed full profile of {student.email}",
     )
 
-    risk_summary = (
-        db.query(models.RiskSummary)
-        .filter(models.RiskSummary.user_id == student.id)
-        .first()
-    )
+    risk_summary = student.risk_summary
+    dashboard = student.dashboard
 
+    # Historial más reciente; una fila extra indica si hay más
     alerts = (
         db.query(models.Alert)
         .filter(models.Alert.user_id == student.id)
-        .order_by(models.Alert.created_at.desc())
+        .order_by(models.Alert.created_at.desc(), models.Alert.id.desc())
+        .limit(alerts_limit + 1)
         .all()
     )
-    # Calcula la cantidad de alertas activas (no resueltas)
-    active_alerts_count = sum(1 for a in alerts if not a.is_resolved)
-
     responses = (
         db.query(models.AssessmentResponse)
         .filter(models.AssessmentResponse.user_id == student.id)
-        .order_by(models.AssessmentResponse.created_at.desc())
+        .order_by(
+            models.AssessmentResponse.created_at.desc(),
+            models.AssessmentResponse.id.desc(),
+        )
+        .limit(responses_limit + 1)
         .all()
     )
-
     checkins = (
         db.query(models.EmotionalCheckin)
         .filter(models.EmotionalCheckin.user_id == student.id)
@@ -136,6 +206,21 @@ def read_student_detail(
         .all()
     )
 
+    if dashboard is not None:
+        active_alerts_count = dashboard.active_alerts
+        last_assessment_date = assessment_date(dashboard.last_assessment_date)
+    else:
+        # Sin fila en el panel todavía: se cuenta sobre el historial
+        active_alerts_count = (
+            db.query(func.count(models.Alert.id))
+            .filter(
+                models.Alert.user_id == student.id,
+                models.Alert.is_resolved == False,  # noqa: E712
+            )
+            .scalar()
+        )
+        last_assessment_date = responses[0].created_at if responses else None
+
     return {
         "id": student.id,
         "email": student.email,
@@ -143,13 +228,20 @@ def read_student_detail(
         "role": student.role,
         "risk_level": risk_summary.current_risk_level if risk_summary else "Low",
         "active_alerts": active_alerts_count,
-        "last_assessment_date": responses[0].created_at if responses else None,
+        "last_assessment_date": last_assessment_date,
         "risk_summary": risk_summary,
-        "alerts": alerts,
-        "assessment_responses": responses,
+        "alerts": alerts[:alerts_limit],
+        "has_more_alerts": len(alerts) > alerts_limit,
+        "assessment_responses": responses[:responses_limit],
+        "has_more_assessment_responses": len(responses) > responses_limit,
         "recent_checkins": checkins,
-        # Explica los factores de riesgo identificados por la IA
-        "risk_factors": risk_classifier.get_feature_importance(),
+        # Explica los factores de riesgo identificados por la IA para este
+        # estudiante (SHAP, en caché); sin predicción, la importancia global
+        "risk_factors": (
+            risk_explainer.explain(risk_summary.model_features)
+            if risk_summary and risk_summary.model_features
+            else risk_classifier.get_feature_importance()
+        ),
     }
 
 
@@ -186,5 +278,6 @@ def update_student(
     # Guardamos los cambios en la base de datos y refrescamos el objeto
     db.add(student)
     db.commit()
+    principal_cache.invalidate(student.id)
     db.refresh(student)
     return student
@@ -1,11 +1,16 @@
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app import models, schemas
 from app.api import deps
+from app.core.principal_cache import principal_cache
 from app.core.security import get_password_hash
+from app.services.dashboard_service import dashboard_service
 
 router = APIRouter()
 
@@ -38,8 +43,11 @@ def create_user(
         role=user_in.role,
     )
 
-    # Aquí el usuario se guarda físicamente en la tabla users
+    # Aquí el usuario se guarda físicamente en la tabla users, junto con su
+    # fila del panel de estudiantes (misma transacción)
     db.add(db_obj)
+    db.flush()
+    dashboard_service.create_for(db, db_obj)
     db.commit()
     db.refresh(db_obj)
 
@@ -92,6 +100,8 @@ def create_user_by_admin(
         must_change_password=True,
     )
     db.add(db_obj)
+    db.flush()
+    dashboard_service.create_for(db, db_obj)
     db.commit()
     db.refresh(db_obj)
 
@@ -99,13 +109,22 @@ def create_user_by_admin(
 
 
 @router.get("/me", response_model=schemas.user.User)
-def read_user_me(
-    current_user: models.user.User = Depends(deps.get_current_user),
+async def read_user_me(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.user.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Permite obtener la información del usuario actual.
     Es la que usa el frontend para mostrar la información del usuario.
     """
+    # consent_accepted lee la relación consent: en async no hay carga
+    # perezosa, se consulta y se asigna sin volver a leer el usuario
+    consent = await db.scalar(
+        select(models.consent.Consent).where(
+            models.consent.Consent.user_id == current_user.id
+        )
+    )
+    set_committed_value(current_user, "consent", consent)
     return current_user
 
 
@@ -129,6 +148,7 @@ def update_user_me(
     # Se guarda el usuario en la DB
     db.add(current_user)
     db.commit()
+    principal_cache.invalidate(current_user.id)
     db.refresh(current_user)
     return current_user
 
@@ -178,10 +198,15 @@ def update_user_role(
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    # Actualiza el rol del usuario
+    # Actualiza el rol del usuario y crea o elimina su fila del panel
+    # de estudiantes según corresponda
+    role_changed = user.role != role
     user.role = role
     db.add(user)
+    if role_changed:
+        dashboard_service.record_role_change(db, user)
     db.commit()
+    principal_cache.invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -218,10 +243,12 @@ def toggle_user_status(
         for alert in pending_alerts:
             alert.is_resolved = True
             alert.resolved_at = datetime.now(timezone.utc)
+        dashboard_service.record_alerts(db, user.id, -len(pending_alerts))
 
     # Guarda la actualización del usuario en la DB
     db.add(user)
     db.commit()
+    principal_cache.invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -250,6 +277,7 @@ def delete_user(
     # Elimina el usuario de la DB
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
 
     # Este estado le dice al frontend que la petición fue exitosa, por lo cual no tiene nada que mostrar
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -37,6 +37,38 @@ class Settings(BaseSettings):
             f"{info.data.get('POSTGRES_DB')}"
         )
 
+    # Connection pools of the sync and async engines (see app/db/session.py):
+    # connections kept open, extra connections allowed under load, seconds
+    # before a connection is replaced, and seconds a checkout waits for a
+    # free connection before failing. The sizes are for the sync engine (and
+    # each read replica); the async engine has its own below
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Pool of the async engine (the student hot paths). Both pools are open
+    # at once in every worker: their sizes plus overflows, times the
+    # workers, must fit in the server's max_connections
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+    # Ping every connection on checkout (one extra round trip). With
+    # DB_POOL_RECYCLE below the server's idle timeout it can be turned off:
+    # stale connections are then only caught when a query fails
+    DB_POOL_PRE_PING: bool = True
+    # Connections opened at startup so the first burst of requests does not
+    # wait for connection setup (capped at DB_POOL_SIZE)
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+
+    # Read replicas for the staff and reporting reads (see app/db/replica.py),
+    # comma-separated URIs; empty sends every query to the primary
+    SQLALCHEMY_REPLICA_URIS: str = ""
+    # Replicas lagging behind the primary by more than this many seconds are
+    # skipped, and a user's reads stay on the primary this long after they
+    # write (read-your-writes)
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    # Seconds between lag measurements of each replica
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
     SMTP_TLS: bool = True
@@ -46,8 +78,77 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = None
     EMAILS_FROM_EMAIL: str | None = None
     EMAILS_FROM_NAME: str = "MENTA-LINK"
+    # Pooled SMTP delivery (see app/services/email_delivery.py): worker
+    # threads, each with one persistent connection, and messages sent per
+    # connection turn
+    SMTP_POOL_SIZE: int = 2
+    SMTP_BATCH_SIZE: int = 20
+    # Queued messages before callers block
+    SMTP_QUEUE_SIZE: int = 1000
+    # Seconds a connection may sit idle before it is closed, and the socket
+    # timeout of each SMTP command
+    SMTP_IDLE_TIMEOUT: float = 30.0
+    SMTP_TIMEOUT: float = 10.0
+    # Email outbox drain worker (see app/services/email_outbox_service.py):
+    # messages claimed per batch, and seconds between polls when nothing
+    # wakes it up
+    EMAIL_OUTBOX_WORKER_ENABLED: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 5.0
+    # Attempts before a message is given up; the delay between attempts
+    # doubles from EMAIL_OUTBOX_BACKOFF_SECONDS up to the maximum
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 30.0
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: float = 3600.0
+    # Seconds a worker holds a claimed message before others may retry it
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 120.0
 
+    # A .pkl (sklearn/joblib) or .npz (CompiledForest, no sklearn at runtime)
     ML_MODEL_PATH: str = "app/models/risk_model.pkl"
+    # Versioned artifacts (see app/ml/model_loader.py); takes precedence over
+    # ML_MODEL_PATH once a version has been activated
+    ML_MODEL_REGISTRY_DIR: str = "app/models/registry"
+    # Precompute the model over its discrete input grid (see app/ml/lookup_table.py)
+    ML_RISK_LOOKUP_TABLE: bool = False
+    # Load the model in a background thread right after startup instead of on
+    # the first prediction
+    ML_WARMUP_ON_STARTUP: bool = True
+    # How often (seconds) the classifier checks the registry/model file for changes
+    ML_MODEL_CHECK_INTERVAL: float = 5.0
+    # Per-student SHAP explanations kept in memory (see app/ml/explainer.py)
+    ML_EXPLANATION_CACHE_SIZE: int = 4096
+
+    # Rate limit counters (see app/core/rate_limit.py): memory:// (per
+    # process), sqlite:///<file> (shared by the workers of one host) or
+    # redis://host:port/db (shared by every host)
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+
+    # Worker processes for Argon2 hashing (see app/core/password_pool.py);
+    # 0 hashes in the calling thread (development and tests only: async
+    # callers would hash on the event loop)
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hashing calls running or queued before new ones get a 503, and seconds
+    # a call waits for its result
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_TIMEOUT: float = 10.0
+
+    # Authenticated users kept in memory by get_current_user (see
+    # app/core/principal_cache.py); a size of 0 disables the cache
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_SIZE: int = 1024
+
+    # Buffered audit log writer (see app/services/audit_service.py)
+    AUDIT_BUFFER_ENABLED: bool = True
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    # Queued entries before callers block, and how long they wait for room
+    # before writing their entry themselves
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_ENQUEUE_TIMEOUT: float = 0.5
+    # Days entries stay in audit_logs before the retention job moves them to
+    # audit_logs_archive, and days archived entries are kept (0 = forever)
+    AUDIT_RETENTION_DAYS: int = 180
+    AUDIT_ARCHIVE_RETENTION_DAYS: int = 1825
 
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
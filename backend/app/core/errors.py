@@ -23,6 +23,17 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     )
 
 
+async def password_pool_busy_handler(request: Request, exc: Exception):
+    """
+    Load shedding: the password hashing pool is saturated (login storm).
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servicio ocupado, intenta de nuevo en unos segundos."},
+        headers={"Retry-After": "1"},
+    )
+
+
 async def general_exception_handler(request: Request, exc: Exception):
     """
     Global exception handler for 500 errors.
@@ -1,7 +1,60 @@
+import threading
+from typing import Any, Dict
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from app.core import rate_limit  # noqa: F401  (registers the sqlite:// storage)
+from app.core.config import settings
 
 # Global limiter instance to be shared across the application
 # Academic Note: Centralizing the rate limiter ensures consistent policy enforcement
 # and prevents circular dependency issues between main and routers.
-limiter = Limiter(key_func=get_remote_address)
+# Counters live in RATE_LIMIT_STORAGE_URI (see app/core/rate_limit.py), so
+# every worker process enforces the same budget.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter",
+    key_prefix="mentalink",
+    # If the shared storage is unreachable, keep limiting per process
+    in_memory_fallback_enabled=True,
+)
+
+
+class RateLimitMetrics:
+    """
+    Allowed and rejected requests per limit, counted by the API middleware
+    from what slowapi leaves on `request.state`. Per process.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, request: Request, status_code: int) -> None:
+        current = getattr(request.state, "view_rate_limit", None)
+        if not current:
+            return
+        limit, args = current
+        name = f"{args[-1]} {limit}"
+        outcome = "limited" if status_code == 429 else "allowed"
+        with self._lock:
+            counts = self._counts.setdefault(name, {"allowed": 0, "limited": 0})
+            counts[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            limits = {name: dict(counts) for name, counts in self._counts.items()}
+        return {
+            "storage": settings.RATE_LIMIT_STORAGE_URI.split("://", 1)[0],
+            "limits": limits,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+rate_limit_metrics = RateLimitMetrics()
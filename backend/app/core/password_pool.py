@@ -0,0 +1,223 @@
+"""
+Process pool for password hashing.
+
+Argon2 is deliberately CPU- and memory-heavy; run in the request thread it
+competes with every other sync endpoint for the server's threadpool and CPU.
+`PasswordPool.run` sends the work to a small pool of worker processes
+instead, and `run_async` awaits it, so login (an async endpoint) holds no
+threadpool thread while it waits. At most PASSWORD_HASH_MAX_PENDING calls
+may be running or queued: past that, or when a call outlives
+PASSWORD_HASH_TIMEOUT, PasswordPoolBusy is raised (answered with a 503 by
+the API) rather than letting callers pile up behind a login storm.
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept for the metrics
+METRIC_SAMPLES = 1024
+
+
+class PasswordPoolBusy(Exception):
+    """
+    Raised when PASSWORD_HASH_MAX_PENDING hashing calls are already waiting.
+    """
+
+
+def _timed(fn: Callable, *args) -> tuple:
+    # Runs in the worker process; wall-clock times are comparable across
+    # processes on the same host
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time()
+
+
+def _noop() -> None:
+    return None
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PasswordPool:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.workers = settings.PASSWORD_HASH_WORKERS if workers is None else workers
+        self.max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING
+        self.timeout = timeout or settings.PASSWORD_HASH_TIMEOUT
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.in_flight = 0
+        self._queue_seconds: deque = deque(maxlen=METRIC_SAMPLES)
+        self._hash_seconds: deque = deque(maxlen=METRIC_SAMPLES)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs threads (audit writer,
+                # SMTP and outbox workers) is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                if not self._atexit_registered:
+                    atexit.register(self.shutdown)
+                    self._atexit_registered = True
+            return self._executor
+
+    def start(self) -> None:
+        """
+        Spawns the worker processes ahead of the first login.
+        """
+        if self.workers:
+            executor = self._get_executor()
+            for future in [executor.submit(_noop) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """
+        Takes a slot and starts `fn(*args)`. The slot is given back when the
+        work finishes, not when the caller stops waiting: a timed-out call
+        still counts against PASSWORD_HASH_MAX_PENDING while it runs.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy()
+        with self._lock:
+            self.in_flight += 1
+        submitted = time.time()
+
+        def finished(future: Future) -> None:
+            with self._lock:
+                self.in_flight -= 1
+                if not future.cancelled() and future.exception() is None:
+                    _, started, ended = future.result()
+                    self.completed += 1
+                    self._queue_seconds.append(max(0.0, started - submitted))
+                    self._hash_seconds.append(ended - started)
+            self._slots.release()
+
+        if self.workers:
+            try:
+                future = self._get_executor().submit(_timed, fn, *args)
+            except BaseException:
+                with self._lock:
+                    self.in_flight -= 1
+                self._slots.release()
+                raise
+        else:
+            future = Future()
+            try:
+                future.set_result(_timed(fn, *args))
+            except BaseException as exc:
+                future.set_exception(exc)
+        future.add_done_callback(finished)
+        return future
+
+    def _timed_out(self, future: Future) -> PasswordPoolBusy:
+        # Drops the call if it has not started; its slot stays taken until
+        # the worker is done with it
+        future.cancel()
+        with self._lock:
+            self.timed_out += 1
+        logger.warning("Hashing de contraseña sin respuesta a tiempo")
+        return PasswordPoolBusy()
+
+    def _recover(self, fn: Callable, *args) -> Any:
+        # A worker died (e.g. killed for memory): start a new pool for the
+        # next calls and serve this one inline
+        logger.error("Pool de hashing roto, se reinicia")
+        self.shutdown()
+        return fn(*args)
+
+    def run(self, fn: Callable, *args) -> Any:
+        """
+        Runs `fn(*args)` in a worker process and returns its result, blocking
+        the calling thread. `fn` must be a module-level function (it is
+        pickled by reference). Raises PasswordPoolBusy when the pool is full
+        or the call takes longer than the timeout.
+        """
+        future = self._submit(fn, *args)
+        try:
+            return future.result(self.timeout)[0]
+        except FuturesTimeout:
+            raise self._timed_out(future)
+        except BrokenProcessPool:
+            return self._recover(fn, *args)
+
+    async def run_async(self, fn: Callable, *args) -> Any:
+        """
+        `run` for async endpoints: the event loop keeps serving other
+        requests while the worker hashes, and no threadpool thread waits.
+        """
+        future = self._submit(fn, *args)
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), self.timeout
+            )
+            return result[0]
+        except asyncio.TimeoutError:
+            raise self._timed_out(future)
+        except BrokenProcessPool:
+            return self._recover(fn, *args)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Counters since startup, and queue time (submission to start in a
+        worker) and hash latency percentiles, in milliseconds, over the last
+        METRIC_SAMPLES calls.
+        """
+        with self._lock:
+            queue_seconds = list(self._queue_seconds)
+            hash_seconds = list(self._hash_seconds)
+            result = {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+        for name, samples in (("queue", queue_seconds), ("hash", hash_seconds)):
+            for label, fraction in (("p50", 0.5), ("p95", 0.95)):
+                result[f"{name}_{label}_ms"] = round(
+                    _percentile(samples, fraction) * 1000, 2
+                )
+        return result
+
+
+password_pool = PasswordPool()
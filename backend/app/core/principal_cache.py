@@ -0,0 +1,104 @@
+"""
+In-process cache of authenticated principals.
+
+`deps.get_current_user` runs on every authenticated request; with this cache
+the users row is read once per (user, token) and then served from memory
+until it expires (TTL) or is evicted (LRU). Endpoints that change a user's
+role, status, password or profile call `invalidate` after committing.
+
+The cache is per process: with several workers, a change made through one
+of them reaches the others when their entries expire, so the TTL bounds how
+long a revoked or demoted principal can still be accepted elsewhere.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class PrincipalCache:
+    def __init__(
+        self, ttl_seconds: Optional[float] = None, max_size: Optional[int] = None
+    ):
+        self.ttl_seconds = (
+            settings.PRINCIPAL_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.max_size = settings.PRINCIPAL_CACHE_SIZE if max_size is None else max_size
+        # (user id, token) -> (expiry, column values of the users row)
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, db: Session, user_id: int, token: str) -> Optional[User]:
+        """
+        The cached user attached to `db` without querying, or None.
+        """
+        user = self.lookup(user_id, token)
+        if user is None:
+            return None
+        # load=False attaches the instance as loaded, without a SELECT
+        return db.merge(user, load=False)
+
+    def lookup(self, user_id: int, token: str) -> Optional[User]:
+        """
+        The cached user as a detached instance, or None. Async callers attach
+        it with `await session.merge(user, load=False)`.
+        """
+        if not self.enabled:
+            return None
+        key = (user_id, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, user_id: int, token: str, user: User) -> None:
+        if not self.enabled:
+            return
+        values = {
+            attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+        }
+        with self._lock:
+            self._entries[(user_id, token)] = (
+                time.monotonic() + self.ttl_seconds,
+                values,
+            )
+            self._entries.move_to_end((user_id, token))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drops every cached token of a user.
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
@@ -1,8 +1,206 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""
+Rate limit storage backends.
 
-# Initialize the limiter with the remote address as the key
-limiter = Limiter(key_func=get_remote_address)
+The limiter (app/core/limiter.py) keeps its counters in the storage named
+by RATE_LIMIT_STORAGE_URI, resolved by the `limits` library:
 
-# Default limits can be configured here
-# e.g., limiter.limit("5/minute")(route_handler)
+- ``memory://``: per process. With N uvicorn workers a "5/minute" limit
+  lets 5*N requests through.
+- ``sqlite:///<path>``: `SQLiteStorage` below, one file shared by every
+  worker on the host (``sqlite:////abs/path.db`` for an absolute path).
+- ``redis://host:port/db``: the `limits` Redis storage (needs the `redis`
+  package), shared by every host.
+
+The limiter uses the sliding window counter strategy: each key holds two
+fixed-window counters (current and previous window) and a hit is allowed
+when the previous count, weighted by how much of its window still overlaps,
+plus the current count stays within the limit. Checking and recording a
+hit is O(1) in time and space whatever the limit.
+
+Importing this module registers the ``sqlite`` scheme with `limits`.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from math import floor
+from typing import Iterator, Tuple
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+# Expired counters are deleted every this many writes
+PURGE_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Counters in a SQLite file, shared by all the processes that open it.
+    Read-check-write sequences run in BEGIN IMMEDIATE transactions, which
+    SQLite serializes across processes.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str,
+        wrap_exceptions: bool = False,
+        timeout: float = 5.0,
+        **options,
+    ):
+        # Same convention as SQLAlchemy: sqlite:///relative, sqlite:////absolute
+        self.path = uri.split("://", 1)[1][1:]
+        if not self.path:
+            raise ValueError(f"Ruta de SQLite ausente en {uri!r}")
+        self.timeout = float(timeout)
+        self._local = threading.local()
+        self._writes = 0
+        with self._transaction() as conn:
+            conn.execute(_SCHEMA)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, key: str, now: float) -> int:
+        row = conn.execute(
+            "SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _incr(
+        self, conn: sqlite3.Connection, key: str, expiry: float, amount: int, now: float
+    ) -> int:
+        # A live counter keeps its expiry (fixed window); an expired one
+        # starts over
+        value = conn.execute(
+            """
+            INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires_at > ? THEN value + excluded.value
+                        ELSE excluded.value END,
+                expires_at = CASE WHEN expires_at > ? THEN expires_at
+                             ELSE excluded.expires_at END
+            RETURNING value
+            """,
+            (key, amount, now + expiry, now, now),
+        ).fetchone()[0]
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return value
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        with self._transaction() as conn:
+            return self._incr(conn, key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        return self._get(self._connection(), key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = (
+            self._connection()
+            .execute(
+                "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?",
+                (key, now),
+            )
+            .fetchone()
+        )
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def _window(
+        self, conn: sqlite3.Connection, key: str, expiry: int, now: float
+    ) -> Tuple[int, float, int, float]:
+        # Same arithmetic as the `limits` memory storage
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(conn, previous_key, now)
+        current_count = self._get(conn, current_key, now)
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._transaction() as conn:
+            previous_count, previous_ttl, current_count, _ = self._window(
+                conn, key, expiry, now
+            )
+            weighted = previous_count * previous_ttl / expiry + current_count
+            if floor(weighted) + amount > limit:
+                return False
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            # Counters outlive their window: the next one weighs them
+            self._incr(conn, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(
+        self, key: str, expiry: int
+    ) -> Tuple[int, float, int, float]:
+        return self._window(self._connection(), key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM rate_limits WHERE key IN (?, ?)",
+                (previous_key, current_key),
+            )
@@ -5,6 +5,7 @@ from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.password_pool import password_pool
 
 pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
@@ -49,14 +50,19 @@ def create_refresh_token(
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# Hashing runs in the password process pool (app/core/password_pool.py);
+# the public functions raise PasswordPoolBusy when it is saturated or a call
+# times out. Async endpoints use the *_async variants.
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
     try:
         return pwd_context.verify(plain_password, hashed_password)
     except Exception:
         return False
 
 
-def verify_and_update_password(
+def _verify_and_update(
     plain_password: str, hashed_password: str
 ) -> tuple[bool, str | None]:
     try:
@@ -65,5 +71,27 @@ def verify_and_update_password(
         return False, None
 
 
-def get_password_hash(password: str) -> str:
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return password_pool.run(_verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return password_pool.run(_verify_and_update, plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    return password_pool.run(_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await password_pool.run_async(
+        _verify_and_update, plain_password, hashed_password
+    )
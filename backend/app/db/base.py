@@ -3,6 +3,9 @@ from app.models.alert import Alert  # noqa
 from app.models.assessment import Assessment  # noqa
 from app.models.assessment_response import AssessmentResponse  # noqa
 from app.models.consent import Consent  # noqa
+from app.models.email_outbox import EmailOutbox  # noqa
 from app.models.emotional_checkin import EmotionalCheckin  # noqa
 from app.models.risk_summary import RiskSummary  # noqa
+from app.models.student_dashboard import StudentDashboard  # noqa
+from app.models.student_features import StudentFeatures  # noqa
 from app.models.user import User  # noqa
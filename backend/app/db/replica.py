@@ -0,0 +1,214 @@
+"""
+Read-replica routing.
+
+Read-only staff and reporting endpoints (the aggregated report, the student
+and alert listings, the assessment catalog) take their session from
+`deps.get_read_db`, which asks `replica_router` for a replica session. A
+read goes to a replica only when:
+
+- the replica's lag behind the primary is within REPLICA_MAX_LAG_SECONDS
+  (measured every REPLICA_LAG_CHECK_INTERVAL; a replica that cannot be
+  reached counts as too far behind), and
+- the user has not written anything in the last REPLICA_MAX_LAG_SECONDS.
+  Sessions opened by `deps.get_current_user` are tagged with the user id;
+  a commit that flushed changes pins that user's reads to the primary
+  until every replica within the bound has caught up (read-your-writes).
+
+Otherwise, and for every write, the primary answers. Like the principal
+cache, write pins are per process: with several workers, a request served
+by another worker right after a write may read from a replica that is up
+to REPLICA_MAX_LAG_SECONDS behind.
+"""
+
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import PoolMetrics, pool_metrics, pool_options
+
+logger = logging.getLogger(__name__)
+
+# Write pins kept before expired ones are pruned
+MAX_PINNED_USERS = 4096
+
+# Zero when the replica has replayed everything it received (an idle
+# primary does not make it look stale); otherwise the age of the last
+# replayed transaction
+_POSTGRES_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+def postgres_lag(connection: Connection) -> float:
+    return float(connection.execute(_POSTGRES_LAG).scalar() or 0.0)
+
+
+def no_lag(connection: Connection) -> float:
+    # Backends without replication status (SQLite in development)
+    return 0.0
+
+
+class Replica:
+    def __init__(self, uri: str, lag_probe: Callable[[Connection], float]):
+        self.name = make_url(uri).render_as_string(hide_password=True)
+        self.engine = create_engine(uri, **pool_options(uri))
+        self.sessions = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+        self.lag_probe = lag_probe
+        # Unknown until the first check
+        self.lag_seconds = math.inf
+        self.checked_at: Optional[float] = None
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        uris: Optional[Sequence[str]] = None,
+        max_lag_seconds: Optional[float] = None,
+        check_interval: Optional[float] = None,
+        lag_probe: Optional[Callable[[Connection], float]] = None,
+    ):
+        if uris is None:
+            uris = [
+                uri.strip()
+                for uri in settings.SQLALCHEMY_REPLICA_URIS.split(",")
+                if uri.strip()
+            ]
+        self.max_lag_seconds = (
+            settings.REPLICA_MAX_LAG_SECONDS
+            if max_lag_seconds is None
+            else max_lag_seconds
+        )
+        self.check_interval = (
+            settings.REPLICA_LAG_CHECK_INTERVAL
+            if check_interval is None
+            else check_interval
+        )
+        self.replicas: List[Replica] = []
+        for uri in uris:
+            probe = lag_probe
+            if probe is None:
+                postgres = make_url(uri).get_backend_name() == "postgresql"
+                probe = postgres_lag if postgres else no_lag
+            self.replicas.append(Replica(uri, probe))
+        # user id -> monotonic time of their last committed write
+        self._written: Dict[int, float] = {}
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        # Metrics
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def mark_write(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._written[user_id] = now
+            if len(self._written) > MAX_PINNED_USERS:
+                horizon = now - self.max_lag_seconds
+                for uid in [u for u, t in self._written.items() if t <= horizon]:
+                    del self._written[uid]
+
+    def _pinned(self, user_id: Optional[int], now: float) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            written_at = self._written.get(user_id)
+        return written_at is not None and now - written_at < self.max_lag_seconds
+
+    def _lag(self, replica: Replica, now: float) -> float:
+        with self._lock:
+            due = (
+                replica.checked_at is None
+                or now - replica.checked_at >= self.check_interval
+            )
+            if due:
+                # Claimed: concurrent requests keep the previous value
+                replica.checked_at = now
+        if due:
+            try:
+                with replica.engine.connect() as connection:
+                    replica.lag_seconds = replica.lag_probe(connection)
+            except (sa_exc.SQLAlchemyError, OSError) as exc:
+                logger.warning(f"Réplica {replica.name} no disponible: {exc}")
+                replica.lag_seconds = math.inf
+        return replica.lag_seconds
+
+    def session_for(self, user_id: Optional[int]) -> Optional[Session]:
+        """
+        A session on a replica fresh enough for this user, or None when the
+        read must go to the primary.
+        """
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        fresh = []
+        if not self._pinned(user_id, now):
+            fresh = [
+                r for r in self.replicas if self._lag(r, now) <= self.max_lag_seconds
+            ]
+        with self._lock:
+            if not fresh:
+                self.primary_reads += 1
+                return None
+            self.replica_reads += 1
+            replica = fresh[next(self._turn) % len(fresh)]
+        return replica.sessions()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+                "pinned_users": len(self._written),
+                "replicas": [
+                    {
+                        "name": r.name,
+                        "lag_seconds": (
+                            None if math.isinf(r.lag_seconds) else r.lag_seconds
+                        ),
+                    }
+                    for r in self.replicas
+                ],
+            }
+
+
+replica_router = ReplicaRouter()
+for _index, _replica in enumerate(replica_router.replicas):
+    pool_metrics[f"replica-{_index}"] = PoolMetrics(_replica.engine)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer(session):
+    # Only sessions tagged by get_current_user know whose write this was
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        replica_router.mark_write(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_flush(session):
+    session.info.pop("wrote", None)
@@ -1,17 +1,236 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Checkout wait samples kept for the metrics
+METRIC_SAMPLES = 1024
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PoolMetrics:
+    """
+    Checkout wait times, connections in use and overflow connections of one
+    engine's pool. Per process.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.overflow_connections = 0
+        self.peak_in_use = 0
+        self._wait_seconds: deque = deque(maxlen=METRIC_SAMPLES)
+        self._lock = threading.Lock()
+        engine.pool.metrics = self
+        event.listen(engine, "connect", self._on_connect)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        # The pool counts a new connection as overflow before opening it
+        overflow = self.engine.pool.overflow() > 0
+        with self._lock:
+            self.connections_opened += 1
+            if overflow:
+                self.overflow_connections += 1
+
+    def record_checkout(self, seconds: float) -> None:
+        in_use = self.engine.pool.checkedout()
+        with self._lock:
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self._wait_seconds.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current pool state, counters since startup, and checkout wait
+        percentiles (in milliseconds) over the last METRIC_SAMPLES checkouts.
+        """
+        pool = self.engine.pool
+        with self._lock:
+            waits = list(self._wait_seconds)
+            result = {
+                "size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "overflow_connections": self.overflow_connections,
+            }
+        for label, fraction in (("p50", 0.5), ("p95", 0.95), ("max", 1.0)):
+            result[f"wait_{label}_ms"] = round(_percentile(waits, fraction) * 1000, 2)
+        return result
+
+
+class _MeteredPool:
+    """
+    Pool mixin that reports each checkout to its PoolMetrics: the time
+    `connect` took (waiting for a free connection, opening one, pre-ping)
+    or the timeout.
+    """
+
+    metrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except sa_exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # dispose() replaces the pool; the metrics carry over
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(uri: str, asynchronous: bool = False) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments for the pool, from the DB_POOL_* settings;
+    the async engine is sized by DB_ASYNC_POOL_SIZE and DB_ASYNC_MAX_OVERFLOW.
+    """
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a per-thread pool with no size to tune
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    return {
+        "poolclass": MeteredAsyncQueuePool if asynchronous else MeteredQueuePool,
+        "pool_size": (
+            settings.DB_ASYNC_POOL_SIZE if asynchronous else settings.DB_POOL_SIZE
+        ),
+        "max_overflow": (
+            settings.DB_ASYNC_MAX_OVERFLOW if asynchronous else settings.DB_MAX_OVERFLOW
+        ),
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def warm_up(engine: Engine, connections: int) -> int:
+    """
+    Opens up to `connections` pooled connections (no more than the pool
+    size, so none is an overflow connection that would be discarded) and
+    returns them to the pool. Returns how many were opened.
+    """
+    held = []
+    try:
+        for _ in range(min(connections, engine.pool.size())):
+            held.append(engine.connect())
+    except (sa_exc.SQLAlchemyError, OSError) as exc:
+        logger.warning(f"No se pudo precalentar el pool de conexiones: {exc}")
+    finally:
+        for connection in held:
+            connection.close()
+    return len(held)
+
+
+async def warm_up_async(engine: AsyncEngine, connections: int) -> int:
+    """
+    `warm_up` for the async engine. Must run on the event loop that serves
+    the requests: asyncpg connections belong to the loop that opened them.
+    """
+    opened = 0
+    try:
+        async with AsyncExitStack() as held:
+            for _ in range(min(connections, engine.sync_engine.pool.size())):
+                await held.enter_async_context(engine.connect())
+                opened += 1
+    except (sa_exc.SQLAlchemyError, OSError) as exc:
+        logger.warning(f"No se pudo precalentar el pool asíncrono: {exc}")
+    return opened
+
+
 # Create the SQLAlchemy engine.
 # The engine is the main entry point to the database, handling connections and pools.
+# Pool size, overflow, recycle, timeout and pre-ping come from the DB_POOL_*
+# settings; pre-ping checks the connection is alive before using it,
+# preventing "server closed connection" errors.
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    # pool_pre_ping=True checks if the connection is alive before using it,
-    # preventing "server closed connection" errors.
-    pool_pre_ping=True,
+    **pool_options(settings.SQLALCHEMY_DATABASE_URI),
 )
 
 # SessionLocal is a factory for database sessions.
 # each request will get its own session.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async drivers for the same databases
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_uri(uri: str) -> str:
+    """
+    The async form of a database URI: postgresql:// (or postgresql+psycopg2://)
+    becomes postgresql+asyncpg://, sqlite:// becomes sqlite+aiosqlite://.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Sin driver asíncrono para {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+# Async engine and sessions, for `async def` endpoints (deps.get_async_db):
+# they wait for the database on the event loop instead of holding one of the
+# threadpool's threads for the whole round trip. It has its own pool, sized
+# by DB_ASYNC_POOL_SIZE and DB_ASYNC_MAX_OVERFLOW on top of the sync one.
+async_engine = create_async_engine(
+    async_database_uri(settings.SQLALCHEMY_DATABASE_URI),
+    **pool_options(settings.SQLALCHEMY_DATABASE_URI, asynchronous=True),
+)
+
+# expire_on_commit=False: attributes stay readable after commit without an
+# implicit (and, in async, impossible) lazy reload
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Exported by /health
+pool_metrics: Dict[str, PoolMetrics] = {}
+if isinstance(engine.pool, _MeteredPool):
+    pool_metrics["sync"] = PoolMetrics(engine)
+if isinstance(async_engine.sync_engine.pool, _MeteredPool):
+    pool_metrics["async"] = PoolMetrics(async_engine.sync_engine)
@@ -1,3 +1,9 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, suppress
+
 import sentry_sdk
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,14 +11,31 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app import import_started
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.errors import (
     general_exception_handler,
     http_exception_handler,
     not_found_handler,
+    password_pool_busy_handler,
+)
+from app.core.limiter import limiter, rate_limit_metrics
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.db.replica import replica_router
+from app.db.session import (
+    async_engine,
+    engine,
+    pool_metrics,
+    warm_up,
+    warm_up_async,
 )
-from app.core.limiter import limiter
+from app.ml.risk_classifier import risk_classifier
+from app.services.audit_service import audit_writer
+from app.services.email_delivery import smtp_delivery
+from app.services.email_outbox_service import email_outbox_worker
+
+logger = logging.getLogger(__name__)
 
 if settings.SENTRY_DSN and settings.SENTRY_DSN.strip().startswith("http"):
     sentry_sdk.init(
@@ -20,8 +43,57 @@ if settings.SENTRY_DSN and settings.SENTRY_DSN.strip().startswith("http"):
         traces_sample_rate=1.0,
     )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Marks the API as ready and warms the ML model in a background thread, so
+    `/` and the auth endpoints answer before the Random Forest is loaded.
+    Opens DB_POOL_WARMUP_CONNECTIONS database connections per engine, starts
+    the buffered audit writer and the email outbox worker; on shutdown
+    flushes the audit writer and the SMTP delivery queue.
+    """
+    app.state.startup_seconds = time.perf_counter() - import_started
+    logger.info(f"API lista en {app.state.startup_seconds:.3f}s")
+    if settings.ML_WARMUP_ON_STARTUP:
+        threading.Thread(
+            target=risk_classifier.warm_up, name="ml-warmup", daemon=True
+        ).start()
+    # Spawn the hashing processes before the first login needs them; they
+    # are shut down at interpreter exit
+    threading.Thread(
+        target=password_pool.start, name="password-pool-warmup", daemon=True
+    ).start()
+    pool_warmup = None
+    if settings.DB_POOL_WARMUP_CONNECTIONS > 0:
+        threading.Thread(
+            target=warm_up,
+            args=(engine, settings.DB_POOL_WARMUP_CONNECTIONS),
+            name="db-pool-warmup",
+            daemon=True,
+        ).start()
+        # On this loop: async connections belong to the loop that opens them
+        pool_warmup = asyncio.create_task(
+            warm_up_async(async_engine, settings.DB_POOL_WARMUP_CONNECTIONS)
+        )
+    if settings.AUDIT_BUFFER_ENABLED:
+        audit_writer.start()
+    if settings.EMAIL_OUTBOX_WORKER_ENABLED:
+        email_outbox_worker.start(engine)
+    yield
+    if pool_warmup is not None:
+        pool_warmup.cancel()
+        with suppress(asyncio.CancelledError):
+            await pool_warmup
+    email_outbox_worker.stop()
+    audit_writer.stop()
+    smtp_delivery.stop()
+
+
 app = FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
@@ -29,9 +101,17 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(404, not_found_handler)
+app.add_exception_handler(PasswordPoolBusy, password_pool_busy_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 
+@app.middleware("http")
+async def count_rate_limited_requests(request: Request, call_next):
+    response = await call_next(request)
+    rate_limit_metrics.record(request, response.status_code)
+    return response
+
+
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
     response = await call_next(request)
@@ -58,3 +138,25 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.get("/")
 async def root():
     return {"message": "Welcome to MENTALINK API", "docs": "/docs"}
+
+
+@app.get("/health")
+async def health():
+    """
+    Liveness/readiness probe. `model_ready` turns true once the background
+    warm-up (or the first prediction) has loaded the risk model;
+    `password_hashing` has the hashing pool's queue time and latency,
+    `rate_limits` the requests each limit let through or rejected,
+    `db_pool` the connections in use and checkout wait of each engine, and
+    `db_replicas` the replicas' lag and the reads routed to them.
+    """
+    return {
+        "status": "ok",
+        "startup_seconds": round(getattr(app.state, "startup_seconds", 0.0), 4),
+        "model_ready": risk_classifier.is_ready,
+        "model_load_seconds": risk_classifier.load_seconds,
+        "password_hashing": password_pool.metrics(),
+        "rate_limits": rate_limit_metrics.snapshot(),
+        "db_pool": {name: m.snapshot() for name, m in pool_metrics.items()},
+        "db_replicas": replica_router.metrics(),
+    }
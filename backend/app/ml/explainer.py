@@ -1,13 +1,132 @@
 """
 This module handles model explainability (SHAP, LIME, etc.).
+
+`RiskExplainer` computes per-student SHAP values with shap's TreeExplainer
+over the served forest (sklearn forests are converted to a CompiledForest
+first, so both artifact kinds are explained the same way). Explanations are
+cached per (model, feature vector) in an LRU map: a student's values only
+change when their prediction inputs or the model change, and `schedule`
+computes them in a background thread as soon as a risk summary is updated.
 """
 
-from typing import Any, Dict
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.ml.risk_classifier import RiskClassifier, risk_classifier
+from app.ml.tree_ensemble import CompiledForest
+
+logger = logging.getLogger(__name__)
+
+# Keys of the explanation, same names as RiskClassifier.get_feature_importance
+FACTOR_NAMES = ["pss_score", "checkin_avg", "bad_days_freq", "study_pressure"]
+
+
+class RiskExplainer:
+    def __init__(
+        self,
+        classifier: Optional[RiskClassifier] = None,
+        cache_size: Optional[int] = None,
+    ):
+        self.classifier = classifier or risk_classifier
+        self.cache_size = (
+            settings.ML_EXPLANATION_CACHE_SIZE if cache_size is None else cache_size
+        )
+        self._cache: "OrderedDict[Tuple, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # (model key, CompiledForest, shap.TreeExplainer) of the served model
+        self._tree_explainer = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _model_key(active) -> Tuple:
+        # loaded_at tells apart unversioned models installed with set_model
+        return active.version, active.loaded_at
+
+    def _get_tree_explainer(self, active):
+        key = self._model_key(active)
+        current = self._tree_explainer
+        if current is not None and current[0] == key:
+            return current[1], current[2]
+
+        import shap
 
+        model = active.model
+        forest = (
+            model
+            if isinstance(model, CompiledForest)
+            else CompiledForest.from_sklearn(model)
+        )
+        tree_explainer = shap.TreeExplainer(forest.to_shap_model())
+        self._tree_explainer = (key, forest, tree_explainer)
+        return forest, tree_explainer
 
-class Explainer:
-    def explain_prediction(self, features: Dict[str, Any]) -> Dict[str, float]:
+    def _compute(self, active, features: np.ndarray) -> Dict[str, float]:
+        forest, tree_explainer = self._get_tree_explainer(active)
+        model_features = RiskClassifier._to_model_features(features[np.newaxis, :])
+        predicted = int(np.argmax(forest.predict_proba(model_features)[0]))
+        # (1, n_features, n_classes): contributions towards the predicted class
+        values = np.asarray(tree_explainer.shap_values(model_features))
+        contributions = np.abs(values[0, :, predicted])
+        total = contributions.sum()
+        if total > 0:
+            contributions = contributions / total
+        return {name: float(v) for name, v in zip(FACTOR_NAMES, contributions)}
+
+    def explain(self, features: Sequence[float]) -> Dict[str, float]:
+        """
+        Share of the prediction attributable to each input for one student,
+        as the absolute SHAP values of the predicted class normalized to add
+        up to 1 (the same scale as the global importances). `features`
+        follows the arguments of RiskClassifier.predict_risk. Falls back to
+        the global importances when no tree model is being served.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        active = self.classifier.active
+        if active.model is None:
+            return self.classifier.get_feature_importance()
+
+        key = (self._model_key(active), tuple(features.tolist()))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        try:
+            explanation = self._compute(active, features)
+        except Exception as e:
+            logger.error(f"RiskExplainer: Falló el cálculo SHAP: {e}")
+            return self.classifier.get_feature_importance()
+
+        with self._lock:
+            self._cache[key] = explanation
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return explanation
+
+    def schedule(self, features: Sequence[float]) -> None:
         """
-        Returns feature importance for a given prediction.
+        Computes an explanation in the background so the next profile view
+        is served from the cache.
         """
-        return {"stress_level": 0.8, "sleep_hours": 0.2}
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="shap-precompute"
+                )
+        self._executor.submit(self.explain, list(features))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+risk_explainer = RiskExplainer()
@@ -1,12 +1,259 @@
 """
 This module handles feature engineering.
+
+The risk model reads three check-in features per student: the mood average,
+the number of bad days (mood below 3) and the academic pressure average over
+the last WINDOW_SIZE check-ins. They are kept in the `student_features` table
+and updated incrementally: a new check-in appends its scores to the window,
+evicts the oldest ones once the window is full and adjusts the running sums,
+so neither recording nor reading them touches the check-in history.
+
+Reads never write: a student without a row (created before the table, or
+imported in bulk) gets features computed from the history on the fly. The
+row itself is created by the next check-in, by `rebuild`, or for many
+students at once by `backfill` (run by scripts/rebuild_dashboard.py), always
+with an upsert, so concurrent first check-ins of one student cannot collide
+on the primary key.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.emotional_checkin import EmotionalCheckin
+from app.models.student_features import StudentFeatures
+
+# Check-ins per window; must match MAX_CHECKINS in app/ml/lookup_table.py
+WINDOW_SIZE = 7
+BAD_DAY_MOOD = 3  # Moods strictly below this count as a bad day
+
+# Values used for students without check-ins
+DEFAULT_MOOD_AVG = 3.0
+DEFAULT_PRESSURE_AVG = 3.0
+
+# INSERT ... ON CONFLICT, by dialect
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class FeatureVector(NamedTuple):
+    mood_avg: float
+    bad_days: int
+    pressure_avg: float
+
+
+def to_vector(features: Optional[StudentFeatures]) -> FeatureVector:
+    """
+    Averages are Python int / int over the window, exactly as the previous
+    per-request aggregation computed them. Pressure may be missing on some
+    check-ins and still counts in the denominator.
+    """
+    if features is None or not features.checkin_count:
+        return FeatureVector(DEFAULT_MOOD_AVG, 0, DEFAULT_PRESSURE_AVG)
+    count = features.checkin_count
+    return FeatureVector(
+        features.mood_sum / count,
+        features.bad_days,
+        features.pressure_sum / count,
+    )
 
 
-def preprocess_features(raw_data: Dict[str, Any]) -> List[float]:
+class FeatureStore:
     """
-    Converts raw input data into a feature vector for the model.
+    Reads and maintains the per-student rolling features. Methods never
+    commit: changes are written in the caller's transaction, together with
+    the check-in that produced them.
     """
-    return [0.0] * 10  # Placeholder vector
+
+    def _get_row(self, db: Session, user_id: int) -> Optional[StudentFeatures]:
+        # Row lock on databases that support it, so two concurrent check-ins
+        # of the same student do not lose an update
+        return (
+            db.query(StudentFeatures)
+            .filter(StudentFeatures.user_id == user_id)
+            .with_for_update()
+            .first()
+        )
+
+    def _window_values(self, last_checkins: List[Any]) -> Dict[str, Any]:
+        """
+        Row values of a window given its check-ins, oldest first.
+        """
+        moods = [c.mood_score for c in last_checkins]
+        pressures = [c.academic_pressure for c in last_checkins]
+        return {
+            "checkin_count": len(moods),
+            "mood_sum": sum(moods),
+            "bad_days": sum(1 for m in moods if m < BAD_DAY_MOOD),
+            "pressure_sum": sum(p for p in pressures if p is not None),
+            "recent_moods": moods,
+            "recent_pressures": pressures,
+        }
+
+    def _window(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """
+        A student's window recomputed from the check-in history.
+        """
+        last_checkins = (
+            db.query(EmotionalCheckin.mood_score, EmotionalCheckin.academic_pressure)
+            .filter(EmotionalCheckin.user_id == user_id)
+            .order_by(EmotionalCheckin.created_at.desc())
+            .limit(WINDOW_SIZE)
+            .all()
+        )
+        return self._window_values(list(reversed(last_checkins)))
+
+    def _windows(self, db: Session, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        The windows of many students from one query: the check-ins are
+        numbered per student, newest first, and the first WINDOW_SIZE kept.
+        Students without check-ins get an empty window.
+        """
+        position = (
+            func.row_number()
+            .over(
+                partition_by=EmotionalCheckin.user_id,
+                order_by=EmotionalCheckin.created_at.desc(),
+            )
+            .label("position")
+        )
+        ranked = (
+            select(
+                EmotionalCheckin.user_id,
+                EmotionalCheckin.mood_score,
+                EmotionalCheckin.academic_pressure,
+                position,
+            )
+            .where(EmotionalCheckin.user_id.in_(user_ids))
+            .subquery()
+        )
+        last_checkins: Dict[int, List[Any]] = {user_id: [] for user_id in user_ids}
+        for row in db.execute(
+            select(ranked)
+            .where(ranked.c.position <= WINDOW_SIZE)
+            .order_by(ranked.c.user_id, ranked.c.position.desc())
+        ):
+            last_checkins[row.user_id].append(row)
+        return {
+            user_id: self._window_values(checkins)
+            for user_id, checkins in last_checkins.items()
+        }
+
+    def rebuild(self, db: Session, user_id: int) -> StudentFeatures:
+        """
+        Recomputes a student's window from the check-in history, creating
+        the row if needed. Used on a student's first check-in since the table
+        was introduced and after check-in imports.
+        """
+        # Upsert, then lock: a concurrent first check-in of the same student
+        # finds the row instead of inserting a second one
+        insert = UPSERT_INSERTS[db.get_bind().dialect.name]
+        db.execute(
+            insert(StudentFeatures)
+            .values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        features = self._get_row(db, user_id)
+        # Read under the row lock, so it includes every committed check-in
+        for column, value in self._window(db, user_id).items():
+            setattr(features, column, value)
+        return features
+
+    def backfill(self, db: Session, user_ids: Iterable[int]) -> int:
+        """
+        Creates the missing rows of the given students from the check-in
+        history, with one window query and one bulk upsert. Rows that exist,
+        or that a concurrent check-in creates meanwhile, are left as they
+        are. Returns the rows created.
+        """
+        user_ids = list(user_ids)
+        existing = {
+            user_id
+            for (user_id,) in db.query(StudentFeatures.user_id)
+            .filter(StudentFeatures.user_id.in_(user_ids))
+            .all()
+        }
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        if not missing:
+            return 0
+        insert = UPSERT_INSERTS[db.get_bind().dialect.name]
+        windows = self._windows(db, missing)
+        db.execute(
+            insert(StudentFeatures).on_conflict_do_nothing(index_elements=["user_id"]),
+            [{"user_id": user_id, **windows[user_id]} for user_id in missing],
+        )
+        return len(missing)
+
+    def record_checkin(self, db: Session, checkin: EmotionalCheckin) -> StudentFeatures:
+        """
+        Applies a new check-in, which must already be added to the session,
+        to its student's window in O(1).
+        """
+        # Flushing first applies column defaults (a missing pressure is
+        # stored as 3), so the window holds exactly what the table holds
+        db.flush()
+        features = self._get_row(db, checkin.user_id)
+        if features is None:
+            # First check-in since the table was introduced: build the window
+            # from the history, which already includes this check-in
+            return self.rebuild(db, checkin.user_id)
+
+        moods = list(features.recent_moods)
+        pressures = list(features.recent_pressures)
+        if len(moods) >= WINDOW_SIZE:
+            evicted_mood = moods.pop(0)
+            evicted_pressure = pressures.pop(0)
+            features.mood_sum -= evicted_mood
+            features.bad_days -= evicted_mood < BAD_DAY_MOOD
+            features.pressure_sum -= evicted_pressure or 0
+
+        moods.append(checkin.mood_score)
+        pressures.append(checkin.academic_pressure)
+        features.mood_sum += checkin.mood_score
+        features.bad_days += checkin.mood_score < BAD_DAY_MOOD
+        features.pressure_sum += checkin.academic_pressure or 0
+        features.checkin_count = len(moods)
+        # Reassigned (not mutated in place) so the JSON columns are flushed
+        features.recent_moods = moods
+        features.recent_pressures = pressures
+        return features
+
+    def get_vector(self, db: Session, user_id: int) -> FeatureVector:
+        """
+        Features of one student from a single row read.
+        """
+        features = (
+            db.query(StudentFeatures).filter(StudentFeatures.user_id == user_id).first()
+        )
+        if features is None:
+            # Not stored: the row is created by the next check-in
+            features = StudentFeatures(user_id=user_id, **self._window(db, user_id))
+        return to_vector(features)
+
+    def feature_matrix(self, db: Session, user_ids: Iterable[int]) -> np.ndarray:
+        """
+        (N, 3) array of [mood_avg, bad_days, pressure_avg] for the given
+        students, in order, from one query. Students without a row get their
+        features from the history, all in one more query, without storing
+        them.
+        """
+        user_ids = list(user_ids)
+        rows = {
+            f.user_id: f
+            for f in db.query(StudentFeatures)
+            .filter(StudentFeatures.user_id.in_(user_ids))
+            .all()
+        }
+        missing = [user_id for user_id in user_ids if user_id not in rows]
+        if missing:
+            for user_id, window in self._windows(db, missing).items():
+                rows[user_id] = StudentFeatures(user_id=user_id, **window)
+        matrix = np.empty((len(user_ids), 3), dtype=np.float64)
+        for i, user_id in enumerate(user_ids):
+            matrix[i] = to_vector(rows[user_id])
+        return matrix
+
+
+feature_store = FeatureStore()
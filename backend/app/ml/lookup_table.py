@@ -0,0 +1,171 @@
+"""
+This module precomputes the risk model over its discrete input space.
+
+Every input of `RiskClassifier.predict_risk` comes from a bounded grid:
+PSS is an integer 0-40, bad days is 0-7 and the mood/pressure averages are
+`sum / count` over at most 7 check-ins scored 1-5. The table enumerates that
+grid once per model and answers predictions by array indexing.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_CHECKINS = 7
+MAX_SCALE_SCORE = 5
+MAX_PSS_SCORE = 40
+
+# Rows evaluated per predict_proba call while building the table
+BUILD_CHUNK_SIZE = 200_000
+
+
+def _checkin_averages(min_score: int) -> np.ndarray:
+    """
+    Every value `sum / count` can take for 1..7 check-ins whose scores add up
+    to at least `min_score * count`. Computed as Python int / int, exactly
+    like the aggregation in AssessmentService.
+    """
+    values = {
+        total / count
+        for count in range(1, MAX_CHECKINS + 1)
+        for total in range(min_score * count, MAX_SCALE_SCORE * count + 1)
+    }
+    return np.array(sorted(values), dtype=np.float64)
+
+
+def feature_grid() -> List[np.ndarray]:
+    """
+    Returns the sorted grid of each model-scale feature, in the column order
+    of FEATURE_COLUMNS (pss_score, mood_avg, bad_days_freq, study_pressure).
+    """
+    pss = np.arange(MAX_PSS_SCORE + 1, dtype=np.float64)
+    # Mood scores are mandatory, so the average is always within 1-5
+    mood = _checkin_averages(min_score=1)
+    bad_days = np.arange(MAX_CHECKINS + 1, dtype=np.float64)
+    # Pressure may be missing on some check-ins and still counts in the
+    # denominator, so its average can drop below 1
+    study_pressure = _checkin_averages(min_score=0) * 2.0
+    return [pss, mood, bad_days, study_pressure]
+
+
+def _split_thresholds(model, n_features: int) -> List[Optional[np.ndarray]]:
+    """
+    Collects, per feature, every threshold used by the forest. Returns None
+    for all features when the model does not expose its trees.
+    """
+    if hasattr(model, "split_thresholds"):
+        # CompiledForest keeps the thresholds in its flat node table
+        return model.split_thresholds(n_features)
+
+    estimators = getattr(model, "estimators_", None)
+    if not estimators or not all(hasattr(e, "tree_") for e in estimators):
+        return [None] * n_features
+
+    per_feature = [[] for _ in range(n_features)]
+    for estimator in estimators:
+        tree = estimator.tree_
+        split_nodes = tree.feature >= 0
+        for feature, threshold in zip(
+            tree.feature[split_nodes], tree.threshold[split_nodes]
+        ):
+            per_feature[feature].append(threshold)
+    return [np.unique(np.asarray(t, dtype=np.float64)) for t in per_feature]
+
+
+class RiskLookupTable:
+    """
+    Dense (class index, confidence) table over the feature grid.
+
+    Grid values that fall between the same pair of split thresholds take the
+    same path through every tree, so each axis is collapsed into buckets and
+    the model is only evaluated once per bucket combination.
+    """
+
+    def __init__(
+        self,
+        grid: List[np.ndarray],
+        buckets: List[np.ndarray],
+        classes: np.ndarray,
+        confidences: np.ndarray,
+    ):
+        self.grid = grid
+        self.buckets = buckets
+        self.classes = classes
+        self.confidences = confidences
+        self.shape = classes.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.classes.nbytes + self.confidences.nbytes
+
+    @classmethod
+    def build(cls, model, columns: List[str]) -> "RiskLookupTable":
+        grid = feature_grid()
+        thresholds = _split_thresholds(model, len(grid))
+
+        buckets = []
+        representatives = []
+        for values, feature_thresholds in zip(grid, thresholds):
+            if feature_thresholds is None:
+                bucket_of_value = np.arange(len(values))
+            else:
+                # sklearn trees compare float32 inputs with `x <= threshold`
+                as_float32 = values.astype(np.float32).astype(np.float64)
+                positions = np.searchsorted(feature_thresholds, as_float32, side="left")
+                _, bucket_of_value = np.unique(positions, return_inverse=True)
+            _, first_index = np.unique(bucket_of_value, return_index=True)
+            buckets.append(bucket_of_value.astype(np.intp))
+            representatives.append(values[first_index])
+
+        shape = tuple(len(r) for r in representatives)
+        mesh = np.meshgrid(*representatives, indexing="ij")
+        rows = np.column_stack([m.ravel() for m in mesh])
+
+        model_classes = np.asarray(model.classes_, dtype=np.int64)
+        classes = np.empty(len(rows), dtype=np.int64)
+        confidences = np.empty(len(rows), dtype=np.float64)
+        use_frame = getattr(model, "feature_names_in_", None) is not None
+        if use_frame:
+            import pandas as pd
+
+        for start in range(0, len(rows), BUILD_CHUNK_SIZE):
+            chunk = rows[start : start + BUILD_CHUNK_SIZE]
+            model_input = pd.DataFrame(chunk, columns=columns) if use_frame else chunk
+            probas = model.predict_proba(model_input)
+            best = np.argmax(probas, axis=1)
+            classes[start : start + len(chunk)] = model_classes[best]
+            confidences[start : start + len(chunk)] = probas[np.arange(len(best)), best]
+
+        logger.info(
+            f"RiskLookupTable: {len(rows)} combinaciones precalculadas "
+            f"(grilla {tuple(len(g) for g in grid)} -> {shape})"
+        )
+        return cls(
+            grid,
+            buckets,
+            classes.astype(np.int8).reshape(shape),
+            confidences.reshape(shape),
+        )
+
+    def lookup(
+        self, model_features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Looks up model-scale rows. Returns (classes, confidences, hit) where
+        `hit` flags the rows that lie on the grid; the other entries are
+        undefined and must be scored by the model.
+        """
+        n_rows = model_features.shape[0]
+        hit = np.ones(n_rows, dtype=bool)
+        bucket_index = []
+        for axis, (values, buckets) in enumerate(zip(self.grid, self.buckets)):
+            column = model_features[:, axis]
+            position = np.clip(np.searchsorted(values, column), 0, len(values) - 1)
+            hit &= values[position] == column
+            bucket_index.append(buckets[position])
+
+        flat = np.ravel_multi_index(bucket_index, self.shape)
+        return self.classes.ravel()[flat], self.confidences.ravel()[flat], hit
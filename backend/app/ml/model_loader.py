@@ -1,12 +1,194 @@
 """
 This module handles model loading and versioning.
+
+Artifacts live in a registry directory, one folder per version:
+
+    <ML_MODEL_REGISTRY_DIR>/
+        ACTIVE                  # name of the version being served
+        <version>/model.pkl     # or model.npz, a CompiledForest export
+        <version>/manifest.json # {"version", "sha256", "artifact", ...}
+
+Publishing writes into a temporary folder and renames it into place, and
+activation rewrites ACTIVE through os.replace, so a worker polling the
+registry never observes a half-written artifact.
 """
 
-from typing import Any
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+ACTIVE_POINTER = "ACTIVE"
+ARTIFACT_NAME = "model.pkl"
+COMPILED_SUFFIX = ".npz"
+MANIFEST_NAME = "manifest.json"
+
+
+class ModelIntegrityError(Exception):
+    """
+    Raised when an artifact does not match the checksum in its manifest.
+    """
+
+
+def _resolve(path: str) -> str:
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.getcwd(), path)
+
 
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-def load_model(path: str) -> Any:
+
+def load_model(path: str, expected_sha256: Optional[str] = None) -> Any:
     """
-    Loads a serialized model from disk.
+    Loads a serialized model from disk, verifying its checksum first when
+    one is given. `.npz` files are compiled forests evaluated with NumPy
+    only; anything else is a joblib pickle. joblib (and sklearn, through the
+    pickle) is imported here so that importing this module stays cheap.
     """
-    return None
+    if expected_sha256 is not None:
+        actual = file_sha256(path)
+        if actual != expected_sha256:
+            raise ModelIntegrityError(
+                f"Checksum inválido para {path}: "
+                f"esperado {expected_sha256}, obtenido {actual}"
+            )
+    if path.endswith(COMPILED_SUFFIX):
+        from app.ml.tree_ensemble import CompiledForest
+
+        return CompiledForest.load(path)
+
+    import joblib
+
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts on the local filesystem.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = _resolve(root or settings.ML_MODEL_REGISTRY_DIR)
+
+    def _version_dir(self, version: str) -> str:
+        if not version or os.sep in version or version.startswith("."):
+            raise ValueError(f"Nombre de versión inválido: {version!r}")
+        return os.path.join(self.root, version)
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.root)
+
+    def active_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, ACTIVE_POINTER)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def pointer_stat(self):
+        """
+        Cheap change marker for the ACTIVE pointer, used by hot reload.
+        """
+        try:
+            stat = os.stat(os.path.join(self.root, ACTIVE_POINTER))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def manifest(self, version: str) -> Dict[str, Any]:
+        with open(os.path.join(self._version_dir(version), MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    def artifact_path(self, version: str) -> str:
+        artifact = self.manifest(version).get("artifact", ARTIFACT_NAME)
+        return os.path.join(self._version_dir(version), artifact)
+
+    def list_versions(self) -> List[str]:
+        if not self.exists():
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, MANIFEST_NAME))
+        )
+
+    def load(self, version: str) -> Any:
+        """
+        Loads a published version after checking it against its manifest.
+        """
+        manifest = self.manifest(version)
+        return load_model(self.artifact_path(version), manifest["sha256"])
+
+    def publish(
+        self,
+        source_path: str,
+        version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        activate: bool = False,
+        attachments: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Copies an artifact into the registry under a new version and returns
+        the version name. `attachments` maps file names to JSON documents
+        (e.g. a training report) stored next to the artifact.
+        """
+        version = version or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        target = self._version_dir(version)
+        if os.path.exists(target):
+            raise FileExistsError(f"La versión {version} ya existe")
+
+        os.makedirs(self.root, exist_ok=True)
+        artifact_name = "model" + (
+            COMPILED_SUFFIX if source_path.endswith(COMPILED_SUFFIX) else ".pkl"
+        )
+        staging = tempfile.mkdtemp(prefix=f".{version}-", dir=self.root)
+        try:
+            artifact = os.path.join(staging, artifact_name)
+            shutil.copyfile(source_path, artifact)
+            manifest = {
+                "version": version,
+                "artifact": artifact_name,
+                "sha256": file_sha256(artifact),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                **(metadata or {}),
+            }
+            with open(os.path.join(staging, MANIFEST_NAME), "w") as f:
+                json.dump(manifest, f, indent=2)
+            for name, document in (attachments or {}).items():
+                if name == MANIFEST_NAME or os.sep in name:
+                    raise ValueError(f"Nombre de adjunto inválido: {name!r}")
+                with open(os.path.join(staging, name), "w") as f:
+                    json.dump(document, f, indent=2)
+            os.rename(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str) -> None:
+        """
+        Points ACTIVE at an already published version.
+        """
+        if not os.path.isfile(os.path.join(self._version_dir(version), MANIFEST_NAME)):
+            raise FileNotFoundError(f"La versión {version} no existe")
+        fd, tmp_path = tempfile.mkstemp(prefix=".ACTIVE-", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, ACTIVE_POINTER))
+
+
+model_registry = ModelRegistry()
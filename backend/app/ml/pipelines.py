@@ -1,15 +1,308 @@
 """
 This module defines ML pipelines (training, inference).
+
+`train_pipeline` loads the training set, cross-validates a grid of forest
+sizes and depths in parallel, measures the single-row latency of every
+candidate next to its accuracy, and publishes the chosen forest to the model
+registry together with a metrics report. Pass `p99_budget_ms` to pick the most
+accurate candidate whose p99 per-row latency fits the budget instead of the
+most accurate one overall.
+
+sklearn and pandas are imported inside the training functions so that the
+API process, which only uses `inference_pipeline`, never loads them.
+
+Usage:
+    python -m app.ml.pipelines --data data/processed_training_data.csv \\
+        --budget-ms 0.5 --activate
 """
 
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.ml.model_loader import ModelRegistry, model_registry
+from app.ml.risk_classifier import FEATURE_COLUMNS, risk_classifier
+from app.ml.tree_ensemble import CompiledForest
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, "..", "data", "processed_training_data.csv")
+TARGET_COLUMN = "risk_level"
+REPORT_NAME = "report.json"
+
+DEFAULT_PARAM_GRID = {
+    "n_estimators": [25, 50, 100, 200],
+    "max_depth": [4, 6, 8, 10, None],
+}
+
+# Rows timed one by one per candidate to estimate per-row latency
+LATENCY_SAMPLE_ROWS = 500
+
+
+class CandidateResult(NamedTuple):
+    n_estimators: int
+    max_depth: Optional[int]
+    cv_accuracy: float
+    cv_accuracy_std: float
+    # Single-row predict_proba on the compiled forest, as served by the API
+    latency_p50_ms: float
+    latency_p99_ms: float
+    fit_seconds: float
 
-def train_pipeline(data_path: str):
+
+def load_training_data(path: str):
+    """
+    Reads a CSV or Parquet training set and returns (X, y).
+    """
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=FEATURE_COLUMNS + [TARGET_COLUMN])
+    else:
+        df = pd.read_csv(path, usecols=FEATURE_COLUMNS + [TARGET_COLUMN])
+    return df[FEATURE_COLUMNS], df[TARGET_COLUMN]
+
+
+def measure_row_latency(model, rows: np.ndarray) -> np.ndarray:
     """
-    Orchestrates the training process: load, preprocess, train, save.
+    Times `predict_proba` on one row at a time and returns the per-row
+    latencies in milliseconds.
     """
+    model.predict_proba(rows[:1])  # Warm-up
+    latencies = np.empty(len(rows), dtype=np.float64)
+    for i in range(len(rows)):
+        row = rows[i : i + 1]
+        started = time.perf_counter()
+        model.predict_proba(row)
+        latencies[i] = (time.perf_counter() - started) * 1000.0
+    return latencies
 
 
-def inference_pipeline(input_data: dict):
+def search_forests(
+    X,
+    y,
+    param_grid: Optional[Dict[str, Sequence[Any]]] = None,
+    cv: int = 5,
+    n_jobs: int = -1,
+    random_state: int = 42,
+    latency_rows: int = LATENCY_SAMPLE_ROWS,
+) -> List[CandidateResult]:
+    """
+    Cross-validates every (n_estimators, max_depth) combination in parallel,
+    then refits each candidate on all of X and times it sequentially, so the
+    latency figures are not skewed by concurrent fits.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import GridSearchCV
+
+    param_grid = param_grid or DEFAULT_PARAM_GRID
+    search = GridSearchCV(
+        RandomForestClassifier(random_state=random_state),
+        param_grid,
+        scoring="accuracy",
+        cv=cv,
+        n_jobs=n_jobs,
+        refit=False,
+    )
+    search.fit(X, y)
+
+    rng = np.random.default_rng(random_state)
+    sample = np.asarray(X, dtype=np.float64)
+    sample = sample[rng.choice(len(sample), min(latency_rows, len(sample)), False)]
+
+    results = []
+    cv_results = search.cv_results_
+    for i, params in enumerate(cv_results["params"]):
+        started = time.perf_counter()
+        forest = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs)
+        forest.set_params(**params).fit(X, y)
+        fit_seconds = time.perf_counter() - started
+
+        latencies = measure_row_latency(CompiledForest.from_sklearn(forest), sample)
+        results.append(
+            CandidateResult(
+                n_estimators=params["n_estimators"],
+                max_depth=params["max_depth"],
+                cv_accuracy=float(cv_results["mean_test_score"][i]),
+                cv_accuracy_std=float(cv_results["std_test_score"][i]),
+                latency_p50_ms=float(np.percentile(latencies, 50)),
+                latency_p99_ms=float(np.percentile(latencies, 99)),
+                fit_seconds=fit_seconds,
+            )
+        )
+        logger.info(
+            f"Candidato n_estimators={params['n_estimators']} "
+            f"max_depth={params['max_depth']}: "
+            f"accuracy={results[-1].cv_accuracy:.4f} "
+            f"p99={results[-1].latency_p99_ms:.3f}ms"
+        )
+    return results
+
+
+def select_candidate(
+    results: List[CandidateResult], p99_budget_ms: Optional[float] = None
+) -> CandidateResult:
+    """
+    Most accurate candidate within the latency budget; among equally
+    accurate ones, the fastest. Without a budget, the most accurate overall.
+    If nothing fits the budget, the fastest candidate is returned.
+    """
+    if not results:
+        raise ValueError("No hay candidatos para seleccionar")
+    eligible = results
+    if p99_budget_ms is not None:
+        eligible = [r for r in results if r.latency_p99_ms <= p99_budget_ms]
+        if not eligible:
+            fastest = min(results, key=lambda r: r.latency_p99_ms)
+            logger.warning(
+                f"Ningún candidato cumple p99 <= {p99_budget_ms}ms; "
+                f"se usa el más rápido ({fastest.latency_p99_ms:.3f}ms)"
+            )
+            return fastest
+    return max(eligible, key=lambda r: (r.cv_accuracy, -r.latency_p99_ms))
+
+
+def train_pipeline(
+    data_path: str = DATA_PATH,
+    param_grid: Optional[Dict[str, Sequence[Any]]] = None,
+    p99_budget_ms: Optional[float] = None,
+    cv: int = 5,
+    n_jobs: int = -1,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    version: Optional[str] = None,
+    activate: bool = False,
+    registry: Optional[ModelRegistry] = None,
+) -> Dict[str, Any]:
+    """
+    Orchestrates the training process: load, search, evaluate, publish.
+    Returns the metrics report, which is also stored as report.json in the
+    published version.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score, classification_report
+    from sklearn.model_selection import train_test_split
+
+    registry = registry or model_registry
+    X, y = load_training_data(data_path)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+    logger.info(f"Entrenando con {len(X_train)} filas, evaluando con {len(X_test)}")
+
+    candidates = search_forests(
+        X_train,
+        y_train,
+        param_grid=param_grid,
+        cv=cv,
+        n_jobs=n_jobs,
+        random_state=random_state,
+    )
+    chosen = select_candidate(candidates, p99_budget_ms)
+
+    forest = RandomForestClassifier(
+        n_estimators=chosen.n_estimators,
+        max_depth=chosen.max_depth,
+        random_state=random_state,
+        n_jobs=n_jobs,
+    ).fit(X_train, y_train)
+    compiled = CompiledForest.from_sklearn(forest)
+    predictions = compiled.predict(X_test.to_numpy(dtype=np.float64))
+
+    report = {
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "data_path": os.path.abspath(data_path),
+        "train_rows": len(X_train),
+        "test_rows": len(X_test),
+        "p99_budget_ms": p99_budget_ms,
+        "selected": chosen._asdict(),
+        "test_accuracy": float(accuracy_score(y_test, predictions)),
+        "classification_report": classification_report(
+            y_test, predictions, output_dict=True, zero_division=0
+        ),
+        "candidates": [c._asdict() for c in candidates],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = os.path.join(tmp, "model.npz")
+        compiled.save(artifact)
+        version = registry.publish(
+            artifact,
+            version=version,
+            metadata={
+                "params": {
+                    "n_estimators": chosen.n_estimators,
+                    "max_depth": chosen.max_depth,
+                },
+                "test_accuracy": report["test_accuracy"],
+                "latency_p99_ms": chosen.latency_p99_ms,
+            },
+            activate=activate,
+            attachments={REPORT_NAME: report},
+        )
+    report["version"] = version
+    logger.info(
+        f"Versión {version} publicada: n_estimators={chosen.n_estimators} "
+        f"max_depth={chosen.max_depth} accuracy={report['test_accuracy']:.4f}"
+    )
+    return report
+
+
+def inference_pipeline(input_data: dict) -> Dict[str, Any]:
     """
     Orchestrates the inference process: preprocess, predict, postprocess.
+    `input_data` carries the arguments of RiskClassifier.predict_risk.
     """
+    features = np.array(
+        [
+            [
+                float(input_data["pss_score"]),
+                float(input_data.get("checkin_avg", 3.0)),
+                float(input_data.get("bad_days_count", 0)),
+                float(input_data.get("academic_pressure_avg", 3.0)),
+            ]
+        ]
+    )
+    levels, confidences = risk_classifier.predict_risk_batch(features)
+    return {"risk_level": str(levels[0]), "confidence": float(confidences[0])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Entrena y publica el modelo")
+    parser.add_argument("--data", default=DATA_PATH, help="CSV o Parquet")
+    parser.add_argument("--budget-ms", type=float, help="Presupuesto p99 por fila")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--version", help="Nombre de versión (por defecto, fecha)")
+    parser.add_argument("--activate", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = train_pipeline(
+        args.data,
+        p99_budget_ms=args.budget_ms,
+        cv=args.cv,
+        n_jobs=args.n_jobs,
+        version=args.version,
+        activate=args.activate,
+    )
+    print(f"Versión: {report['version']}")
+    print(f"Accuracy (test): {report['test_accuracy']:.4f}")
+    print("n_estimators max_depth  cv_acc   p50_ms   p99_ms")
+    for c in report["candidates"]:
+        print(
+            f"{c['n_estimators']:>12} {str(c['max_depth']):>9} "
+            f"{c['cv_accuracy']:.4f} {c['latency_p50_ms']:8.3f} "
+            f"{c['latency_p99_ms']:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
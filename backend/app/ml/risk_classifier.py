@@ -1,26 +1,71 @@
 import logging
 import os
-from typing import Dict, Tuple
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
-import joblib
-import pandas as pd
+import numpy as np
 
 from app.core.config import settings
+from app.ml.lookup_table import RiskLookupTable
+from app.ml.model_loader import ModelRegistry, file_sha256, load_model, model_registry
 
 logger = logging.getLogger(__name__)
 
+# Columns the Random Forest was trained on (see train_med_model.py)
+FEATURE_COLUMNS = ["pss_score", "mood_avg", "bad_days_freq", "study_pressure"]
+
+# Model class index -> risk level label
+RISK_LEVELS = np.array(["Low", "Medium", "High"])
+
+
+class ActiveModel(NamedTuple):
+    """
+    Immutable snapshot of the model being served. The classifier swaps the
+    whole snapshot with one attribute assignment, so a prediction that took a
+    reference keeps using the same model and lookup table until it finishes.
+    """
+
+    model: Any
+    lookup_table: Optional[RiskLookupTable]
+    version: Optional[str]
+    sha256: Optional[str]
+    source: str  # "registry", "file", "memory" or "none"
+    loaded_at: datetime
+
 
 class RiskClassifier:
 
-    def __init__(self):
-        self.model = None
+    def __init__(
+        self,
+        use_lookup_table: Optional[bool] = None,
+        registry: Optional[ModelRegistry] = None,
+    ):
+        self.use_lookup_table = (
+            settings.ML_RISK_LOOKUP_TABLE
+            if use_lookup_table is None
+            else use_lookup_table
+        )
+        self.registry = registry or model_registry
+        self._loaded = threading.Event()
+        self._init_lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+        self._active = ActiveModel(
+            None, None, None, None, "none", datetime.now(timezone.utc)
+        )
+        self._reload_lock = threading.Lock()
+        self._reloader: Optional[threading.Thread] = None
+        self._source_marker = None
+        self._last_check = 0.0
         if os.path.isabs(settings.ML_MODEL_PATH):
             self.model_path = settings.ML_MODEL_PATH
         else:
             base_path = os.getcwd()
             self.model_path = os.path.join(base_path, settings.ML_MODEL_PATH)
 
-        self._load_model()
+        # The model (and with it pandas/sklearn) is loaded on first use or by
+        # warm_up(), never at import time.
 
         self.weights = {
             "pss_10": 0.4,
@@ -28,54 +73,227 @@ class RiskClassifier:
             "frequency_low_mood": 0.3,
         }
 
+    @property
+    def model(self):
+        self._ensure_loaded()
+        return self._active.model
+
+    @property
+    def lookup_table(self) -> Optional[RiskLookupTable]:
+        self._ensure_loaded()
+        return self._active.lookup_table
+
+    @property
+    def active(self) -> ActiveModel:
+        self._ensure_loaded()
+        return self._active
+
+    @property
+    def is_ready(self) -> bool:
+        return self._loaded.is_set()
+
+    def _ensure_loaded(self):
+        if self._loaded.is_set():
+            return
+        with self._init_lock:
+            if self._loaded.is_set():
+                return
+            started = time.perf_counter()
+            self._load_model()
+            self.load_seconds = time.perf_counter() - started
+            self._loaded.set()
+            logger.info(f"RiskClassifier: modelo listo en {self.load_seconds:.3f}s")
+
+    def warm_up(self) -> None:
+        """
+        Loads the model ahead of the first prediction. Meant to run in a
+        background thread after the API has started accepting requests.
+        """
+        try:
+            self._ensure_loaded()
+        except Exception as e:
+            logger.error(f"RiskClassifier: Falló el precalentamiento: {e}")
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _current_marker(self):
+        return self.registry.pointer_stat(), self._file_stat()
+
     def _load_model(self):
+        """
+        Loads the active registry version, or the legacy ML_MODEL_PATH file
+        when the registry has none. On failure the previous model keeps
+        serving.
+        """
+        with self._reload_lock:
+            self._load_locked()
+
+    def _load_locked(self):
+        # Caller holds _reload_lock
+        self._source_marker = self._current_marker()
+        self._last_check = time.monotonic()
         try:
-            if os.path.exists(self.model_path):
-                self.model = joblib.load(self.model_path)
+            version = self.registry.active_version()
+            if version:
+                manifest = self.registry.manifest(version)
+                model = self.registry.load(version)
+                self.set_model(model, version, manifest["sha256"], "registry")
+            elif os.path.exists(self.model_path):
+                # Hashed once: the digest is the version, there is no
+                # expected checksum to verify it against
+                sha256 = file_sha256(self.model_path)
+                model = load_model(self.model_path)
+                self.set_model(model, f"file-{sha256[:12]}", sha256, "file")
             else:
                 logger.warning(f"RiskClassifier: {self.model_path}")
         except Exception as e:
             logger.error(f"RiskClassifier: Falló la carga del modelo ML: {e}")
 
-    def predict_risk(
+    def set_model(
         self,
-        pss_score: float,
-        checkin_avg: float,
-        bad_days_count: int,
-        academic_pressure_avg: float,
-    ) -> Tuple[str, float]:
-
-        if self.model:
+        model,
+        version: Optional[str] = None,
+        sha256: Optional[str] = None,
+        source: str = "memory",
+    ) -> None:
+        """
+        Installs a model and, in lookup mode, the table precomputed from it.
+        The table is built before the swap so readers never see a model
+        paired with a table from another model.
+        """
+        table = None
+        if model is not None and self.use_lookup_table:
             try:
-                pss_raw = int(pss_score * 40)
-                study_pressure = academic_pressure_avg * 2.0
-
-                features_df = pd.DataFrame(
-                    [[pss_raw, checkin_avg, bad_days_count, study_pressure]],
-                    columns=[
-                        "pss_score",
-                        "mood_avg",
-                        "bad_days_freq",
-                        "study_pressure",
-                    ],
-                )
+                table = RiskLookupTable.build(model, FEATURE_COLUMNS)
+            except Exception as e:
+                logger.error(f"RiskClassifier: Falló la tabla de búsqueda: {e}")
+        self._active = ActiveModel(
+            model,
+            table,
+            version,
+            sha256,
+            source if model is not None else "none",
+            datetime.now(timezone.utc),
+        )
+        # An explicitly installed model counts as loaded: skip the disk load
+        self._loaded.set()
+        if model is not None:
+            logger.info(f"RiskClassifier: modelo activo {version} ({source})")
 
-                pred_class = self.model.predict(features_df)[0]
+    def _refresh_if_changed(self):
+        """
+        Reloads the model (and rebuilds its lookup table) in a background
+        thread when the registry pointer or the model file changes. Checked
+        at most every ML_MODEL_CHECK_INTERVAL seconds; the caller, and every
+        prediction until the swap, keeps using the current model.
+        """
+        now = time.monotonic()
+        if now - self._last_check < settings.ML_MODEL_CHECK_INTERVAL:
+            return
+        self._last_check = now
+        if self._current_marker() == self._source_marker:
+            return
+        # Another thread is already reloading
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        logger.info("RiskClassifier: modelo modificado, recargando")
+        try:
+            self._reloader = threading.Thread(
+                target=self._reload_in_background, name="model-reload", daemon=True
+            )
+            self._reloader.start()
+        except Exception:
+            self._reload_lock.release()
+            raise
 
-                probas = self.model.predict_proba(features_df)[0]
-                confidence = probas[pred_class]
+    def _reload_in_background(self):
+        try:
+            self._load_locked()
+        finally:
+            self._reload_lock.release()
 
-                mapping = {
-                    0: "Low",
-                    1: "Medium",
-                    2: "High",
-                }
-                return mapping.get(pred_class, "Low"), float(confidence)
-            except Exception as e:
-                logger.error(f"Predicción ML falló: {e}. Recurriendo a heurística.")
+    def wait_for_reload(self, timeout: Optional[float] = None) -> None:
+        """
+        Blocks until the background reload in progress, if any, is done.
+        """
+        if self._reloader is not None:
+            self._reloader.join(timeout)
+
+    @staticmethod
+    def _to_model_features(features: np.ndarray) -> np.ndarray:
+        """
+        Converts API-level rows (normalized PSS, mood average, bad days,
+        pressure average) into the raw scale the model was trained on.
+        """
+        model_features = np.empty_like(features, dtype=np.float64)
+        # int() truncation of the original single-row path, inputs are >= 0
+        model_features[:, 0] = np.trunc(features[:, 0] * 40)
+        model_features[:, 1] = features[:, 1]
+        model_features[:, 2] = features[:, 2]
+        model_features[:, 3] = features[:, 3] * 2.0
+        return model_features
+
+    @staticmethod
+    def _predict_classes(
+        model, model_features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if getattr(model, "feature_names_in_", None) is not None:
+            import pandas as pd
+
+            # A single frame for the whole batch keeps sklearn's feature-name
+            # check happy without paying for one DataFrame per student.
+            model_input = pd.DataFrame(model_features, columns=FEATURE_COLUMNS)
+        else:
+            model_input = model_features
+
+        # One forest traversal: the predicted class is the argmax of the
+        # probabilities, exactly what RandomForestClassifier.predict does.
+        probas = model.predict_proba(model_input)
+        best = np.argmax(probas, axis=1)
+        classes = np.asarray(model.classes_, dtype=np.int64)[best]
+        confidences = probas[np.arange(len(best)), best].astype(np.float64)
+        return classes, confidences
+
+    def _model_predict_batch(
+        self, active: ActiveModel, features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        model_features = self._to_model_features(features)
+        table = active.lookup_table
+        if table is None:
+            classes, confidences = self._predict_classes(active.model, model_features)
+        else:
+            classes, confidences, hit = table.lookup(model_features)
+            if not hit.all():
+                # Off-grid rows (e.g. hand-built inputs) still go to the model
+                miss = ~hit
+                classes, confidences = classes.copy(), confidences.copy()
+                classes[miss], confidences[miss] = self._predict_classes(
+                    active.model, model_features[miss]
+                )
+
+        levels = np.where(
+            (classes >= 0) & (classes < len(RISK_LEVELS)),
+            RISK_LEVELS[np.clip(classes, 0, len(RISK_LEVELS) - 1)],
+            "Low",
+        )
+        return levels, confidences
+
+    @staticmethod
+    def _heuristic_predict_batch(
+        features: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        pss_score = features[:, 0]
+        checkin_avg = features[:, 1]
+        bad_days_count = features[:, 2]
+        academic_pressure_avg = features[:, 3]
 
         normalized_mood = (5 - checkin_avg) / 4.0
-        normalized_bad_days = min(bad_days_count / 7.0, 1.0)
+        normalized_bad_days = np.minimum(bad_days_count / 7.0, 1.0)
         normalized_pressure = (academic_pressure_avg - 1) / 4.0
 
         score = (
@@ -85,16 +303,65 @@ class RiskClassifier:
             + normalized_pressure * 0.2
         )
 
-        if score < 0.3:
-            return "Low", 1.0 - score
-        elif score < 0.6:
-            return "Medium", score if score > 0.5 else 1.0 - score
-        else:
-            return "High", score
+        low = score < 0.3
+        medium = ~low & (score < 0.6)
+        levels = np.where(low, "Low", np.where(medium, "Medium", "High"))
+        confidences = np.where(
+            low,
+            1.0 - score,
+            np.where(medium & (score <= 0.5), 1.0 - score, score),
+        )
+        return levels, confidences.astype(np.float64)
+
+    def predict_risk_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores N students at once.
+
+        `features` is an (N, 4) array whose columns follow the arguments of
+        `predict_risk`: normalized PSS (0-1), check-in mood average, bad days
+        count and academic pressure average. Returns an array of risk levels
+        and an array of confidences, computed from a single `predict_proba`
+        pass over the whole batch.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(FEATURE_COLUMNS):
+            raise ValueError(
+                f"Se esperaba una matriz (N, {len(FEATURE_COLUMNS)}), "
+                f"se recibió {features.shape}"
+            )
+        if features.shape[0] == 0:
+            return np.empty(0, dtype=RISK_LEVELS.dtype), np.empty(0)
+
+        self._ensure_loaded()
+        self._refresh_if_changed()
+        active = self._active
+        if active.model:
+            try:
+                return self._model_predict_batch(active, features)
+            except Exception as e:
+                logger.error(f"Predicción ML falló: {e}. Recurriendo a heurística.")
+
+        return self._heuristic_predict_batch(features)
+
+    def predict_risk(
+        self,
+        pss_score: float,
+        checkin_avg: float,
+        bad_days_count: int,
+        academic_pressure_avg: float,
+    ) -> Tuple[str, float]:
+        levels, confidences = self.predict_risk_batch(
+            np.array(
+                [[pss_score, checkin_avg, bad_days_count, academic_pressure_avg]],
+                dtype=np.float64,
+            )
+        )
+        return str(levels[0]), float(confidences[0])
 
     def get_feature_importance(self) -> Dict[str, float]:
-        if self.model:
-            imps = self.model.feature_importances_
+        model = self.model
+        if model:
+            imps = model.feature_importances_
             return {
                 "pss_score": float(imps[0]),
                 "checkin_avg": float(imps[1]),
@@ -6,11 +6,15 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.model_selection import train_test_split
 
+from app.ml.tree_ensemble import CompiledForest
+
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "..", "data", "processed_training_data.csv")
 MODEL_DIR = os.path.join(BASE_DIR, "models")
 MODEL_PATH = os.path.join(MODEL_DIR, "risk_model.pkl")
+# Same forest as flat NumPy arrays, servable without sklearn
+COMPILED_MODEL_PATH = os.path.join(MODEL_DIR, "risk_model.npz")
 
 
 def train_model():
@@ -53,6 +57,9 @@ def train_model():
     joblib.dump(clf, MODEL_PATH)
     print(f"\nModel saved to: {MODEL_PATH}")
 
+    CompiledForest.from_sklearn(clf).save(COMPILED_MODEL_PATH)
+    print(f"Compiled model saved to: {COMPILED_MODEL_PATH}")
+
 
 if __name__ == "__main__":
     train_model()
@@ -0,0 +1,248 @@
+"""
+This module evaluates the Random Forest from flat NumPy arrays.
+
+`CompiledForest.from_sklearn` exports a fitted `RandomForestClassifier` into
+one node table shared by all trees (feature index, threshold, children and
+per-leaf class probabilities). `predict_proba` then walks every tree for a
+whole batch at once, without sklearn's per-call validation, and API workers
+serving a compiled artifact never import sklearn.
+
+The arithmetic mirrors sklearn exactly: inputs are compared as float32
+against float64 thresholds (`x <= threshold` goes left), each tree yields its
+leaf's class probabilities, the per-tree probabilities are summed
+in estimator order and divided by the number of trees. The result is
+bit-for-bit identical to `RandomForestClassifier.predict_proba` (with the
+default n_jobs, which accumulates trees sequentially).
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+# Rows walked together; bounds the (n_trees, rows) scratch arrays
+ROW_CHUNK_SIZE = 4096
+
+
+class CompiledForest:
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        leaf_proba: np.ndarray,
+        roots: np.ndarray,
+        classes: np.ndarray,
+        max_depth: int,
+        feature_importances: Optional[np.ndarray] = None,
+        node_weight: Optional[np.ndarray] = None,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        if feature_importances is not None:
+            self.n_features_in_ = int(len(feature_importances))
+        else:
+            self.n_features_in_ = int(feature.max()) + 1
+        self.feature_importances_ = feature_importances
+        # Weighted training samples per node; only needed for SHAP
+        self.node_weight = node_weight
+        # Interleaved (right, left) pairs: one gather per traversal step
+        self._children = np.stack([right, left], axis=1).ravel()
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        """
+        Flattens a fitted sklearn RandomForestClassifier (single output).
+        """
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Solo se soportan bosques de una salida")
+
+        import sklearn
+
+        # sklearn >= 1.4 stores per-node class fractions and returns them
+        # untouched; older versions store weighted counts and normalize them
+        # at predict time
+        major, minor = (int(p) for p in sklearn.__version__.split(".")[:2])
+        stores_counts = (major, minor) < (1, 4)
+
+        n_classes = len(forest.classes_)
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        weights = []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left < 0
+
+            # Leaves point to themselves and test feature 0, so extra
+            # traversal steps are no-ops
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            if stores_counts:
+                # Same normalization as DecisionTreeClassifier.predict_proba
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            probas.append(value)
+            weights.append(tree.weighted_n_node_samples.astype(np.float64))
+
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, int(tree.max_depth))
+
+        importances = getattr(forest, "feature_importances_", None)
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            leaf_proba=np.concatenate(probas),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(forest.classes_),
+            max_depth=max_depth,
+            feature_importances=(
+                np.asarray(importances, dtype=np.float64)
+                if importances is not None
+                else None
+            ),
+            node_weight=np.concatenate(weights),
+        )
+
+    def save(self, path: str) -> None:
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "leaf_proba": self.leaf_proba,
+            "roots": self.roots,
+            "classes": self.classes_,
+            "max_depth": np.array(self.max_depth),
+        }
+        if self.feature_importances_ is not None:
+            arrays["feature_importances"] = self.feature_importances_
+        if self.node_weight is not None:
+            arrays["node_weight"] = self.node_weight
+        # Write through a file object so numpy does not append ".npz"
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledForest":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature=data["feature"].astype(np.intp),
+                threshold=data["threshold"],
+                left=data["left"].astype(np.intp),
+                right=data["right"].astype(np.intp),
+                leaf_proba=data["leaf_proba"],
+                roots=data["roots"].astype(np.intp),
+                classes=data["classes"],
+                max_depth=int(data["max_depth"]),
+                feature_importances=(
+                    data["feature_importances"]
+                    if "feature_importances" in data.files
+                    else None
+                ),
+                node_weight=(
+                    data["node_weight"] if "node_weight" in data.files else None
+                ),
+            )
+
+    def split_thresholds(self, n_features: int) -> List[np.ndarray]:
+        """
+        Thresholds used by the forest per feature (for the lookup table).
+        """
+        is_split = self.left != np.arange(len(self.left))
+        return [
+            np.unique(self.threshold[is_split & (self.feature == f)])
+            for f in range(n_features)
+        ]
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns the global leaf index reached in every tree, shape
+        (n_trees, n_rows).
+        """
+        # sklearn validates inputs to float32 before walking the trees
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X32.shape
+        flat_X = X32.ravel()
+        row_offset = (np.arange(n_rows) * n_features)[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            go_left = flat_X[row_offset + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self._children[2 * nodes + go_left]
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Se esperaba una matriz (N, {self.n_features_in_}), "
+                f"se recibió {X.shape}"
+            )
+        out = np.empty((X.shape[0], len(self.classes_)), dtype=np.float64)
+        for start in range(0, X.shape[0], ROW_CHUNK_SIZE):
+            chunk = X[start : start + ROW_CHUNK_SIZE]
+            total = np.zeros((len(chunk), len(self.classes_)), dtype=np.float64)
+            # Trees are added one by one in estimator order, like sklearn's
+            # accumulation loop, so the float sums round identically
+            for tree_proba in self.leaf_proba[self.apply(chunk)]:
+                total += tree_proba
+            total /= self.n_estimators
+            out[start : start + len(chunk)] = total
+        return out
+
+    def to_shap_model(self) -> dict:
+        """
+        The forest in shap's dictionary format, for `shap.TreeExplainer`.
+        Per-tree values are pre-scaled by 1 / n_estimators, as shap does for
+        sklearn forests, so the explanation adds up to `predict_proba`.
+        """
+        if self.node_weight is None:
+            raise ValueError("El modelo compilado no incluye pesos por nodo")
+        ends = np.append(self.roots[1:], len(self.left))
+        trees = []
+        for root, end in zip(self.roots, ends):
+            local = np.arange(end - root)
+            left = self.left[root:end] - root
+            right = self.right[root:end] - root
+            is_leaf = left == local
+            left = np.where(is_leaf, -1, left)
+            trees.append(
+                {
+                    "children_left": left,
+                    "children_right": np.where(is_leaf, -1, right),
+                    "children_default": left,
+                    "features": np.where(is_leaf, -2, self.feature[root:end]),
+                    "thresholds": np.where(is_leaf, -2.0, self.threshold[root:end]),
+                    "values": self.leaf_proba[root:end] / self.n_estimators,
+                    "node_sample_weight": self.node_weight[root:end],
+                }
+            )
+        return {
+            "trees": trees,
+            "input_dtype": np.float32,
+            "internal_dtype": np.float64,
+            "tree_output": "probability",
+        }
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -1,10 +1,13 @@
 from .alert import Alert  # noqa: F401
 from .assessment import Assessment  # noqa: F401
 from .assessment_response import AssessmentResponse  # noqa: F401
-from .audit_log import AuditLog  # noqa: F401
+from .audit_log import AuditLog, AuditLogArchive  # noqa: F401
 from .clinical_note import ClinicalNote  # noqa: F401
 from .consent import Consent  # noqa: F401
+from .email_outbox import EmailOutbox  # noqa: F401
 from .emotional_checkin import EmotionalCheckin  # noqa: F401
 from .risk_summary import RiskSummary  # noqa: F401
+from .student_dashboard import StudentDashboard  # noqa: F401
+from .student_features import StudentFeatures  # noqa: F401
 from .tokens import EmailVerificationToken, PasswordResetToken  # noqa: F401
 from .user import User, UserRole  # noqa: F401
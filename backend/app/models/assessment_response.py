@@ -1,4 +1,13 @@
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,6 +21,10 @@ class AssessmentResponse(Base):
     """
 
     __tablename__ = "assessment_responses"
+    # Latest assessment per student (staff roster, student history)
+    __table_args__ = (
+        Index("ix_assessment_responses_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
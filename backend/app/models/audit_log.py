@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,9 +9,17 @@ class AuditLog(Base):
     """
     Records sensitive data access for ethical compliance (GDPR/SDG).
     Tracks WHO accessed WHAT and WHEN.
+    Entries older than the retention window are moved to AuditLogArchive.
     """
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Filters and keyset order of the /audit endpoint
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_logs_actor_id_timestamp", "actor_id", "timestamp"),
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp"),
+        Index("ix_audit_logs_resource_id_timestamp", "resource_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     actor_id = Column(
@@ -25,3 +33,33 @@ class AuditLog(Base):
 
     # Relationship back to the user (the actor)
     actor = relationship("User", back_populates="audit_logs")
+
+
+class AuditLogArchive(Base):
+    """
+    Audit entries rolled over from `audit_logs` by the retention job
+    (app/services/audit_retention_service.py). Same columns and ids, so the
+    live table stays small while the full trail remains queryable.
+    """
+
+    __tablename__ = "audit_logs_archive"
+    __table_args__ = (
+        Index("ix_audit_logs_archive_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_logs_archive_actor_id_timestamp", "actor_id", "timestamp"),
+        Index("ix_audit_logs_archive_action_timestamp", "action", "timestamp"),
+        Index(
+            "ix_audit_logs_archive_resource_id_timestamp", "resource_id", "timestamp"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    actor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    action = Column(String, nullable=False)
+    resource_id = Column(String, nullable=True)
+    details = Column(Text, nullable=True)
+    timestamp = Column(DateTime(timezone=True), nullable=True)
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationship back to the user (the actor)
+    actor = relationship("User", back_populates="archived_audit_logs")
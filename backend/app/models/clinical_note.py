@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,6 +7,10 @@ from app.db.base_class import Base
 
 class ClinicalNote(Base):
     __tablename__ = "clinical_notes"
+    # A student's notes, newest first
+    __table_args__ = (
+        Index("ix_clinical_notes_student_id_created_at", "student_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(
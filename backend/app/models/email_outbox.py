@@ -0,0 +1,44 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class EmailOutbox(Base):
+    """
+    Transactional outbox of auth emails.
+    A row is written in the same transaction as the token it carries and is
+    sent later by the outbox drain worker (app/services/email_outbox_service.py),
+    so a failed send is retried instead of lost.
+    """
+
+    __tablename__ = "email_outbox"
+    # Due messages, in the order the drain worker claims them
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # One row per message: "<kind>-<token hash>"; also sent as the Message-ID
+    idempotency_key = Column(String, unique=True, nullable=False)
+    kind = Column(String, nullable=False)  # "verification", "password_reset"
+    to_email = Column(String, nullable=False)
+    # Token for the link, encrypted (app/services/email_outbox_service.py);
+    # cleared once the message is sent, given up or expired
+    token = Column(String, nullable=True)
+    # Expiry of the token: the message is not sent after it. Null only in
+    # rows written before tokens were encrypted (their token is plaintext)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    # pending, sent, failed, expired
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    # Due time of the next attempt; while a worker holds the row it is the end
+    # of that worker's lease
+    next_attempt_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,9 +13,14 @@ class EmotionalCheckin(Base):
     """
 
     __tablename__ = "emotional_checkins"
+    # A student's check-ins, newest first (history, features, dashboard);
+    # also serves user_id-only lookups
+    __table_args__ = (
+        Index("ix_emotional_checkins_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Mood score usually 1 to 5 (1: Very Bad, 5: Very Good)
     mood_score = Column(Integer, nullable=False)
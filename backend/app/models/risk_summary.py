@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -16,10 +16,14 @@ class RiskSummary(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
 
-    # Aggregated risk level predicted by the system
+    # Aggregated risk level predicted by the system (the staff views filter
+    # on the copy in student_dashboard, not on this column)
     current_risk_level = Column(String, default="Low")
     # Confidence score of the ML prediction (0.0 to 1.0)
     prediction_confidence = Column(Float, default=1.0)
+    # Inputs of the last ML prediction, in RiskClassifier.predict_risk order:
+    # [normalized PSS, mood average, bad days, pressure average]
+    model_features = Column(JSON, nullable=True)
 
     last_updated = Column(
         DateTime(timezone=True), onupdate=func.now(), server_default=func.now()
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+# Values of a student with no assessments yet. The roster filters and sorts
+# on these columns as they are, so they are never NULL: no COALESCE keeps
+# the indexes from serving the query
+DEFAULT_RISK_LEVEL = "Low"
+NO_ASSESSMENT_DATE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def assessment_date(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    last_assessment_date as shown to users: None for the placeholder.
+    """
+    if value is None:
+        return None
+    # SQLite returns naive datetimes
+    aware = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return None if aware <= NO_ASSESSMENT_DATE else value
+
+
+class StudentDashboard(Base):
+    """
+    Materialized per-student summary read by the staff views (roster and
+    institutional report), one row per student. Kept up to date in the same
+    transaction as the user creation, check-in, assessment, alert and user
+    status changes that affect it, so those views never aggregate the
+    history tables. Maintained by app/services/dashboard_service.py.
+    """
+
+    __tablename__ = "student_dashboard"
+    __table_args__ = (
+        # Roster filters and keyset orders
+        Index("ix_student_dashboard_risk_level_user_id", "risk_level", "user_id"),
+        Index(
+            "ix_student_dashboard_last_assessment_date_user_id",
+            "last_assessment_date",
+            "user_id",
+        ),
+        Index(
+            "ix_student_dashboard_risk_level_last_assessment_date_user_id",
+            "risk_level",
+            "last_assessment_date",
+            "user_id",
+        ),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Current risk level from the risk summary (DEFAULT_RISK_LEVEL until the
+    # first assessment)
+    risk_level = Column(
+        String,
+        nullable=False,
+        default=DEFAULT_RISK_LEVEL,
+        server_default=DEFAULT_RISK_LEVEL,
+    )
+    # Unresolved alerts
+    active_alerts = Column(Integer, nullable=False, default=0, server_default="0")
+    # NO_ASSESSMENT_DATE until the first assessment
+    last_assessment_date = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=NO_ASSESSMENT_DATE,
+        server_default="1970-01-01 00:00:00+00:00",
+    )
+    last_checkin_date = Column(DateTime(timezone=True), nullable=True)
+    # Mood average over the rolling check-in window of app/ml/features.py
+    mood_avg_7d = Column(Float, nullable=True)
+    # All-time check-in count and mood total, for the institutional average
+    checkin_count = Column(Integer, nullable=False, default=0)
+    mood_total = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=func.now()
+    )
+
+    # Relationship back to the user
+    user = relationship("User", back_populates="dashboard")
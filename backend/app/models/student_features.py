@@ -0,0 +1,38 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class StudentFeatures(Base):
+    """
+    Rolling check-in features used by the risk model, one row per student.
+    Holds the scores of the last check-ins (oldest first) plus their running
+    sums, so a new check-in updates the row without reading the history.
+    Maintained by app/ml/features.py.
+    """
+
+    __tablename__ = "student_features"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Check-ins currently in the window (0 to features.WINDOW_SIZE)
+    checkin_count = Column(Integer, nullable=False, default=0)
+    # Sum of mood scores in the window
+    mood_sum = Column(Integer, nullable=False, default=0)
+    # Check-ins in the window with mood below 3
+    bad_days = Column(Integer, nullable=False, default=0)
+    # Sum of the academic pressure values that were reported
+    pressure_sum = Column(Integer, nullable=False, default=0)
+
+    # Window contents, oldest first: [mood, ...] and [pressure or null, ...]
+    recent_moods = Column(JSON, nullable=False, default=list)
+    recent_pressures = Column(JSON, nullable=False, default=list)
+
+    updated_at = Column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=func.now()
+    )
+
+    # Relationship back to the user
+    user = relationship("User", back_populates="features")
@@ -1,20 +1,33 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.base_class import Base
 
 
+def _unused_token_index(table: str) -> Index:
+    # Tokens are only ever looked up while unused: used ones stay for the
+    # audit trail but out of the index
+    unused = text("used_at IS NULL")
+    return Index(
+        f"ix_{table}_token_hash_unused",
+        "token_hash",
+        postgresql_where=unused,
+        sqlite_where=unused,
+    )
+
+
 class EmailVerificationToken(Base):
     """
     Stores hashed tokens for email verification.
     """
 
     __tablename__ = "email_verification_tokens"
+    __table_args__ = (_unused_token_index("email_verification_tokens"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token_hash = Column(String, index=True, nullable=False)
+    token_hash = Column(String, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -31,10 +44,11 @@ class PasswordResetToken(Base):
     """
 
     __tablename__ = "password_reset_tokens"
+    __table_args__ = (_unused_token_index("password_reset_tokens"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token_hash = Column(String, index=True, nullable=False)
+    token_hash = Column(String, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     used_at = Column(DateTime(timezone=True), nullable=True)
@@ -54,6 +54,18 @@ class User(Base):
         cascade="all, delete-orphan",
     )
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
+    features = relationship(
+        "StudentFeatures",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+    dashboard = relationship(
+        "StudentDashboard",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     # Auth tokens relationships
     verification_tokens = relationship(
@@ -67,6 +79,9 @@ class User(Base):
     audit_logs = relationship(
         "AuditLog", back_populates="actor", cascade="all, delete-orphan"
     )
+    archived_audit_logs = relationship(
+        "AuditLogArchive", back_populates="actor", cascade="all, delete-orphan"
+    )
 
     # Clinical Notes relationships
     clinical_notes_received = relationship(
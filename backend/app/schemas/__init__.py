@@ -3,9 +3,12 @@ from . import (
     alert,
     assessment,
     assessment_response,
+    audit_log,
     clinical_note,
+    common,
     consent,
     emotional_checkin,
+    model_info,
     risk_summary,
     student,
     user,
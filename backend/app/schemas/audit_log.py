@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class AuditLogEntry(BaseModel):
+    id: int
+    actor_id: int
+    action: str
+    resource_id: Optional[str] = None
+    details: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
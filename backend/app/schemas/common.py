@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel
 
@@ -11,10 +11,24 @@ class MessageResponse(BaseModel):
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
+    # None when the endpoint only counts on request (see the roster)
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    # Opaque keyset cursor of the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Keyset page without totals, for tables too large to count per request.
+    """
+
+    items: List[T]
+    size: int
+    # Opaque keyset cursor of the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ModelInfo(BaseModel):
+    """
+    Risk model currently served by this worker.
+    """
+
+    version: Optional[str] = None
+    sha256: Optional[str] = None
+    source: str  # registry, file, memory or none
+    loaded_at: datetime
+    lookup_table: bool = False
+    load_seconds: Optional[float] = None
+    registry_active_version: Optional[str] = None
+    available_versions: List[str] = []
@@ -26,7 +26,10 @@ from app.schemas.risk_summary import RiskSummary
 
 class StudentDetail(StudentSummary):
     risk_summary: Optional[RiskSummary] = None
+    # Most recent first, capped; the flags tell whether older rows exist
     alerts: List[Alert] = []
+    has_more_alerts: bool = False
     assessment_responses: List[AssessmentResponse] = []
+    has_more_assessment_responses: bool = False
     recent_checkins: List[Checkin] = []
     risk_factors: Dict[str, float] = {}
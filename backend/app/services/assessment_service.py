@@ -3,11 +3,14 @@ from typing import Dict
 from sqlalchemy.orm import Session
 
 from app import schemas
+from app.ml.explainer import risk_explainer
+from app.ml.features import feature_store
 from app.ml.risk_classifier import risk_classifier
 from app.models.alert import Alert
 from app.models.assessment import Assessment
 from app.models.assessment_response import AssessmentResponse
 from app.models.risk_summary import RiskSummary
+from app.services.dashboard_service import dashboard_service
 
 
 class AssessmentService:
@@ -118,49 +121,23 @@ class AssessmentService:
             risk_summary = RiskSummary(user_id=user_id)
             db.add(risk_summary)
 
-        # ML refinement: Get more context for better prediction
-        # Get average mood of last 5 checkins
-        from app.models.emotional_checkin import EmotionalCheckin
-
-        last_checkins = (
-            db.query(EmotionalCheckin)
-            .filter(EmotionalCheckin.user_id == user_id)
-            .order_by(EmotionalCheckin.created_at.desc())
-            .limit(7)
-            .all()
-        )
-        avg_mood = (
-            sum([c.mood_score for c in last_checkins]) / len(last_checkins)
-            if last_checkins
-            else 3.0
-        )
-        bad_days = len([c for c in last_checkins if c.mood_score < 3])
-
-        average_pressure = (
-            sum(
-                [
-                    c.academic_pressure
-                    for c in last_checkins
-                    if c.academic_pressure is not None
-                ]
-            )
-            / len(last_checkins)
-            if last_checkins
-            else 3.0
-        )
+        # ML refinement: check-in context from the student's rolling features
+        # (last 7 check-ins, maintained on every check-in)
+        avg_mood, bad_days, average_pressure = feature_store.get_vector(db, user_id)
 
         # Normalize PSS score (max is 40)
         norm_pss = score / 40.0 if assessment.type == "PSS-10" else 0.5
 
-        ml_risk, confidence = risk_classifier.predict_risk(
-            norm_pss, avg_mood, bad_days, average_pressure
-        )
+        model_features = [norm_pss, avg_mood, bad_days, average_pressure]
+        ml_risk, confidence = risk_classifier.predict_risk(*model_features)
 
         risk_summary.current_risk_level = ml_risk
         risk_summary.prediction_confidence = float(confidence)
+        risk_summary.model_features = model_features
 
         # 5. Trigger Alert if ML or Assessment detects High Risk
-        if risk == "High" or ml_risk == "High":
+        raise_alert = risk == "High" or ml_risk == "High"
+        if raise_alert:
             # Avoid duplicate alerts if one already exists for this issue
             alert = Alert(
                 user_id=user_id,
@@ -171,8 +148,16 @@ class AssessmentService:
             )
             db.add(alert)
 
+        # 6. Staff dashboard row, in the same transaction
+        dashboard_service.record_assessment(
+            db, db_response, ml_risk, new_alerts=int(raise_alert)
+        )
+
         db.commit()
         db.refresh(db_response)
+
+        # Warm the explanation shown in the student's profile
+        risk_explainer.schedule(model_features)
         return db_response
 
 
@@ -0,0 +1,98 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog, AuditLogArchive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+COLUMNS = ("id", "actor_id", "action", "resource_id", "details", "timestamp")
+
+
+class AuditRetentionService:
+    """
+    Time-based rollover of the audit trail. Entries older than the retention
+    window are copied to `audit_logs_archive` and deleted from `audit_logs`
+    in id-ordered batches, one transaction per batch, so the live table only
+    holds recent entries. Archived entries past their own retention are
+    purged.
+    """
+
+    def archive(
+        self,
+        db: Session,
+        older_than: datetime,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Moves entries with timestamp before `older_than` to the archive.
+        Returns the number of entries moved.
+        """
+        moved = 0
+        while True:
+            ids = (
+                db.execute(
+                    select(AuditLog.id)
+                    .where(AuditLog.timestamp < older_than)
+                    .order_by(AuditLog.id)
+                    .limit(batch_size)
+                )
+                .scalars()
+                .all()
+            )
+            if not ids:
+                return moved
+            source = select(*(getattr(AuditLog, c) for c in COLUMNS)).where(
+                AuditLog.id.in_(ids)
+            )
+            db.execute(insert(AuditLogArchive).from_select(COLUMNS, source))
+            db.execute(delete(AuditLog).where(AuditLog.id.in_(ids)))
+            db.commit()
+            moved += len(ids)
+            logger.info(f"Auditoría: {moved} entradas archivadas")
+
+    def purge_archive(self, db: Session, older_than: datetime) -> int:
+        """
+        Deletes archived entries with timestamp before `older_than`.
+        """
+        result = db.execute(
+            delete(AuditLogArchive).where(AuditLogArchive.timestamp < older_than)
+        )
+        db.commit()
+        return result.rowcount
+
+    def run(
+        self,
+        db: Session,
+        retention_days: Optional[int] = None,
+        archive_retention_days: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Archives and purges according to the configured retention.
+        """
+        retention_days = (
+            settings.AUDIT_RETENTION_DAYS if retention_days is None else retention_days
+        )
+        archive_retention_days = (
+            settings.AUDIT_ARCHIVE_RETENTION_DAYS
+            if archive_retention_days is None
+            else archive_retention_days
+        )
+        now = now or datetime.now(timezone.utc)
+        archived = self.archive(db, now - timedelta(days=retention_days), batch_size)
+        purged = 0
+        if archive_retention_days > 0:
+            purged = self.purge_archive(
+                db, now - timedelta(days=archive_retention_days)
+            )
+        return {"archived": archived, "purged": purged}
+
+
+audit_retention_service = AuditRetentionService()
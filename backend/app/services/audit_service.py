@@ -1,7 +1,215 @@
+"""
+Audit trail of sensitive data access.
+
+`log_access` does not write in the caller's transaction: entries are queued
+and a background thread (`AuditWriter`) inserts them in batches, one
+multi-row INSERT per batch, every AUDIT_FLUSH_INTERVAL seconds or as soon as
+AUDIT_BATCH_SIZE entries are waiting. The queue is bounded: when it is full,
+callers wait up to AUDIT_ENQUEUE_TIMEOUT seconds for room and then write
+their entry themselves, so entries are never dropped. A batch the database
+rejects is retried row by row, so one bad entry only loses itself (it is
+logged, the rest are written). The worker is started
+and stopped (flushing what is left) by the API lifespan; without a running
+worker, e.g. in scripts, entries are written immediately.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.audit_log import AuditLog
 
+logger = logging.getLogger(__name__)
+
+# Attempts per batch before it is retried row by row
+WRITE_ATTEMPTS = 3
+
+# Errors in the entries themselves: retrying the same statement cannot help
+DATA_ERRORS = (sa_exc.DataError, sa_exc.IntegrityError)
+
+# Queue marker: write the batch being collected without waiting any longer
+_FLUSH = object()
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        enqueue_timeout: Optional[float] = None,
+    ):
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = (
+            settings.AUDIT_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self.enqueue_timeout = (
+            settings.AUDIT_ENQUEUE_TIMEOUT
+            if enqueue_timeout is None
+            else enqueue_timeout
+        )
+        # Items are (bind, entry), _FLUSH, or None to drain and exit
+        self._queue: "queue.Queue[Optional[Tuple[Any, Dict[str, Any]]]]" = queue.Queue(
+            maxsize=queue_size or settings.AUDIT_QUEUE_SIZE
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Writes every queued entry and stops the worker.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        # Outside the lock: put() waits for room while the worker drains a
+        # full queue. Entries submitted from now on are written directly
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def flush(self) -> None:
+        """
+        Writes every entry queued so far without waiting for the flush
+        interval, and blocks until they are in the database.
+        """
+        if self.running:
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+    def submit(self, bind, entry: Dict[str, Any]) -> None:
+        if not self.running:
+            self._write(bind, [entry])
+            return
+        try:
+            self._queue.put((bind, entry), timeout=self.enqueue_timeout)
+        except queue.Full:
+            # Back-pressure: the caller pays for its own write
+            logger.warning("Auditoría: cola llena, escritura directa")
+            self._write(bind, [entry])
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            stopping = item is None
+            flushing = item is _FLUSH
+            batch = [] if stopping or flushing else [item]
+            markers = int(stopping or flushing)
+            # Collect a batch: up to batch_size entries or flush_interval
+            deadline = time.monotonic() + self.flush_interval
+            while not (stopping or flushing) and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None or item is _FLUSH:
+                    stopping = item is None
+                    flushing = item is _FLUSH
+                    markers += 1
+                else:
+                    batch.append(item)
+            self._write_batch(batch)
+            for _ in range(len(batch) + markers):
+                self._queue.task_done()
+            if stopping:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None or item is _FLUSH:
+                    self._queue.task_done()
+                else:
+                    batch.append(item)
+            if not batch:
+                return
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        by_bind: Dict[Any, List[Dict[str, Any]]] = {}
+        for bind, entry in batch:
+            by_bind.setdefault(bind, []).append(entry)
+        for bind, entries in by_bind.items():
+            self._write(bind, entries)
+
+    @staticmethod
+    def _insert(bind, entries: List[Dict[str, Any]], attempts: int) -> bool:
+        for attempt in range(attempts):
+            try:
+                with bind.begin() as conn:
+                    # A single multi-row INSERT ... VALUES (...), (...)
+                    conn.execute(insert(AuditLog).values(entries))
+                return True
+            except DATA_ERRORS as e:
+                logger.error(
+                    f"Auditoría: la base de datos rechazó {len(entries)} "
+                    f"entradas: {e}"
+                )
+                return False
+            except Exception as e:
+                logger.error(
+                    f"Auditoría: falló la escritura de {len(entries)} entradas "
+                    f"(intento {attempt + 1}/{attempts}): {e}"
+                )
+                if attempt + 1 < attempts:
+                    time.sleep(0.1 * 2**attempt)
+        return False
+
+    @classmethod
+    def _write(cls, bind, entries: List[Dict[str, Any]]) -> None:
+        if cls._insert(bind, entries, WRITE_ATTEMPTS):
+            return
+        if len(entries) > 1:
+            # Isolates the entries that fail; the rest of the batch is kept
+            logger.warning(
+                f"Auditoría: reintentando {len(entries)} entradas una por una"
+            )
+            failed = [e for e in entries if not cls._insert(bind, [e], 1)]
+        else:
+            failed = entries
+        for entry in failed:
+            logger.error(f"Auditoría: entrada no registrada: {entry}")
+
+
+audit_writer = AuditWriter()
+
 
 def log_access(
     db: Session,
@@ -13,9 +221,17 @@ def log_access(
     """
     Creates an audit log entry.
     Should be called whenever a Staff member accesses sensitive Student data.
+    The entry is queued for the background writer; it does not touch the
+    caller's transaction.
     """
-    audit_entry = AuditLog(
-        actor_id=actor_id, action=action, resource_id=resource_id, details=details
+    audit_writer.submit(
+        db.get_bind(),
+        {
+            "actor_id": actor_id,
+            "action": action,
+            "resource_id": resource_id,
+            "details": details,
+            # Time of the access, not of the batch insert
+            "timestamp": datetime.now(timezone.utc),
+        },
     )
-    db.add(audit_entry)
-    db.commit()
@@ -4,15 +4,14 @@ from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 
+from app.core.principal_cache import principal_cache
 from app.models.tokens import EmailVerificationToken, PasswordResetToken
 from app.models.user import User
-from app.services.email_service import email_service
+from app.services import email_outbox_service
+from app.services.email_outbox_service import email_outbox_worker
 
 
 class AuthService:
-    def __init__(self):
-        self.mail = email_service
-
     def _generate_token(self) -> str:
         return secrets.token_urlsafe(32)
 
@@ -30,9 +29,13 @@ class AuthService:
             user_id=user.id, token_hash=hashed, expires_at=expires
         )
         db.add(db_token)
+        # Same transaction as the token: sent by the outbox worker
+        email_outbox_service.enqueue(
+            db, email_outbox_service.VERIFICATION, user.email, token, hashed, expires
+        )
         db.commit()
 
-        self.mail.send_verification_email(user.email, token)
+        email_outbox_worker.notify(db.get_bind())
         return token
 
     def verify_email(self, db: Session, token: str) -> bool:
@@ -65,6 +68,8 @@ class AuthService:
             user.is_email_verified = True
 
         db.commit()
+        if user:
+            principal_cache.invalidate(user.id)
         return True
 
     def request_password_reset(self, db: Session, email: str):
@@ -81,9 +86,12 @@ class AuthService:
             user_id=user.id, token_hash=hashed, expires_at=expires
         )
         db.add(db_token)
+        email_outbox_service.enqueue(
+            db, email_outbox_service.PASSWORD_RESET, user.email, token, hashed, expires
+        )
         db.commit()
 
-        self.mail.send_password_reset_email(user.email, token)
+        email_outbox_worker.notify(db.get_bind())
 
     def reset_password(self, db: Session, token: str, new_hashed_password: str) -> bool:
         hashed = self._hash_token(token)
@@ -117,6 +125,8 @@ class AuthService:
         # Mark token used
         db_token.used_at = datetime.now(timezone.utc)
         db.commit()
+        # Requests authenticated with the old credentials reload the user
+        principal_cache.invalidate(user.id)
         return True
 
 
@@ -0,0 +1,274 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+
+from app.ml.features import UPSERT_INSERTS, feature_store, to_vector
+from app.models.alert import Alert
+from app.models.assessment_response import AssessmentResponse
+from app.models.emotional_checkin import EmotionalCheckin
+from app.models.risk_summary import RiskSummary
+from app.models.student_dashboard import (
+    DEFAULT_RISK_LEVEL,
+    NO_ASSESSMENT_DATE,
+    StudentDashboard,
+)
+from app.models.student_features import StudentFeatures
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class DashboardService:
+    """
+    Maintains the `student_dashboard` rows read by the staff views. Every
+    write path that changes a student's risk, alerts, assessments or
+    check-ins calls the matching method before committing, so the row is
+    updated in the same transaction as the change. Methods never commit.
+
+    A student's row is created with the user (`create_for`). Rows missing
+    for a student (imported in bulk, or created before the table existed)
+    are rebuilt from the history tables the first time they are touched;
+    `rebuild_all` backfills the whole table.
+    """
+
+    def _get_row(self, db: Session, user_id: int) -> Optional[StudentDashboard]:
+        # Row lock, as in FeatureStore, so concurrent writers of the same
+        # student do not lose an update
+        return (
+            db.query(StudentDashboard)
+            .filter(StudentDashboard.user_id == user_id)
+            .with_for_update()
+            .first()
+        )
+
+    def rebuild(self, db: Session, user_ids: Iterable[int]) -> int:
+        """
+        Recomputes the rows of the given students from the history tables,
+        with one grouped query per source. Returns the rows written.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+        # Pending changes (the check-in or alert that triggered the rebuild)
+        # must be visible to the aggregates below
+        db.flush()
+
+        risk_levels = dict(
+            db.query(RiskSummary.user_id, RiskSummary.current_risk_level)
+            .filter(RiskSummary.user_id.in_(user_ids))
+            .all()
+        )
+        active_alerts = dict(
+            db.query(Alert.user_id, func.count(Alert.id))
+            .filter(
+                Alert.user_id.in_(user_ids),
+                Alert.is_resolved == False,  # noqa: E712
+            )
+            .group_by(Alert.user_id)
+            .all()
+        )
+        last_assessments = dict(
+            db.query(
+                AssessmentResponse.user_id, func.max(AssessmentResponse.created_at)
+            )
+            .filter(AssessmentResponse.user_id.in_(user_ids))
+            .group_by(AssessmentResponse.user_id)
+            .all()
+        )
+        checkins = {
+            row.user_id: row
+            for row in db.query(
+                EmotionalCheckin.user_id,
+                func.max(EmotionalCheckin.created_at).label("last_checkin_date"),
+                func.count(EmotionalCheckin.id).label("checkin_count"),
+                func.sum(EmotionalCheckin.mood_score).label("mood_total"),
+            )
+            .filter(EmotionalCheckin.user_id.in_(user_ids))
+            .group_by(EmotionalCheckin.user_id)
+            .all()
+        }
+        mood_averages = feature_store.feature_matrix(db, user_ids)[:, 0]
+
+        rows = []
+        for user_id, mood_avg in zip(user_ids, mood_averages.tolist()):
+            checkin = checkins.get(user_id)
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "risk_level": risk_levels.get(user_id, DEFAULT_RISK_LEVEL),
+                    "active_alerts": active_alerts.get(user_id, 0),
+                    "last_assessment_date": last_assessments.get(
+                        user_id, NO_ASSESSMENT_DATE
+                    ),
+                    "last_checkin_date": checkin.last_checkin_date if checkin else None,
+                    "mood_avg_7d": mood_avg if checkin else None,
+                    "checkin_count": checkin.checkin_count if checkin else 0,
+                    "mood_total": int(checkin.mood_total) if checkin else 0,
+                }
+            )
+
+        # Upsert, as in FeatureStore.rebuild: a concurrent writer creating the
+        # same row updates it instead of colliding on the primary key
+        insert = UPSERT_INSERTS[db.get_bind().dialect.name](StudentDashboard)
+        db.execute(
+            insert.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    column: insert.excluded[column]
+                    for column in rows[0]
+                    if column != "user_id"
+                },
+            ),
+            rows,
+        )
+        # Loaded instances of these rows must not keep the old values
+        for row in list(db.identity_map.values()):
+            if isinstance(row, StudentDashboard) and row.user_id in user_ids:
+                db.expire(row)
+        return len(rows)
+
+    def rebuild_all(self, db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Rebuilds every student's row, one committed chunk at a time, and
+        creates the missing `student_features` rows the dashboard reads.
+        """
+        last_id = 0
+        total = 0
+        while True:
+            user_ids: List[int] = [
+                user_id
+                for (user_id,) in db.query(User.id)
+                .filter(User.role == UserRole.STUDENT, User.id > last_id)
+                .order_by(User.id)
+                .limit(chunk_size)
+                .all()
+            ]
+            if not user_ids:
+                return total
+            feature_store.backfill(db, user_ids)
+            total += self.rebuild(db, user_ids)
+            db.commit()
+            last_id = user_ids[-1]
+            logger.info(f"Panel de estudiantes: {total} filas reconstruidas")
+
+    def create_for(self, db: Session, user: User) -> None:
+        """
+        Adds the row of a new student (flushed, so it has an id), who has no
+        history yet: the column defaults are already right.
+        """
+        if user.role == UserRole.STUDENT:
+            db.add(StudentDashboard(user_id=user.id))
+
+    def record_checkin(
+        self, db: Session, checkin: EmotionalCheckin, features: StudentFeatures
+    ) -> None:
+        """
+        Applies a new check-in, already flushed by FeatureStore.record_checkin,
+        whose updated window is `features`.
+        """
+        row = self._get_row(db, checkin.user_id)
+        if row is None:
+            self.rebuild(db, [checkin.user_id])
+            return
+        row.last_checkin_date = checkin.created_at
+        row.checkin_count += 1
+        row.mood_total += checkin.mood_score
+        row.mood_avg_7d = to_vector(features).mood_avg
+
+    def record_assessment(
+        self,
+        db: Session,
+        response: AssessmentResponse,
+        risk_level: str,
+        new_alerts: int = 0,
+    ) -> None:
+        """
+        Applies a scored assessment: the new risk level, its date and the
+        alerts it raised.
+        """
+        db.flush()
+        row = self._get_row(db, response.user_id)
+        if row is None:
+            self.rebuild(db, [response.user_id])
+            return
+        row.risk_level = risk_level
+        row.last_assessment_date = response.created_at
+        if new_alerts:
+            row.active_alerts = StudentDashboard.active_alerts + new_alerts
+
+    def record_alerts(self, db: Session, user_id: int, delta: int) -> None:
+        """
+        Adjusts a student's unresolved alert count by `delta` (negative when
+        alerts are resolved), atomically in SQL.
+        """
+        if not delta:
+            return
+        updated = (
+            db.query(StudentDashboard)
+            .filter(StudentDashboard.user_id == user_id)
+            .update(
+                {
+                    StudentDashboard.active_alerts: StudentDashboard.active_alerts
+                    + delta
+                },
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            self.rebuild(db, [user_id])
+
+    def record_risk_changes(
+        self, db: Session, risk_levels: Dict[int, str], new_alerts: Iterable[int]
+    ) -> None:
+        """
+        Bulk version for the re-scoring job: new risk levels by student and
+        the students that got one new alert each.
+        """
+        new_alerts = list(new_alerts)
+        user_ids = set(risk_levels) | set(new_alerts)
+        if not user_ids:
+            return
+        existing = {
+            user_id
+            for (user_id,) in db.query(StudentDashboard.user_id)
+            .filter(StudentDashboard.user_id.in_(user_ids))
+            .all()
+        }
+        changes = [
+            {"user_id": user_id, "risk_level": level}
+            for user_id, level in risk_levels.items()
+            if user_id in existing
+        ]
+        if changes:
+            # Bulk UPDATE by primary key (executemany)
+            db.execute(update(StudentDashboard), changes)
+        alerted = [user_id for user_id in new_alerts if user_id in existing]
+        if alerted:
+            db.query(StudentDashboard).filter(
+                StudentDashboard.user_id.in_(alerted)
+            ).update(
+                {StudentDashboard.active_alerts: StudentDashboard.active_alerts + 1},
+                synchronize_session=False,
+            )
+        self.rebuild(db, sorted(user_ids - existing))
+
+    def record_role_change(self, db: Session, user: User) -> None:
+        """
+        Creates the row of a user who became a student, or drops the row of
+        one who no longer is.
+        """
+        if user.role == UserRole.STUDENT:
+            self.rebuild(db, [user.id])
+        else:
+            db.execute(
+                delete(StudentDashboard)
+                .where(StudentDashboard.user_id == user.id)
+                .execution_options(synchronize_session=False)
+            )
+
+
+dashboard_service = DashboardService()
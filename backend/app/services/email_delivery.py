@@ -0,0 +1,245 @@
+"""
+SMTP delivery subsystem.
+
+Callers enqueue messages and return immediately. A small pool of worker
+threads, each holding one long-lived SMTP connection (connected, STARTTLS
+and authenticated once), takes messages from the queue and sends up to
+`batch_size` of them back to back over that connection. A connection that
+drops is reopened and the message retried; connections idle for longer
+than `idle_timeout` are closed and reopened on demand. `send` waits for the
+outcome of one message, for callers (the email outbox) that track delivery.
+"""
+
+import atexit
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Callable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Send attempts per message (one reconnect per attempt)
+SEND_ATTEMPTS = 3
+
+FailureCallback = Optional[Callable[[Message, Exception], None]]
+SentCallback = Optional[Callable[[Message], None]]
+_Item = Tuple[Message, FailureCallback, SentCallback]
+
+
+class SMTPDeliveryWorker:
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+        pool_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.host = host or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.user = settings.SMTP_USER if user is None else user
+        self.password = settings.SMTP_PASSWORD if password is None else password
+        self.use_tls = settings.SMTP_TLS if use_tls is None else use_tls
+        self.pool_size = pool_size or settings.SMTP_POOL_SIZE
+        self.batch_size = batch_size or settings.SMTP_BATCH_SIZE
+        self.idle_timeout = (
+            settings.SMTP_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        )
+        self.timeout = settings.SMTP_TIMEOUT if timeout is None else timeout
+        # Items are (message, on_failure, on_sent); None stops one worker thread
+        self._queue: "queue.Queue[Optional[_Item]]" = queue.Queue(
+            maxsize=queue_size or settings.SMTP_QUEUE_SIZE
+        )
+        self._threads: List[threading.Thread] = []
+        # Open connection of each worker thread, by thread name
+        self._connections = {}
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        # Counters, for logs and tests
+        self.sent = 0
+        self.failed = 0
+        self.connections_opened = 0
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f"smtp-worker-{i}", daemon=True)
+                for i in range(self.pool_size)
+            ]
+            for thread in self._threads:
+                thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Sends every queued message, then closes the connections.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        # Outside the lock: the workers take it to update their counters
+        # while they send what is still queued
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def flush(self) -> None:
+        """
+        Blocks until every message queued so far has been handled.
+        """
+        if self.running:
+            self._queue.join()
+
+    def submit(
+        self,
+        message: Message,
+        on_failure: FailureCallback = None,
+        on_sent: SentCallback = None,
+    ) -> None:
+        """
+        Queues a message and returns; the worker pool is started on first use.
+        Blocks only while the queue is full.
+        """
+        self.start()
+        self._queue.put((message, on_failure, on_sent))
+
+    def send(self, message: Message, timeout: Optional[float] = None) -> bool:
+        """
+        Queues a message and waits until it has been sent (True) or given up
+        (False, the error is logged).
+        """
+        done = threading.Event()
+        outcome = []
+
+        def sent(m):
+            outcome.append(True)
+            done.set()
+
+        def failed(m, e):
+            outcome.append(False)
+            done.set()
+
+        self.submit(message, on_failure=failed, on_sent=sent)
+        return done.wait(timeout) and outcome[0]
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.user:
+            server.login(self.user, self.password)
+        with self._lock:
+            self.connections_opened += 1
+        return server
+
+    @staticmethod
+    def _close(server: Optional[smtplib.SMTP]) -> None:
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _run(self) -> None:
+        name = threading.current_thread().name
+        server = None
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.idle_timeout or None)
+                except queue.Empty:
+                    # Idle: release the connection until there is work again
+                    self._close(server)
+                    server = self._connections[name] = None
+                    continue
+                if item is None:
+                    self._queue.task_done()
+                    return
+
+                # Batch: keep sending over the same connection while the
+                # queue has messages
+                batch = [item]
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        # Put the stop request back for after this batch
+                        self._queue.task_done()
+                        self._queue.put(None)
+                        break
+                    batch.append(item)
+
+                for message, on_failure, on_sent in batch:
+                    server = self._deliver(name, server, message, on_failure, on_sent)
+                    self._queue.task_done()
+        finally:
+            self._close(server)
+            self._connections.pop(name, None)
+
+    def _deliver(
+        self,
+        name: str,
+        server: Optional[smtplib.SMTP],
+        message: Message,
+        on_failure: FailureCallback,
+        on_sent: SentCallback = None,
+    ) -> Optional[smtplib.SMTP]:
+        error = None
+        for attempt in range(SEND_ATTEMPTS):
+            try:
+                if server is None:
+                    server = self._connections[name] = self._connect()
+                server.send_message(message)
+                with self._lock:
+                    self.sent += 1
+                logger.info(f"Email sent successfully to {message['To']}")
+                if on_sent is not None:
+                    self._callback(on_sent, message)
+                return server
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # Dropped connection: reconnect and retry
+                error = e
+                self._close(server)
+                server = self._connections[name] = None
+                time.sleep(0.05 * 2**attempt)
+            except Exception as e:
+                error = e
+                break
+
+        with self._lock:
+            self.failed += 1
+        logger.error(f"Failed to send email to {message['To']}: {error}")
+        if on_failure is not None:
+            self._callback(on_failure, message, error)
+        return server
+
+    @staticmethod
+    def _callback(callback: Callable, *args) -> None:
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Email delivery callback raised: {e}")
+
+
+smtp_delivery = SMTPDeliveryWorker()
@@ -0,0 +1,345 @@
+"""
+Transactional email outbox.
+
+Auth emails are not sent by the request that triggers them: `enqueue` adds
+an `email_outbox` row to the caller's transaction, next to the token the
+message carries, so a message exists if and only if its token does. The
+drain worker (`EmailOutboxWorker`) claims due rows in batches, sends them
+through the configured EmailService and records the outcome. Failed
+messages are retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS;
+a claimed row is leased for EMAIL_OUTBOX_LEASE_SECONDS, so several API
+processes can drain the same table and a message held by a crashed worker is
+picked up again once its lease runs out. The idempotency key is unique per
+message and is sent as its Message-ID.
+
+The token a message carries is stored encrypted with a key derived from
+SECRET_KEY, and only until the message is sent, given up, or its token
+expires: each drain marks expired pending messages as "expired" and clears
+their token, so a 15-minute reset token does not outlive its usefulness in
+the table.
+"""
+
+import atexit
+import base64
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from cryptography.fernet import Fernet
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import EmailService, email_service
+
+logger = logging.getLogger(__name__)
+
+VERIFICATION = "verification"
+PASSWORD_RESET = "password_reset"
+
+# Window of the throughput metric, in seconds
+THROUGHPUT_WINDOW = 60.0
+
+# Own key for the stored tokens, not the JWT signing key itself
+_fernet = Fernet(
+    base64.urlsafe_b64encode(
+        hashlib.sha256(f"email-outbox:{settings.SECRET_KEY}".encode()).digest()
+    )
+)
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    to_email: str,
+    token: str,
+    token_hash: str,
+    expires_at: datetime,
+):
+    """
+    Adds a message to the caller's transaction; it is sent after the commit,
+    if before `expires_at` (the token's own expiry).
+    """
+    db.add(
+        EmailOutbox(
+            idempotency_key=f"{kind}-{token_hash}",
+            kind=kind,
+            to_email=to_email,
+            token=_fernet.encrypt(token.encode()).decode(),
+            expires_at=expires_at,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+    )
+
+
+def _token(row: Dict[str, Any]) -> str:
+    if row["expires_at"] is None:
+        # Written before tokens were encrypted
+        return row["token"]
+    return _fernet.decrypt(row["token"].encode()).decode()
+
+
+class EmailOutboxWorker:
+    def __init__(
+        self,
+        mail: Optional[EmailService] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        max_backoff_seconds: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.mail = mail or email_service
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.EMAIL_OUTBOX_POLL_INTERVAL
+        self.max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        self.backoff_seconds = (
+            settings.EMAIL_OUTBOX_BACKOFF_SECONDS
+            if backoff_seconds is None
+            else backoff_seconds
+        )
+        self.max_backoff_seconds = (
+            max_backoff_seconds or settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS
+        )
+        self.lease_seconds = lease_seconds or settings.EMAIL_OUTBOX_LEASE_SECONDS
+        # Messages sent at the same time (each blocks one SMTP connection)
+        self.concurrency = concurrency or settings.SMTP_POOL_SIZE
+        # Databases to drain: the API engine, plus any bind `notify` reports
+        self._binds: List[Any] = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        # Metrics
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.expired = 0
+        self._sent_at: deque = deque()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, bind) -> None:
+        with self._lock:
+            if bind not in self._binds:
+                self._binds.append(bind)
+            if self.running:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="email-outbox", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the worker after its current batch; unsent rows stay pending.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        # Outside the lock: the batch in progress takes it to record its
+        # outcome
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def notify(self, bind) -> None:
+        """
+        Called after a commit that enqueued messages: drain now instead of at
+        the next poll. Without a running worker the rows wait for it (or for
+        scripts/drain_email_outbox.py).
+        """
+        with self._lock:
+            if bind not in self._binds:
+                self._binds.append(bind)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.clear()
+            for bind in list(self._binds):
+                try:
+                    # Full batches mean there may be more due right away
+                    while not self._stopping.is_set():
+                        if self.drain(bind) < self.batch_size:
+                            break
+                except Exception as e:
+                    logger.error(f"Outbox de correo: falló el envío por lotes: {e}")
+            self._wake.wait(self.poll_interval)
+
+    def drain(self, bind, now: Optional[datetime] = None) -> int:
+        """
+        Sends one batch of due messages and records the outcome.
+        Returns the number of messages claimed.
+        """
+        now = now or datetime.now(timezone.utc)
+        self._expire(bind, now)
+        rows = self._claim(bind, now)
+        if not rows:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            outcomes = list(executor.map(self._send, rows))
+        self._record(bind, rows, outcomes, datetime.now(timezone.utc))
+        return len(rows)
+
+    def _expire(self, bind, now: datetime) -> int:
+        """
+        Gives up pending messages whose token has expired and clears the
+        token. Returns how many.
+        """
+        with bind.begin() as conn:
+            expired = conn.execute(
+                update(EmailOutbox)
+                .where(
+                    EmailOutbox.status == "pending",
+                    EmailOutbox.expires_at <= now,
+                )
+                .values(status="expired", token=None, next_attempt_at=now)
+            ).rowcount
+        if expired:
+            with self._lock:
+                self.expired += expired
+            logger.info(f"Outbox de correo: {expired} mensajes vencidos")
+        return expired
+
+    def _claim(self, bind, now: datetime) -> List[Dict[str, Any]]:
+        due = (EmailOutbox.status == "pending") & (EmailOutbox.next_attempt_at <= now)
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        claimed = []
+        with bind.begin() as conn:
+            ids = conn.execute(
+                select(EmailOutbox.id)
+                .where(due)
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+            ).scalars()
+            for row_id in list(ids):
+                # Conditional update: a row another worker took in between
+                # no longer matches
+                result = conn.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == row_id, due)
+                    .values(next_attempt_at=lease_until)
+                )
+                if result.rowcount == 1:
+                    claimed.append(row_id)
+            if not claimed:
+                return []
+            rows = conn.execute(
+                select(
+                    EmailOutbox.id,
+                    EmailOutbox.idempotency_key,
+                    EmailOutbox.kind,
+                    EmailOutbox.to_email,
+                    EmailOutbox.token,
+                    EmailOutbox.expires_at,
+                    EmailOutbox.attempts,
+                ).where(EmailOutbox.id.in_(claimed))
+            )
+            return [dict(row._mapping) for row in rows]
+
+    def _send(self, row: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        if row["kind"] == VERIFICATION:
+            send = self.mail.send_verification_email
+        elif row["kind"] == PASSWORD_RESET:
+            send = self.mail.send_password_reset_email
+        else:
+            return False, f"Tipo de correo desconocido: {row['kind']}"
+        try:
+            if send(row["to_email"], _token(row), message_id=row["idempotency_key"]):
+                return True, None
+            return False, "El servidor de correo no aceptó el mensaje"
+        except Exception as e:
+            return False, str(e)
+
+    def _record(self, bind, rows, outcomes, now: datetime) -> None:
+        sent = retried = failed = 0
+        with bind.begin() as conn:
+            for row, (ok, error) in zip(rows, outcomes):
+                attempts = row["attempts"] + 1
+                values: Dict[str, Any] = {"attempts": attempts, "last_error": error}
+                if ok:
+                    values.update(status="sent", sent_at=now, token=None)
+                    sent += 1
+                elif attempts >= self.max_attempts:
+                    values.update(status="failed", token=None)
+                    failed += 1
+                    logger.error(
+                        f"Outbox de correo: {row['idempotency_key']} descartado "
+                        f"tras {attempts} intentos: {error}"
+                    )
+                else:
+                    delay = min(
+                        self.backoff_seconds * 2 ** (attempts - 1),
+                        self.max_backoff_seconds,
+                    )
+                    values["next_attempt_at"] = now + timedelta(seconds=delay)
+                    retried += 1
+                conn.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == row["id"])
+                    .values(**values)
+                )
+        with self._lock:
+            self.sent += sent
+            self.retried += retried
+            self.failed += failed
+            stamp = time.monotonic()
+            self._sent_at.extend([stamp] * sent)
+        logger.info(
+            f"Outbox de correo: {sent} enviados, {retried} reintentos, "
+            f"{failed} descartados"
+        )
+
+    def metrics(self, bind=None) -> Dict[str, Any]:
+        """
+        Counters since startup and messages sent per minute over the last
+        THROUGHPUT_WINDOW seconds; with a bind, also the backlog in that
+        database (pending messages and age of the oldest, in seconds).
+        """
+        with self._lock:
+            horizon = time.monotonic() - THROUGHPUT_WINDOW
+            while self._sent_at and self._sent_at[0] < horizon:
+                self._sent_at.popleft()
+            result: Dict[str, Any] = {
+                "sent": self.sent,
+                "retried": self.retried,
+                "failed": self.failed,
+                "expired": self.expired,
+                "sent_per_minute": len(self._sent_at) * 60.0 / THROUGHPUT_WINDOW,
+            }
+        if bind is not None:
+            with bind.connect() as conn:
+                pending, oldest = conn.execute(
+                    select(
+                        func.count(EmailOutbox.id), func.min(EmailOutbox.created_at)
+                    ).where(EmailOutbox.status == "pending")
+                ).one()
+            if oldest is not None and oldest.tzinfo is None:
+                oldest = oldest.replace(tzinfo=timezone.utc)
+            result["pending"] = pending
+            result["oldest_pending_seconds"] = (
+                (datetime.now(timezone.utc) - oldest).total_seconds()
+                if oldest is not None
+                else 0.0
+            )
+        return result
+
+
+email_outbox_worker = EmailOutboxWorker()
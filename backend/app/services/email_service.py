@@ -1,26 +1,39 @@
 import logging
-import smtplib
 from abc import ABC, abstractmethod
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import Optional
 
 from app.core.config import settings
+from app.services.email_delivery import smtp_delivery
 
 logger = logging.getLogger(__name__)
 
 
 class EmailService(ABC):
+    """
+    Sends the auth emails. Both methods return whether the message was
+    delivered; `message_id` (the outbox idempotency key) lets receivers drop
+    a message sent twice after a retry.
+    """
+
     @abstractmethod
-    def send_verification_email(self, to_email: str, token: str):
+    def send_verification_email(
+        self, to_email: str, token: str, message_id: Optional[str] = None
+    ) -> bool:
         pass
 
     @abstractmethod
-    def send_password_reset_email(self, to_email: str, token: str):
+    def send_password_reset_email(
+        self, to_email: str, token: str, message_id: Optional[str] = None
+    ) -> bool:
         pass
 
 
 class MockEmailService(EmailService):
-    def send_verification_email(self, to_email: str, token: str):
+    def send_verification_email(
+        self, to_email: str, token: str, message_id: Optional[str] = None
+    ) -> bool:
         # Fallback to logging
         base_url = (
             settings.BACKEND_CORS_ORIGINS[0]
@@ -34,8 +47,11 @@ class MockEmailService(EmailService):
         print(
             f"EMAIL_MOCK: Sending Verification Token to {to_email}: {token}", flush=True
         )
+        return True
 
-    def send_password_reset_email(self, to_email: str, token: str):
+    def send_password_reset_email(
+        self, to_email: str, token: str, message_id: Optional[str] = None
+    ) -> bool:
         base_url = (
             settings.BACKEND_CORS_ORIGINS[0]
             if settings.BACKEND_CORS_ORIGINS
@@ -48,10 +64,24 @@ class MockEmailService(EmailService):
             f"EMAIL_MOCK: Sending Password Reset Token to {to_email}: {token}",
             flush=True,
         )
+        return True
 
 
 class SMTPEmailService(EmailService):
-    def _send_email(self, to_email: str, subject: str, html_content: str) -> bool:
+    """
+    Messages go through the pooled SMTP worker (app/services/email_delivery.py),
+    which keeps its connections open between messages. Callers are the email
+    outbox drain worker: a message that cannot be delivered is retried from
+    the outbox.
+    """
+
+    def _send_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        message_id: Optional[str] = None,
+    ) -> bool:
         if not settings.SMTP_HOST or not settings.SMTP_USER:
             logger.error("SMTP credentials not configured.")
             return False
@@ -60,23 +90,16 @@ class SMTPEmailService(EmailService):
         msg["From"] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL}>"
         msg["To"] = to_email
         msg["Subject"] = subject
+        if message_id:
+            msg["Message-ID"] = f"<{message_id}@menta-link>"
 
         msg.attach(MIMEText(html_content, "html", "utf-8"))
 
-        try:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
-            if settings.SMTP_TLS:
-                server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-            server.quit()
-            logger.info(f"Email sent successfully to {to_email}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
-            return False
+        return smtp_delivery.send(msg)
 
-    def send_verification_email(self, to_email: str, token: str):
+    def send_verification_email(
+        self, to_email: str, token: str, message_id: Optional[str] = None
+    ) -> bool:
         # Assuming frontend is on localhost:3000 or the first allowed origin
         base_url = (
             settings.BACKEND_CORS_ORIGINS[0]
@@ -93,13 +116,11 @@ class SMTPEmailService(EmailService):
         <p>Si no puedes hacer clic, copia este enlace:</p>
         <p>{link}</p>
         """
-        success = self._send_email(to_email, subject, html)
+        return self._send_email(to_email, subject, html, message_id)
 
-        # Fallback if SMTP fails
-        if not success:
-            MockEmailService().send_verification_email(to_email, token)
-
-    def send_password_reset_email(self, to_email: str, token: str):
+    def send_password_reset_email(
+        self, to_email: str, token: str, message_id: Optional[str] = None
+    ) -> bool:
         base_url = (
             settings.BACKEND_CORS_ORIGINS[0]
             if settings.BACKEND_CORS_ORIGINS
@@ -114,11 +135,7 @@ class SMTPEmailService(EmailService):
         <a href="{link}">Restablecer Contraseña</a>
         <p>Este enlace expira en 15 minutos.</p>
         """
-        success = self._send_email(to_email, subject, html)
-
-        # Fallback if SMTP fails
-        if not success:
-            MockEmailService().send_password_reset_email(to_email, token)
+        return self._send_email(to_email, subject, html, message_id)
 
 
 # Factory logic
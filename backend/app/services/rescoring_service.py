@@ -0,0 +1,282 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, insert, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.ml.features import feature_store
+from app.ml.risk_classifier import risk_classifier
+from app.models.alert import Alert
+from app.models.assessment import Assessment
+from app.models.assessment_response import AssessmentResponse
+from app.models.risk_summary import RiskSummary
+from app.services.dashboard_service import dashboard_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+# Same neutral PSS input AssessmentService uses for non PSS-10 assessments
+DEFAULT_NORM_PSS = 0.5
+# PostgreSQL advisory lock held for the length of a run, across processes
+RUN_LOCK_KEY = 4735201
+
+
+class RescoringService:
+    """
+    Re-scores every existing risk summary with the model currently served,
+    e.g. after a new version is activated. Students are streamed in id order,
+    one chunk per transaction: features are read in bulk, scored with a single
+    batched prediction, written back with one bulk UPDATE, and students who
+    become High get their alerts in one multi-row INSERT. The staff dashboard
+    rows are updated in bulk in the same transaction.
+
+    Progress is checkpointed after every committed chunk (last user id and
+    model version) so an interrupted run resumes where it stopped; a
+    checkpoint written for another model version is ignored.
+
+    Only one run at a time: callers take `acquire_run_lock` first (a lock in
+    the process, plus a PostgreSQL advisory lock shared by every worker and
+    by scripts/rescore_students.py) and `release_run_lock` when done.
+    """
+
+    def __init__(self):
+        self._run_lock = threading.Lock()
+        # Connection holding the advisory lock, while a run is in progress
+        self._lock_connection: Optional[Connection] = None
+
+    def acquire_run_lock(self, bind: Engine) -> bool:
+        """
+        Takes the run lock without waiting. False when a run is in progress.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return False
+        if bind.dialect.name != "postgresql":
+            return True
+        try:
+            connection = bind.connect()
+            locked = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": RUN_LOCK_KEY}
+            ).scalar()
+            # Session-level lock: it outlives the transaction
+            connection.commit()
+        except Exception:
+            self._run_lock.release()
+            raise
+        if not locked:
+            connection.close()
+            self._run_lock.release()
+            return False
+        self._lock_connection = connection
+        return True
+
+    def release_run_lock(self) -> None:
+        connection, self._lock_connection = self._lock_connection, None
+        try:
+            if connection is not None:
+                try:
+                    connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": RUN_LOCK_KEY}
+                    )
+                    connection.commit()
+                except Exception as e:
+                    # Closing the server session releases the lock
+                    logger.error(f"Re-evaluación: no se pudo liberar el bloqueo: {e}")
+                    connection.invalidate()
+                finally:
+                    connection.close()
+        finally:
+            self._run_lock.release()
+
+    @staticmethod
+    def _read_checkpoint(path: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not path or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_checkpoint(path: Optional[str], state: Dict[str, Any]) -> None:
+        if not path:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".rescore-", dir=directory)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _legacy_pss_inputs(db: Session, user_ids: List[int]) -> Dict[int, float]:
+        """
+        Normalized PSS input for summaries written before model_features was
+        stored, taken from each student's latest assessment response.
+        """
+        if not user_ids:
+            return {}
+        rows = (
+            db.query(
+                AssessmentResponse.user_id,
+                AssessmentResponse.total_score,
+                Assessment.type,
+            )
+            .join(Assessment, Assessment.id == AssessmentResponse.assessment_id)
+            .filter(AssessmentResponse.user_id.in_(user_ids))
+            .order_by(AssessmentResponse.user_id, AssessmentResponse.created_at.desc())
+            .all()
+        )
+        inputs = {}
+        for user_id, total_score, assessment_type in rows:
+            if user_id not in inputs:
+                inputs[user_id] = (
+                    total_score / 40.0
+                    if assessment_type == "PSS-10"
+                    else DEFAULT_NORM_PSS
+                )
+        return inputs
+
+    def rescore_chunk(
+        self, db: Session, summaries: List[RiskSummary], model_version: Optional[str]
+    ) -> Dict[str, int]:
+        """
+        Scores one chunk and writes it back. Does not commit.
+        """
+        user_ids = [s.user_id for s in summaries]
+        legacy = self._legacy_pss_inputs(
+            db, [s.user_id for s in summaries if not s.model_features]
+        )
+        pss = np.array(
+            [
+                (
+                    s.model_features[0]
+                    if s.model_features
+                    else legacy.get(s.user_id, DEFAULT_NORM_PSS)
+                )
+                for s in summaries
+            ],
+            dtype=np.float64,
+        )
+        features = np.column_stack([pss, feature_store.feature_matrix(db, user_ids)])
+        levels, confidences = risk_classifier.predict_risk_batch(features)
+
+        now = datetime.now(timezone.utc)
+        changes = []
+        new_levels = {}
+        new_high = []
+        for summary, level, confidence, row in zip(
+            summaries, levels.tolist(), confidences.tolist(), features.tolist()
+        ):
+            # bad days is an integer input
+            row[2] = int(row[2])
+            if (
+                summary.current_risk_level == level
+                and summary.prediction_confidence == confidence
+                and summary.model_features == row
+            ):
+                continue
+            changes.append(
+                {
+                    "id": summary.id,
+                    "current_risk_level": level,
+                    "prediction_confidence": confidence,
+                    "model_features": row,
+                    "last_updated": now,
+                }
+            )
+            if level != summary.current_risk_level:
+                new_levels[summary.user_id] = level
+            if level == "High" and summary.current_risk_level != "High":
+                new_high.append(summary.user_id)
+
+        if changes:
+            # Bulk UPDATE by primary key (executemany)
+            db.execute(update(RiskSummary), changes)
+        if new_high:
+            message = (
+                "El sistema detectó un Riesgo Alto. Fuente: Re-evaluación "
+                f"con el modelo {model_version or 'actual'}."
+            )
+            db.execute(
+                insert(Alert),
+                [
+                    {"user_id": user_id, "severity": "High", "message": message}
+                    for user_id in new_high
+                ],
+            )
+        dashboard_service.record_risk_changes(db, new_levels, new_high)
+        return {"updated": len(changes), "alerts": len(new_high)}
+
+    def rescore_all(
+        self,
+        db: Session,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        checkpoint_path: Optional[str] = None,
+        restart: bool = False,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-scores all risk summaries and returns the run totals.
+        """
+        model_version = risk_classifier.active.version
+        state = None if restart else self._read_checkpoint(checkpoint_path)
+        if state is None or state.get("model_version") != model_version:
+            state = {
+                "model_version": model_version,
+                "last_user_id": 0,
+                "processed": 0,
+                "updated": 0,
+                "alerts": 0,
+                "completed": False,
+            }
+        if state["completed"]:
+            logger.info(f"Re-evaluación ya completada para el modelo {model_version}")
+            return state
+
+        total = db.query(func.count(RiskSummary.id)).scalar()
+        started = time.perf_counter()
+        processed_at_start = state["processed"]
+        while True:
+            # Keyset pagination on the unique user_id
+            summaries = (
+                db.query(RiskSummary)
+                .filter(RiskSummary.user_id > state["last_user_id"])
+                .order_by(RiskSummary.user_id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not summaries:
+                break
+
+            last_user_id = summaries[-1].user_id
+            result = self.rescore_chunk(db, summaries, model_version)
+            db.commit()
+
+            state["last_user_id"] = last_user_id
+            state["processed"] += len(summaries)
+            state["updated"] += result["updated"]
+            state["alerts"] += result["alerts"]
+            self._write_checkpoint(checkpoint_path, state)
+
+            elapsed = time.perf_counter() - started
+            rate = (state["processed"] - processed_at_start) / max(elapsed, 1e-9)
+            report = {**state, "total": total, "rows_per_second": rate}
+            if progress:
+                progress(report)
+            logger.info(
+                f"Re-evaluación: {state['processed']}/{total} "
+                f"({rate:.0f} filas/s, {state['updated']} actualizadas, "
+                f"{state['alerts']} alertas)"
+            )
+
+        state["completed"] = True
+        self._write_checkpoint(checkpoint_path, state)
+        return state
+
+
+rescoring_service = RescoringService()
@@ -1,5 +1,9 @@
+import base64
+import json
 import math
-from typing import Any
+from typing import Any, Dict, Sequence
+
+from sqlalchemy import literal, tuple_
 
 
 def paginate_query(query: Any, page: int, page_size: int) -> Any:
@@ -16,3 +20,44 @@ def calculate_pages(total_items: int, page_size: int) -> int:
     if page_size == 0:
         return 0
     return math.ceil(total_items / page_size)
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Opaque cursor for keyset pagination (URL-safe base64 of a JSON object).
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Inverse of encode_cursor. Raises ValueError on malformed cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(values, dict):
+        raise ValueError("Cursor inválido")
+    return values
+
+
+def keyset_after(
+    columns: Sequence[Any], values: Sequence[Any], descending: bool = False
+) -> Any:
+    """
+    Condition selecting the rows that come after `values` in the ordering
+    by `columns` (all ascending or all descending): the row comparison
+    `(a, b) > (x, y)`. PostgreSQL and SQLite (3.15+) turn it into a range
+    scan of an index on the same columns, so a deep page starts where the
+    previous one ended; the equivalent `a > x OR (a = x AND b > y)` is not
+    a range to the PostgreSQL planner and scans from the start.
+    """
+    if len(columns) == 1:
+        column, value = columns[0], values[0]
+        return column < value if descending else column > value
+    row = tuple_(*columns)
+    bound = tuple_(*(literal(v, c.type) for c, v in zip(columns, values)))
+    return row < bound if descending else row > bound
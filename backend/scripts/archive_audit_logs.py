@@ -0,0 +1,60 @@
+"""
+Audit log retention job: moves entries older than the retention window to
+audit_logs_archive and purges archived entries past theirs. Meant to run
+daily (cron or a scheduled task).
+
+Usage:
+    python scripts/archive_audit_logs.py --retention-days 180 \\
+        --archive-retention-days 1825
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path to allow importing app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.audit_retention_service import (  # noqa: E402
+    DEFAULT_BATCH_SIZE,
+    audit_retention_service,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archiva y depura el registro de auditoría"
+    )
+    parser.add_argument("--retention-days", type=int, default=None)
+    parser.add_argument(
+        "--archive-retention-days",
+        type=int,
+        default=None,
+        help="0 conserva el archivo indefinidamente",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = audit_retention_service.run(
+            db,
+            retention_days=args.retention_days,
+            archive_retention_days=args.archive_retention_days,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+    logger.info(
+        f"Listo: {result['archived']} entradas archivadas, "
+        f"{result['purged']} depuradas"
+    )
+
+
+if __name__ == "__main__":
+    main()
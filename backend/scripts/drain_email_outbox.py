@@ -0,0 +1,42 @@
+"""
+Sends the pending messages of the email outbox and prints the worker
+metrics. The API drains the outbox by itself; this is for deployments that
+run with EMAIL_OUTBOX_WORKER_ENABLED=false, or to flush a backlog by hand.
+
+Usage:
+    python scripts/drain_email_outbox.py [--max-batches 100]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path to allow importing app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.session import engine  # noqa: E402
+from app.services.email_outbox_service import email_outbox_worker  # noqa: E402
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Envía los correos pendientes")
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=100,
+        help="Lotes como máximo (de EMAIL_OUTBOX_BATCH_SIZE mensajes)",
+    )
+    args = parser.parse_args()
+
+    for _ in range(args.max_batches):
+        if email_outbox_worker.drain(engine) < email_outbox_worker.batch_size:
+            break
+    logger.info(f"Métricas: {email_outbox_worker.metrics(engine)}")
+
+
+if __name__ == "__main__":
+    main()
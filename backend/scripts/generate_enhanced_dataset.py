@@ -1,5 +1,18 @@
+"""
+Generates the synthetic training set for the risk model.
+
+Rows are drawn in vectorized chunks and streamed to disk, so large sets
+(millions of rows) never sit in memory at once. The output format follows
+the file extension: .csv, or .parquet (requires pyarrow).
+
+Usage:
+    python scripts/generate_enhanced_dataset.py --rows 10000000 --seed 7 \\
+        --class-mix 0.4,0.3,0.3 --output data/train_10m.parquet
+"""
+
+import argparse
 import os
-import random
+import time
 
 import numpy as np
 import pandas as pd
@@ -8,102 +21,152 @@ import pandas as pd
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "data", "processed_training_data.csv")
 
-
-def generate_student_data(n=1000):
-    data = []
-
-    for _ in range(n):
-        # Base profile randomness
-        profile_type = random.choices(
-            ["low", "medium", "high"], weights=[0.4, 0.3, 0.3]
-        )[0]
-
-        if profile_type == "low":
-            # Riesgo Bajo: PSS bajo, buen ánimo, poca presión
-            pss = int(np.random.normal(10, 5))
-            pss = max(0, min(40, pss))
-
-            mood = np.random.normal(4.2, 0.5)
-            mood = max(1, min(5, mood))
-
-            pressure = np.random.normal(2, 1)
-            pressure = max(1, min(5, pressure))
-
-            bad_days = random.choices([0, 1, 2], weights=[0.7, 0.2, 0.1])[0]
-
-            risk = 0  # Low
-
-        elif profile_type == "medium":
-            # Riesgo Medio: Zona gris
-            subtype = random.choice(
-                ["stressed_but_happy", "chill_but_pressured", "unstable"]
-            )
-
-            if subtype == "stressed_but_happy":
-                # Estrés alto pero buen ánimo (resiliente)
-                pss = int(np.random.normal(25, 4))
-                mood = np.random.normal(3.8, 0.4)
-                pressure = np.random.normal(3.5, 1)
-                bad_days = random.randint(1, 3)
-            elif subtype == "chill_but_pressured":
-                # Estrés bajo pero mucha presión académica
-                pss = int(np.random.normal(15, 5))
-                mood = np.random.normal(3.0, 0.5)
-                pressure = 5.0  # Max pressure
-                bad_days = random.randint(2, 4)
-            else:
-                # Inestable
-                pss = int(np.random.normal(20, 5))
-                mood = np.random.normal(2.8, 0.6)
-                pressure = np.random.normal(3, 1)
-                bad_days = random.randint(2, 4)
-
-            # Clamp values
-            pss = max(0, min(40, pss))
-            mood = max(1, min(5, mood))
-            pressure = max(1, min(5, pressure))
-
-            risk = 1  # Medium
-
-        else:  # High
-            # Riesgo Alto: Todo mal
-            pss = int(np.random.normal(30, 5))
-            pss = max(0, min(40, pss))
-
-            mood = np.random.normal(1.8, 0.6)
-            mood = max(1, min(5, mood))
-
-            pressure = np.random.normal(4, 1)
-            pressure = max(1, min(5, pressure))
-
-            bad_days = random.randint(4, 7)
-
-            risk = 2  # High
-
-        data.append(
-            {
-                "pss_score": pss,
-                "mood_avg": round(mood, 2),
-                "bad_days_freq": bad_days,
-                "study_pressure": round(pressure, 1),
-                "risk_level": risk,
-            }
-        )
-
-    return pd.DataFrame(data)
+DEFAULT_ROWS = 1000
+DEFAULT_CHUNK_SIZE = 500_000
+DEFAULT_CLASS_MIX = (0.4, 0.3, 0.3)  # Low, Medium, High
+
+# Profiles, one per row of the parameter tables below:
+# 0 Riesgo Bajo: PSS bajo, buen ánimo, poca presión
+# 1 Riesgo Medio, estrés alto pero buen ánimo (resiliente)
+# 2 Riesgo Medio, estrés bajo pero mucha presión académica
+# 3 Riesgo Medio, inestable
+# 4 Riesgo Alto: Todo mal
+PROFILE_RISK = np.array([0, 1, 1, 1, 2])
+PSS_MEAN = np.array([10.0, 25.0, 15.0, 20.0, 30.0])
+PSS_STD = np.array([5.0, 4.0, 5.0, 5.0, 5.0])
+MOOD_MEAN = np.array([4.2, 3.8, 3.0, 2.8, 1.8])
+MOOD_STD = np.array([0.5, 0.4, 0.5, 0.6, 0.6])
+# Profile 2 always reports the maximum pressure (std 0)
+PRESSURE_MEAN = np.array([2.0, 3.5, 5.0, 3.0, 4.0])
+PRESSURE_STD = np.array([1.0, 1.0, 0.0, 1.0, 1.0])
+# Inclusive bad-day ranges; profile 0 uses LOW_BAD_DAYS_WEIGHTS instead
+BAD_DAYS_LOW = np.array([0, 1, 2, 2, 4])
+BAD_DAYS_HIGH = np.array([2, 3, 4, 4, 7])
+LOW_BAD_DAYS_WEIGHTS = np.array([0.7, 0.2, 0.1])  # 0, 1 or 2 bad days
+
+
+def generate_chunk(rng: np.random.Generator, n: int, class_mix) -> pd.DataFrame:
+    """
+    Draws `n` students. The risk class follows `class_mix`; medium-risk
+    students are split evenly across the three medium profiles.
+    """
+    risk = rng.choice(3, size=n, p=class_mix)
+    profile = np.where(risk == 0, 0, 4)
+    medium = risk == 1
+    profile[medium] = 1 + rng.integers(0, 3, size=int(medium.sum()))
+
+    # int() truncation of the normal draw, then clamped to the scale
+    pss = np.clip(np.trunc(rng.normal(PSS_MEAN[profile], PSS_STD[profile])), 0, 40)
+    mood = np.clip(rng.normal(MOOD_MEAN[profile], MOOD_STD[profile]), 1, 5)
+    pressure = np.clip(rng.normal(PRESSURE_MEAN[profile], PRESSURE_STD[profile]), 1, 5)
+
+    bad_days = rng.integers(BAD_DAYS_LOW[profile], BAD_DAYS_HIGH[profile] + 1)
+    low = profile == 0
+    bad_days[low] = rng.choice(3, size=int(low.sum()), p=LOW_BAD_DAYS_WEIGHTS)
+
+    return pd.DataFrame(
+        {
+            "pss_score": pss.astype(np.int64),
+            "mood_avg": np.round(mood, 2),
+            "bad_days_freq": bad_days,
+            "study_pressure": np.round(pressure, 1),
+            "risk_level": PROFILE_RISK[profile],
+        }
+    )
+
+
+def generate_student_data(
+    n=DEFAULT_ROWS, seed=None, class_mix=DEFAULT_CLASS_MIX
+) -> pd.DataFrame:
+    """
+    Generates the whole dataset in memory (small sets and tests).
+    """
+    return generate_chunk(np.random.default_rng(seed), n, _normalize_mix(class_mix))
+
+
+def _normalize_mix(class_mix) -> np.ndarray:
+    class_mix = np.asarray(class_mix, dtype=np.float64)
+    if class_mix.shape != (3,) or (class_mix < 0).any() or class_mix.sum() <= 0:
+        raise ValueError("class_mix debe tener 3 pesos no negativos")
+    return class_mix / class_mix.sum()
+
+
+def iter_chunks(
+    n, seed=None, class_mix=DEFAULT_CLASS_MIX, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Yields DataFrames of at most `chunk_size` rows, `n` rows in total. The
+    output is reproducible for a given seed and chunk size.
+    """
+    class_mix = _normalize_mix(class_mix)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk_size):
+        yield generate_chunk(rng, min(chunk_size, n - start), class_mix)
+
+
+def write_dataset(
+    path,
+    n=DEFAULT_ROWS,
+    seed=None,
+    class_mix=DEFAULT_CLASS_MIX,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Streams `n` rows to `path` and returns the row count per risk class.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    counts = np.zeros(3, dtype=np.int64)
+    chunks = iter_chunks(n, seed, class_mix, chunk_size)
+
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("La salida Parquet requiere pyarrow") from e
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                counts += np.bincount(chunk["risk_level"], minlength=3)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(path, "w", newline="") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, index=False, header=i == 0)
+                counts += np.bincount(chunk["risk_level"], minlength=3)
+    return counts
 
 
 def main():
-    print(f"Generating enhanced dataset with 1000 samples...")
-    df = generate_student_data(1000)
-
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
-
-    df.to_csv(DATA_PATH, index=False)
-    print(f" Dataset saved to: {DATA_PATH}")
+    parser = argparse.ArgumentParser(description="Genera el dataset sintético")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--class-mix",
+        default=",".join(str(w) for w in DEFAULT_CLASS_MIX),
+        help="Pesos Low,Medium,High (se normalizan)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--output", default=DATA_PATH, help=".csv o .parquet")
+    args = parser.parse_args()
+
+    class_mix = [float(w) for w in args.class_mix.split(",")]
+    print(f"Generating enhanced dataset with {args.rows} samples...")
+    started = time.perf_counter()
+    counts = write_dataset(
+        args.output, args.rows, args.seed, class_mix, args.chunk_size
+    )
+    print(f" Dataset saved to: {args.output} ({time.perf_counter() - started:.1f}s)")
     print("\nClass Distribution:")
-    print(df["risk_level"].value_counts(normalize=True))
+    for level, count in enumerate(counts):
+        print(f"{level}    {count / max(args.rows, 1):.4f}")
 
 
 if __name__ == "__main__":
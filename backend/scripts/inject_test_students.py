@@ -9,11 +9,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.core.security import get_password_hash
 from app.db.session import SessionLocal
+from app.ml.features import feature_store
 from app.models.assessment import Assessment
 from app.models.consent import Consent
 from app.models.emotional_checkin import EmotionalCheckin
 from app.models.user import User, UserRole
 from app.services.assessment_service import assessment_service
+from app.services.dashboard_service import dashboard_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -81,6 +83,11 @@ def create_student_profile(db, email_prefix, risk_profile, num_checkins=10):
         )
         db.add(checkin)
 
+    db.flush()
+    # Bulk import bypasses the check-in endpoint: rebuild the rolling window
+    # and the student's dashboard row
+    feature_store.rebuild(db, user.id)
+    dashboard_service.rebuild(db, [user.id])
     db.commit()
 
     # 3. Simulate Assessment Response (PSS-10) to trigger Risk Calculation
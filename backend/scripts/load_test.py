@@ -0,0 +1,103 @@
+"""
+Load test for the high-traffic student endpoints: sends concurrent
+authenticated requests to a running API and reports throughput and latency
+per endpoint. Run it at several concurrency levels (and against the sync
+and async versions of an endpoint) to compare how they scale.
+
+Usage:
+    python scripts/load_test.py --email estudiante@gmail.com \\
+        --password Test1234! --concurrency 100 --requests 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# One log line per request would drown the results
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_ENDPOINTS = [
+    "/api/v1/users/me",
+    "/api/v1/checkins/me",
+    "/api/v1/risk/me/summary",
+    "/api/v1/alerts/me",
+]
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    r = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def _run(client, path, headers, total, concurrency):
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            r = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if r.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "errors": errors,
+    }
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60
+    ) as client:
+        token = args.token or await _login(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        for path in args.endpoints:
+            # Warm-up: connections, principal cache
+            await _run(client, path, headers, args.concurrency, args.concurrency)
+            result = await _run(client, path, headers, args.requests, args.concurrency)
+            logger.info(
+                f"{path}: {result['rps']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, "
+                f"p95 {result['p95_ms']:.1f} ms, {result['errors']} errores "
+                f"(concurrencia {args.concurrency})"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", help="Token de acceso (si no, se usa el login)")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    args = parser.parse_args()
+    if not args.token and not (args.email and args.password):
+        parser.error("Indica --token o --email y --password")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
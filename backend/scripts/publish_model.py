@@ -0,0 +1,68 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+# Add the parent directory to sys.path to allow importing app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.ml.model_loader import model_registry  # noqa: E402
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gestiona el registro de modelos ML")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="Lista las versiones publicadas")
+
+    publish = subparsers.add_parser("publish", help="Publica un artefacto .pkl")
+    publish.add_argument("path", help="Ruta al modelo entrenado")
+    publish.add_argument("--version", help="Nombre de la versión (por defecto fecha)")
+    publish.add_argument(
+        "--activate", action="store_true", help="Activa la versión al publicarla"
+    )
+    publish.add_argument(
+        "--compile",
+        action="store_true",
+        help="Publica el bosque como arrays NumPy (.npz), sin sklearn al servir",
+    )
+
+    activate = subparsers.add_parser("activate", help="Activa una versión publicada")
+    activate.add_argument("version")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        active = model_registry.active_version()
+        for version in model_registry.list_versions():
+            manifest = model_registry.manifest(version)
+            marker = "*" if version == active else " "
+            print(f"{marker} {version}  sha256={manifest['sha256'][:12]}")
+    elif args.command == "publish":
+        if args.compile:
+            import joblib
+
+            from app.ml.tree_ensemble import CompiledForest
+
+            with tempfile.TemporaryDirectory() as tmp:
+                compiled_path = os.path.join(tmp, "model.npz")
+                CompiledForest.from_sklearn(joblib.load(args.path)).save(compiled_path)
+                version = model_registry.publish(
+                    compiled_path, version=args.version, activate=args.activate
+                )
+        else:
+            version = model_registry.publish(
+                args.path, version=args.version, activate=args.activate
+            )
+        logger.info(f"Versión publicada: {version}")
+    elif args.command == "activate":
+        model_registry.activate(args.version)
+        logger.info(f"Versión activa: {args.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Rebuilds the materialized staff dashboard (student_dashboard) from the
+history tables, creating the missing rolling features (student_features) on
+the way. Run it after applying the migrations that create and backfill the
+table (f7c3e9a2b416 leaves mood_avg_7d empty) and after bulk imports that
+bypass the API.
+
+Usage:
+    python scripts/rebuild_dashboard.py --chunk-size 2000
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path to allow importing app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.dashboard_service import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    dashboard_service,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reconstruye el panel materializado de estudiantes"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        total = dashboard_service.rebuild_all(db, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    logger.info(f"Listo: {total} estudiantes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Re-scores every student's risk summary with the active model.
+
+Usage:
+    python scripts/rescore_students.py --chunk-size 2000 \\
+        --checkpoint /tmp/rescore.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path to allow importing app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.ml.risk_classifier import risk_classifier  # noqa: E402
+from app.services.rescoring_service import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    rescoring_service,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-evalúa el riesgo de todos los estudiantes"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--checkpoint",
+        default="rescore_checkpoint.json",
+        help="Archivo de progreso para reanudar una ejecución interrumpida",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignora el progreso guardado"
+    )
+    args = parser.parse_args()
+
+    logger.info(f"Modelo activo: {risk_classifier.active.version}")
+    if not rescoring_service.acquire_run_lock(engine):
+        logger.error("Ya hay una re-evaluación en curso")
+        sys.exit(1)
+    db = SessionLocal()
+    try:
+        result = rescoring_service.rescore_all(
+            db,
+            chunk_size=args.chunk_size,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+        )
+    finally:
+        db.close()
+        rescoring_service.release_run_lock()
+    logger.info(
+        f"Listo: {result['processed']} estudiantes, {result['updated']} "
+        f"actualizados, {result['alerts']} alertas nuevas"
+    )
+
+
+if __name__ == "__main__":
+    main()
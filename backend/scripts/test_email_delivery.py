@@ -16,10 +16,8 @@ async def send_test_email():
 
     # We use send_verification_email as a test
     try:
-        email_service.send_verification_email(to_email, "TEST_TOKEN_12345")
-        # Note: The service logs success/failure, but we can't capture it easily here
-        # unless we modify the service to return bool (which I did earlier in view_file).
-        # Let's assume the user will see the log output or receive the email.
+        sent = email_service.send_verification_email(to_email, "TEST_TOKEN_12345")
+        print("Sent." if sent else "Not sent, see the log output.")
     except Exception as e:
         print(f"Error: {e}")
 
@@ -1,23 +1,45 @@
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
+from app.core.limiter import limiter
+from app.core.principal_cache import principal_cache
 from app.db.base import Base
 from app.main import app
 
-# Use SQLite in-memory for tests
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# SQLite file for tests: the sync and async (aiosqlite) endpoints must see
+# the same database, which rules out an in-memory one
+_db_path = os.path.join(tempfile.mkdtemp(prefix="mentalink-tests-"), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{_db_path}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Each TestClient runs its own event loop: no pooled connections across them
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{_db_path}",
+    poolclass=NullPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+@event.listens_for(engine, "connect")
+def _wal(dbapi_connection, connection_record):
+    # Readers of one engine must not block the writers of the other
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -25,6 +47,8 @@ def db_session():
     Creates a fresh database session for each test.
     """
     Base.metadata.create_all(bind=engine)
+    # Ids are reused across tests: never serve a previous test's user
+    principal_cache.clear()
     session = TestingSessionLocal()
     yield session
     session.close()
@@ -43,7 +67,14 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Every test starts with a fresh rate limit budget
+    limiter.reset()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides = {}
@@ -53,11 +84,30 @@ def client(db_session):
 def mock_email():
     """
     Force the use of MockEmailService for all tests to prevent sending real emails.
+    The outbox worker is not started: tests drain the outbox themselves.
     """
-    from app.services.auth_service import auth_service
+    from app.core.config import settings
+    from app.services.email_outbox_service import email_outbox_worker
     from app.services.email_service import MockEmailService
 
-    original_service = auth_service.mail
-    auth_service.mail = MockEmailService()
+    original_service = email_outbox_worker.mail
+    original_enabled = settings.EMAIL_OUTBOX_WORKER_ENABLED
+    email_outbox_worker.mail = MockEmailService()
+    settings.EMAIL_OUTBOX_WORKER_ENABLED = False
+    yield
+    email_outbox_worker.mail = original_service
+    settings.EMAIL_OUTBOX_WORKER_ENABLED = original_enabled
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_pool_warmup():
+    """
+    The app's own engines are not used by the tests (sessions are
+    overridden): don't open connections to them at startup.
+    """
+    from app.core.config import settings
+
+    original = settings.DB_POOL_WARMUP_CONNECTIONS
+    settings.DB_POOL_WARMUP_CONNECTIONS = 0
     yield
-    auth_service.mail = original_service
+    settings.DB_POOL_WARMUP_CONNECTIONS = original
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.security import create_access_token
+from app.models.audit_log import AuditLog, AuditLogArchive
+from app.models.user import User, UserRole
+from app.services.audit_retention_service import audit_retention_service
+
+NOW = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _user(db_session, email, role):
+    user = User(
+        email=email,
+        hashed_password="x",
+        full_name=email.split("@")[0],
+        role=role,
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(user.id, role=user.role.value)
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+def _add_entries(db_session, actors, n):
+    """
+    Entry i is by actors[i % len(actors)], one hour older than entry i - 1;
+    every third one is an alert resolution.
+    """
+    for i in range(n):
+        db_session.add(
+            AuditLog(
+                actor_id=actors[i % len(actors)].id,
+                action="RESOLVE_ALERT" if i % 3 == 0 else "VIEW_STUDENT_PROFILE",
+                resource_id=str(i % 4),
+                timestamp=NOW - timedelta(hours=i),
+            )
+        )
+    db_session.commit()
+
+
+def _all_pages(client, headers, **params):
+    resources, cursor = [], None
+    while True:
+        query = dict(params, limit=4)
+        if cursor:
+            query["cursor"] = cursor
+        r = client.get("/api/v1/audit/", params=query, headers=headers)
+        assert r.status_code == 200
+        body = r.json()
+        resources += [(e["action"], e["timestamp"]) for e in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return resources
+
+
+def test_audit_query_filters_and_pages(client, db_session):
+    admin, headers = _user(db_session, "admin_audit@gmail.com", UserRole.ADMIN)
+    psychologist, psy_headers = _user(
+        db_session, "psy_audit@gmail.com", UserRole.PSYCHOLOGIST
+    )
+    _add_entries(db_session, [admin, psychologist], 20)
+
+    entries = _all_pages(client, headers)
+    assert len(entries) == 20
+    # Newest first
+    assert [t for _, t in entries] == sorted((t for _, t in entries), reverse=True)
+
+    by_actor = _all_pages(client, headers, actor_id=psychologist.id)
+    assert len(by_actor) == 10
+    resolutions = _all_pages(client, headers, action="RESOLVE_ALERT")
+    assert len(resolutions) == 7 and {a for a, _ in resolutions} == {"RESOLVE_ALERT"}
+    assert len(_all_pages(client, headers, resource_id="1")) == 5
+    window = _all_pages(
+        client,
+        headers,
+        since=(NOW - timedelta(hours=9)).isoformat(),
+        until=(NOW - timedelta(hours=2)).isoformat(),
+    )
+    # Entries 3 to 9 hours old: since is inclusive, until exclusive
+    assert len(window) == 7
+
+    r = client.get("/api/v1/audit/", headers=psy_headers)
+    assert r.status_code == 403
+    r = client.get("/api/v1/audit/", params={"cursor": "x"}, headers=headers)
+    assert r.status_code == 400
+
+
+def test_retention_moves_old_entries_to_the_archive(client, db_session):
+    admin, headers = _user(db_session, "admin_retention@gmail.com", UserRole.ADMIN)
+    for days in (1, 10, 200, 400, 3000):
+        db_session.add(
+            AuditLog(
+                actor_id=admin.id,
+                action="VIEW_STUDENT_PROFILE",
+                resource_id=str(days),
+                timestamp=NOW - timedelta(days=days),
+            )
+        )
+    db_session.commit()
+
+    result = audit_retention_service.run(
+        db_session,
+        retention_days=180,
+        archive_retention_days=1825,
+        batch_size=1,
+        now=NOW,
+    )
+
+    assert result == {"archived": 3, "purged": 1}
+    live = {e.resource_id for e in db_session.query(AuditLog).all()}
+    archived = {e.resource_id for e in db_session.query(AuditLogArchive).all()}
+    assert (live, archived) == ({"1", "10"}, {"200", "400"})
+
+    r = client.get("/api/v1/audit/", params={"archived": True}, headers=headers)
+    assert [e["resource_id"] for e in r.json()["items"]] == ["200", "400"]
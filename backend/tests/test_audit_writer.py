@@ -0,0 +1,142 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+
+from app.db.base import Base
+from app.models.audit_log import AuditLog
+from app.services.audit_service import AuditWriter
+
+
+@pytest.fixture
+def audit_engine(tmp_path):
+    # File database: the writer thread gets its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _entry(i):
+    return {"actor_id": 1, "action": "VIEW_STUDENT_PROFILE", "resource_id": str(i)}
+
+
+def _rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count(AuditLog.id))).scalar()
+
+
+def _record_inserts(engine):
+    inserts = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO audit_logs"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    return inserts
+
+
+def test_entries_are_written_in_multi_row_batches(audit_engine):
+    inserts = _record_inserts(audit_engine)
+    writer = AuditWriter(batch_size=50, flush_interval=5.0)
+    writer.start()
+    try:
+        for i in range(120):
+            writer.submit(audit_engine, _entry(i))
+        writer.flush()
+    finally:
+        writer.stop()
+
+    assert _rows(audit_engine) == 120
+    # 50 + 50 + 20 rows, one statement each
+    assert len(inserts) == 3
+
+
+def test_stop_flushes_pending_entries(audit_engine):
+    writer = AuditWriter(batch_size=500, flush_interval=60.0)
+    writer.start()
+    for i in range(10):
+        writer.submit(audit_engine, _entry(i))
+
+    writer.stop(timeout=5)
+
+    assert not writer.running
+    assert _rows(audit_engine) == 10
+
+
+def test_full_queue_makes_the_caller_write(audit_engine):
+    release = threading.Event()
+
+    def slow_worker(conn, cursor, statement, *args):
+        if threading.current_thread().name == "audit-writer":
+            release.wait(5)
+
+    event.listen(audit_engine, "before_cursor_execute", slow_worker)
+    writer = AuditWriter(batch_size=1, flush_interval=0.01, queue_size=1)
+    writer.enqueue_timeout = 0.01
+    writer.start()
+    try:
+        writer.submit(audit_engine, _entry(0))  # Taken by the blocked worker
+        while writer._queue.qsize():
+            pass
+        writer.submit(audit_engine, _entry(1))  # Fills the queue
+        writer.submit(audit_engine, _entry(2))  # No room: written inline
+
+        assert _rows(audit_engine) == 1
+    finally:
+        release.set()
+        writer.stop(timeout=5)
+    assert _rows(audit_engine) == 3
+
+
+def test_without_worker_entries_are_written_immediately(audit_engine):
+    writer = AuditWriter()
+
+    writer.submit(audit_engine, _entry(0))
+
+    assert _rows(audit_engine) == 1
+
+
+def test_a_rejected_entry_does_not_lose_its_batch(audit_engine):
+    inserts = _record_inserts(audit_engine)
+    writer = AuditWriter(batch_size=50, flush_interval=5.0)
+    writer.start()
+    try:
+        for i in range(5):
+            # NOT NULL violation in the third entry
+            writer.submit(audit_engine, dict(_entry(i), action=None if i == 2 else "X"))
+        writer.flush()
+    finally:
+        writer.stop()
+
+    assert _rows(audit_engine) == 4
+    # The batch once (not retried: the data is wrong), then row by row
+    assert len(inserts) == 1 + 5
+
+
+def test_stop_does_not_hold_the_lock_while_the_queue_drains(audit_engine):
+    release = threading.Event()
+
+    def slow_worker(conn, cursor, statement, *args):
+        if threading.current_thread().name == "audit-writer":
+            release.wait(5)
+
+    event.listen(audit_engine, "before_cursor_execute", slow_worker)
+    writer = AuditWriter(batch_size=1, flush_interval=0.01, queue_size=1)
+    writer.start()
+    writer.submit(audit_engine, _entry(0))  # Taken by the blocked worker
+    while writer._queue.qsize():
+        pass
+    writer.submit(audit_engine, _entry(1))  # Fills the queue
+    stopping = threading.Thread(target=writer.stop, kwargs={"timeout": 5})
+    stopping.start()
+    try:
+        # stop() waits for room in the queue without blocking start/stop
+        assert writer._lock.acquire(timeout=1)
+        writer._lock.release()
+        assert stopping.is_alive() and not writer.running
+    finally:
+        release.set()
+        stopping.join(5)
+    assert _rows(audit_engine) == 2
@@ -0,0 +1,280 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from app.core.security import create_access_token
+from app.models.alert import Alert
+from app.models.assessment import Assessment
+from app.models.emotional_checkin import EmotionalCheckin
+from app.models.student_dashboard import NO_ASSESSMENT_DATE, StudentDashboard
+from app.models.user import User, UserRole
+from app.services.dashboard_service import dashboard_service
+from tests.conftest import engine
+
+COLUMNS = (
+    "risk_level",
+    "active_alerts",
+    "last_assessment_date",
+    "last_checkin_date",
+    "mood_avg_7d",
+    "checkin_count",
+    "mood_total",
+)
+
+
+def _user(db_session, email, role):
+    user = User(
+        email=email,
+        hashed_password="x",
+        full_name=email.split("@")[0],
+        role=role,
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    headers = {
+        "Authorization": "Bearer " + create_access_token(user.id, role=user.role.value)
+    }
+    return user, headers
+
+
+def _snapshot(db_session, user_id):
+    db_session.expire_all()
+    row = db_session.get(StudentDashboard, user_id)
+    return None if row is None else tuple(getattr(row, c) for c in COLUMNS)
+
+
+def _assert_matches_rebuild(db_session, user_id):
+    """
+    The incrementally maintained row equals one recomputed from history.
+    """
+    maintained = _snapshot(db_session, user_id)
+    dashboard_service.rebuild(db_session, [user_id])
+    db_session.commit()
+    assert maintained == _snapshot(db_session, user_id)
+    return maintained
+
+
+def test_write_paths_keep_dashboard_in_sync(client, db_session):
+    student, student_headers = _user(
+        db_session, "student_dashboard@gmail.com", UserRole.STUDENT
+    )
+    admin, admin_headers = _user(
+        db_session, "admin_dashboard@gmail.com", UserRole.ADMIN
+    )
+    pss = Assessment(
+        title="PSS-10 Dashboard",
+        type="PSS-10",
+        items=[{"id": f"q{i}", "text": "..."} for i in range(1, 11)],
+    )
+    db_session.add(pss)
+    db_session.commit()
+
+    moods = [1, 2, 4, 5, 3, 1, 2, 4, 5]
+    for mood in moods:
+        r = client.post(
+            "/api/v1/checkins/",
+            json={"mood_score": mood, "academic_pressure": 4},
+            headers=student_headers,
+        )
+        assert r.status_code == 200
+    row = _assert_matches_rebuild(db_session, student.id)
+    assert row[COLUMNS.index("checkin_count")] == len(moods)
+    assert row[COLUMNS.index("mood_total")] == sum(moods)
+    assert row[COLUMNS.index("mood_avg_7d")] == sum(moods[-7:]) / 7
+
+    # Maximum stress: High risk and one alert, twice
+    for _ in range(2):
+        r = client.post(
+            "/api/v1/assessments/responses",
+            json={
+                "assessment_id": pss.id,
+                "answers": {
+                    f"q{i}": 0 if i in (4, 5, 7, 8) else 4 for i in range(1, 11)
+                },
+            },
+            headers=student_headers,
+        )
+        assert r.status_code == 200
+    row = _assert_matches_rebuild(db_session, student.id)
+    assert row[COLUMNS.index("active_alerts")] == 2
+    assert row[COLUMNS.index("last_assessment_date")] is not None
+
+    alert = db_session.query(Alert).filter(Alert.user_id == student.id).first()
+    r = client.put(
+        f"/api/v1/alerts/{alert.id}",
+        json={"is_resolved": True},
+        headers=admin_headers,
+    )
+    assert r.status_code == 200
+    assert _assert_matches_rebuild(db_session, student.id)[1] == 1
+
+    # Deactivating the student resolves the remaining alert
+    r = client.patch(f"/api/v1/users/{student.id}/status", headers=admin_headers)
+    assert r.status_code == 200
+    assert _assert_matches_rebuild(db_session, student.id)[1] == 0
+
+    # Leaving the student role drops the row; coming back rebuilds it
+    r = client.patch(
+        f"/api/v1/users/{student.id}/role",
+        params={"role": "psychologist"},
+        headers=admin_headers,
+    )
+    assert r.status_code == 200
+    assert _snapshot(db_session, student.id) is None
+    r = client.patch(
+        f"/api/v1/users/{student.id}/role",
+        params={"role": "student"},
+        headers=admin_headers,
+    )
+    assert r.status_code == 200
+    assert _snapshot(db_session, student.id) == row[:1] + (0,) + row[2:]
+
+    r = client.delete(f"/api/v1/users/{student.id}", headers=admin_headers)
+    assert r.status_code == 204
+    assert _snapshot(db_session, student.id) is None
+
+
+def test_missing_row_is_rebuilt_on_first_change(client, db_session):
+    student, headers = _user(db_session, "student_backfill@gmail.com", UserRole.STUDENT)
+    # History written before the dashboard existed
+    db_session.add_all(
+        EmotionalCheckin(user_id=student.id, mood_score=m, academic_pressure=3)
+        for m in (2, 4)
+    )
+    db_session.commit()
+    assert _snapshot(db_session, student.id) is None
+
+    r = client.post("/api/v1/checkins/", json={"mood_score": 3}, headers=headers)
+
+    assert r.status_code == 200
+    row = _assert_matches_rebuild(db_session, student.id)
+    assert row[COLUMNS.index("checkin_count")] == 3
+
+
+def test_rebuild_upserts_rows_written_concurrently(db_session):
+    student, _ = _user(db_session, "student_upsert@gmail.com", UserRole.STUDENT)
+    db_session.add_all(
+        EmotionalCheckin(user_id=student.id, mood_score=m, academic_pressure=3)
+        for m in (1, 5)
+    )
+    db_session.commit()
+    # Loaded before another transaction creates the row
+    assert db_session.get(StudentDashboard, student.id) is None
+    with engine.begin() as conn:
+        conn.execute(
+            StudentDashboard.__table__.insert().values(
+                user_id=student.id, risk_level="High", checkin_count=9
+            )
+        )
+    loaded = db_session.get(StudentDashboard, student.id)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        dashboard_service.rebuild(db_session, [student.id])
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert not any(s.startswith("DELETE") for s in statements)
+    assert (loaded.risk_level, loaded.checkin_count, loaded.mood_total) == (
+        "Low",
+        2,
+        6,
+    )
+
+
+def test_report_reads_only_the_dashboard(client, db_session):
+    _, headers = _user(db_session, "psy_report@gmail.com", UserRole.PSYCHOLOGIST)
+    students = [
+        _user(db_session, f"student_report_{i}@gmail.com", UserRole.STUDENT)[0]
+        for i in range(3)
+    ]
+    for student, moods in zip(students, [(1, 2), (5,), ()]):
+        db_session.add_all(
+            EmotionalCheckin(user_id=student.id, mood_score=m) for m in moods
+        )
+    db_session.add(Alert(user_id=students[0].id, severity="High", message="m"))
+    db_session.commit()
+    dashboard_service.rebuild_all(db_session, chunk_size=2)
+    db_session.query(StudentDashboard).filter(
+        StudentDashboard.user_id == students[0].id
+    ).update({"risk_level": "High", "last_assessment_date": datetime.now(timezone.utc)})
+    db_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.get("/api/v1/reports/aggregated", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total_population"] == 3
+    assert body["risk_distribution"] == {"High": 1}
+    assert body["average_mood_score"] == round(8 / 3, 2)
+    assert not any(
+        table in s
+        for s in statements
+        for table in ("emotional_checkins", "risk_summaries", "FROM alerts")
+    )
+
+
+def test_new_students_get_their_row_and_reach_the_roster(client, db_session):
+    _, headers = _user(db_session, "admin_new_rows@gmail.com", UserRole.ADMIN)
+    for role in ("student", "psychologist"):
+        r = client.post(
+            "/api/v1/users/internal",
+            json={
+                "email": f"{role}_new_row@gmail.com",
+                "password": "Password123!",
+                "full_name": "Nuevo Usuario",
+                "role": role,
+            },
+            headers=headers,
+        )
+        assert r.status_code == 201
+    r = client.post(
+        "/api/v1/users/",
+        json={
+            "email": "self_registered@gmail.com",
+            "password": "Password123!",
+            "full_name": "Registro Propio",
+            "role": "student",
+        },
+    )
+    assert r.status_code == 201
+    students = (
+        db_session.query(User)
+        .filter(
+            User.email.in_(["student_new_row@gmail.com", "self_registered@gmail.com"])
+        )
+        .all()
+    )
+
+    # Defaults, not NULLs, and equal to a rebuild from (empty) history
+    for student in students:
+        assert _assert_matches_rebuild(db_session, student.id)[:3] == (
+            "Low",
+            0,
+            NO_ASSESSMENT_DATE.replace(tzinfo=None),
+        )
+    assert db_session.query(StudentDashboard).count() == 2
+
+    r = client.get(
+        "/api/v1/students/", params={"sort": "last_assessment_desc"}, headers=headers
+    )
+    assert r.status_code == 200
+    items = r.json()["items"]
+    assert {row["id"] for row in items} == {s.id for s in students}
+    assert all(row["last_assessment_date"] is None for row in items)
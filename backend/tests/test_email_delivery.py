@@ -0,0 +1,124 @@
+import socket
+import threading
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.services.email_delivery import SMTPDeliveryWorker
+
+
+class _Recorder:
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.rcpt_tos[0])
+        return "250 OK"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = _Recorder()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _worker(controller, **kwargs):
+    return SMTPDeliveryWorker(
+        host=controller.hostname,
+        port=controller.port,
+        user="",
+        use_tls=False,
+        **kwargs,
+    )
+
+
+def _message(i):
+    msg = EmailMessage()
+    msg["From"] = "MENTA-LINK <noreply@menta.link>"
+    msg["To"] = f"student{i}@gmail.com"
+    msg["Subject"] = "Prueba"
+    msg.set_content("Hola")
+    return msg
+
+
+def test_messages_share_persistent_connections(smtp_server):
+    controller, handler = smtp_server
+    worker = _worker(controller, pool_size=2, batch_size=10)
+    try:
+        for i in range(50):
+            worker.submit(_message(i))
+        worker.flush()
+    finally:
+        worker.stop(timeout=5)
+
+    assert sorted(handler.messages) == sorted(
+        f"student{i}@gmail.com" for i in range(50)
+    )
+    assert worker.sent == 50 and worker.failed == 0
+    # One connection per worker thread, not one per message
+    assert worker.connections_opened <= 2
+    assert handler.sessions <= 2
+
+
+def test_dropped_connection_is_reopened(smtp_server):
+    controller, handler = smtp_server
+    worker = _worker(controller, pool_size=1)
+    try:
+        worker.submit(_message(0))
+        worker.flush()
+        # Server side hang-up of the idle connection
+        worker._connections["smtp-worker-0"].sock.shutdown(socket.SHUT_RDWR)
+        assert worker.send(_message(1)) is True
+    finally:
+        worker.stop(timeout=5)
+
+    assert handler.messages == ["student0@gmail.com", "student1@gmail.com"]
+    assert worker.connections_opened == 2
+
+
+def test_undeliverable_messages_reach_the_fallback():
+    failures = []
+    worker = SMTPDeliveryWorker(
+        host="127.0.0.1", port=_free_port(), user="", use_tls=False, pool_size=1
+    )
+    try:
+        worker.submit(_message(0), on_failure=lambda m, e: failures.append(m["To"]))
+        worker.flush()
+        assert worker.send(_message(1)) is False
+    finally:
+        worker.stop(timeout=5)
+
+    assert failures == ["student0@gmail.com"]
+    assert worker.failed == 2
+
+
+def test_stop_sends_the_queue_and_returns(smtp_server):
+    controller, handler = smtp_server
+    worker = _worker(controller, pool_size=2, batch_size=5)
+    for i in range(50):
+        worker.submit(_message(i))
+
+    # No timeout: stop() must not wait on workers that wait on its lock
+    stopping = threading.Thread(target=worker.stop, daemon=True)
+    stopping.start()
+    stopping.join(10)
+
+    assert not stopping.is_alive()
+    assert not worker.running
+    assert worker.sent == 50 and len(handler.messages) == 50
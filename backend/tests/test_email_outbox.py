@@ -0,0 +1,191 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.email_outbox import EmailOutbox
+from app.models.tokens import EmailVerificationToken
+from app.models.user import User
+from app.services.auth_service import auth_service
+from app.services.email_outbox_service import EmailOutboxWorker
+from app.services.email_service import EmailService
+from tests.conftest import engine
+
+
+class _FlakyMail(EmailService):
+    """
+    Fails the first `failures` sends, then delivers.
+    """
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.delivered = []
+
+    def _send(self, to_email, token, message_id):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("SMTP caído")
+        self.delivered.append((to_email, token, message_id))
+        return True
+
+    def send_verification_email(self, to_email, token, message_id=None):
+        return self._send(to_email, token, message_id)
+
+    def send_password_reset_email(self, to_email, token, message_id=None):
+        return self._send(to_email, token, message_id)
+
+
+def _user(db_session, email):
+    user = User(email=email, hashed_password="x", full_name="Outbox")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def _worker(mail, **kwargs):
+    return EmailOutboxWorker(
+        mail=mail, backoff_seconds=30, max_backoff_seconds=600, **kwargs
+    )
+
+
+def test_token_and_message_are_written_together(client, db_session):
+    r = client.post(
+        "/api/v1/users/",
+        json={
+            "full_name": "Outbox Student",
+            "email": "outbox@gmail.com",
+            "password": "Password123",
+            "role": "student",
+        },
+    )
+    assert r.status_code == 201
+
+    token = db_session.query(EmailVerificationToken).one()
+    message = db_session.query(EmailOutbox).one()
+    assert message.kind == "verification" and message.status == "pending"
+    assert message.idempotency_key == f"verification-{token.token_hash}"
+
+    mail = _FlakyMail()
+    assert _worker(mail).drain(engine) == 1
+    db_session.expire_all()
+    assert message.status == "sent" and message.token is None
+    [(to_email, raw_token, message_id)] = mail.delivered
+    assert to_email == "outbox@gmail.com"
+    assert auth_service._hash_token(raw_token) == token.token_hash
+    assert message_id == message.idempotency_key
+
+
+def test_failed_sends_back_off_then_give_up(db_session):
+    user = _user(db_session, "backoff@gmail.com")
+    auth_service.request_password_reset(db_session, user.email)
+    mail = _FlakyMail(failures=10)
+    worker = _worker(mail, max_attempts=3)
+
+    assert worker.drain(engine) == 1
+    message = db_session.query(EmailOutbox).one()
+    assert (message.status, message.attempts) == ("pending", 1)
+    assert "SMTP caído" in message.last_error
+    # Not due again until the backoff has passed
+    assert worker.drain(engine, now=datetime.now(timezone.utc)) == 0
+    later = datetime.now(timezone.utc) + timedelta(seconds=31)
+    assert worker.drain(engine, now=later) == 1
+    assert worker.drain(engine, now=later + timedelta(seconds=61)) == 1
+
+    db_session.expire_all()
+    assert (message.status, message.attempts, message.token) == ("failed", 3, None)
+    assert worker.metrics()["retried"] == 2 and worker.metrics()["failed"] == 1
+    assert not mail.delivered
+
+
+def test_retry_delivers_and_reports_throughput(db_session):
+    for i in range(3):
+        user = _user(db_session, f"burst{i}@gmail.com")
+        auth_service.create_verification_token(db_session, user)
+    mail = _FlakyMail(failures=1)
+    worker = _worker(mail, batch_size=2)
+
+    assert worker.drain(engine) == 2
+    assert worker.drain(engine) == 1
+    assert worker.metrics(engine)["pending"] == 1
+    assert worker.drain(engine, now=datetime.now(timezone.utc) + timedelta(minutes=1))
+
+    metrics = worker.metrics(engine)
+    assert metrics["sent"] == 3 and metrics["retried"] == 1
+    assert metrics["sent_per_minute"] == 3.0
+    assert metrics["pending"] == 0
+    assert len({key for _, _, key in mail.delivered}) == 3
+
+
+def test_claimed_messages_are_not_sent_twice(db_session):
+    user = _user(db_session, "lease@gmail.com")
+    auth_service.create_verification_token(db_session, user)
+    first, second = _worker(_FlakyMail()), _worker(_FlakyMail())
+
+    assert len(first._claim(engine, datetime.now(timezone.utc))) == 1
+    # Leased by the first worker: the second one finds nothing due
+    assert second.drain(engine) == 0
+
+    message = db_session.query(EmailOutbox).one()
+    db_session.add(
+        EmailOutbox(
+            idempotency_key=message.idempotency_key,
+            kind=message.kind,
+            to_email=message.to_email,
+        )
+    )
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+    db_session.rollback()
+
+
+def test_tokens_are_stored_encrypted(db_session):
+    user = _user(db_session, "encrypted@gmail.com")
+    token = auth_service.create_verification_token(db_session, user)
+
+    message = db_session.query(EmailOutbox).one()
+    assert token not in message.token
+    mail = _FlakyMail()
+    assert _worker(mail).drain(engine) == 1
+    assert mail.delivered[0][1] == token
+
+
+def test_expired_reset_messages_are_purged(db_session):
+    user = _user(db_session, "expiry@gmail.com")
+    auth_service.request_password_reset(db_session, user.email)
+    mail = _FlakyMail(failures=1)
+    worker = _worker(mail)
+    assert worker.drain(engine) == 1
+
+    # The retry falls due after the 15-minute token has expired: it is not
+    # sent and its token is cleared
+    after_expiry = datetime.now(timezone.utc) + timedelta(minutes=16)
+    assert worker.drain(engine, now=after_expiry) == 0
+    message = db_session.query(EmailOutbox).one()
+    assert (message.status, message.token) == ("expired", None)
+    assert worker.metrics()["expired"] == 1 and not mail.delivered
+
+
+def test_stop_waits_for_the_batch_in_progress(db_session):
+    user = _user(db_session, "stop@gmail.com")
+    auth_service.create_verification_token(db_session, user)
+    sending, release = threading.Event(), threading.Event()
+
+    class _SlowMail(_FlakyMail):
+        def _send(self, to_email, token, message_id):
+            sending.set()
+            release.wait(5)
+            return super()._send(to_email, token, message_id)
+
+    mail = _SlowMail()
+    worker = _worker(mail, poll_interval=0.01)
+    worker.start(engine)
+    assert sending.wait(5)
+    stopping = threading.Thread(target=worker.stop, daemon=True)
+    stopping.start()
+    release.set()
+    stopping.join(5)
+
+    # The batch recorded its outcome (under the lock stop() no longer holds)
+    assert not stopping.is_alive() and worker.sent == 1
+    assert db_session.query(EmailOutbox).one().status == "sent"
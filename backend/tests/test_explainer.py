@@ -0,0 +1,115 @@
+import numpy as np
+import shap
+
+from app.api.v1.endpoints import students
+from app.core.security import create_access_token, get_password_hash
+from app.ml.explainer import FACTOR_NAMES, RiskExplainer
+from app.ml.risk_classifier import RiskClassifier
+from app.ml.tree_ensemble import CompiledForest
+from app.models.risk_summary import RiskSummary
+from app.models.user import User, UserRole
+from tests.test_risk import _train_model
+
+STUDENT_FEATURES = [0.8, 1.6, 5, 4.2]
+
+
+def _classifier(model):
+    classifier = RiskClassifier(use_lookup_table=False)
+    classifier.set_model(model, version="v1")
+    return classifier
+
+
+def _expected(model, features):
+    model_features = RiskClassifier._to_model_features(
+        np.array([features], dtype=np.float64)
+    )
+    predicted = int(np.argmax(model.predict_proba(model_features)[0]))
+    values = np.abs(shap.TreeExplainer(model).shap_values(model_features))
+    contributions = values[0, :, predicted]
+    return contributions / contributions.sum()
+
+
+def test_explanation_matches_shap_for_both_artifacts():
+    model = _train_model()
+    expected = _expected(model, STUDENT_FEATURES)
+
+    for served in (model, CompiledForest.from_sklearn(model)):
+        explanation = RiskExplainer(_classifier(served)).explain(STUDENT_FEATURES)
+
+        assert list(explanation) == FACTOR_NAMES
+        assert np.allclose(list(explanation.values()), expected)
+        assert abs(sum(explanation.values()) - 1.0) < 1e-9
+
+
+def test_cache_hits_evicts_and_follows_model_version(monkeypatch):
+    classifier = _classifier(_train_model())
+    explainer = RiskExplainer(classifier, cache_size=2)
+    calls = []
+    compute = explainer._compute
+    monkeypatch.setattr(
+        explainer, "_compute", lambda *a: calls.append(a) or compute(*a)
+    )
+
+    first = explainer.explain(STUDENT_FEATURES)
+    assert explainer.explain(STUDENT_FEATURES) is first
+    assert len(calls) == 1
+
+    explainer.explain([0.1, 4.5, 0, 2.0])
+    explainer.explain([0.5, 3.0, 2, 3.0])
+    explainer.explain(STUDENT_FEATURES)  # Evicted as least recently used
+    assert len(calls) == 4
+
+    classifier.set_model(_train_model(seed=1), version="v2")
+    explainer.explain(STUDENT_FEATURES)
+    assert len(calls) == 5
+
+
+def test_schedule_precomputes_in_background(monkeypatch):
+    explainer = RiskExplainer(_classifier(_train_model()))
+    explainer.schedule(STUDENT_FEATURES)
+    explainer._executor.shutdown(wait=True)
+
+    monkeypatch.setattr(explainer, "_compute", None)  # Must not be called
+    assert list(explainer.explain(STUDENT_FEATURES)) == FACTOR_NAMES
+
+
+def test_student_detail_returns_student_explanation(client, db_session, monkeypatch):
+    model = _train_model()
+    monkeypatch.setattr(students, "risk_explainer", RiskExplainer(_classifier(model)))
+    psychologist = User(
+        email="psy_explainer@gmail.com",
+        hashed_password=get_password_hash("psy123"),
+        full_name="Psy Explainer",
+        role=UserRole.PSYCHOLOGIST,
+        is_active=True,
+    )
+    student = User(
+        email="student_explainer@gmail.com",
+        hashed_password=get_password_hash("student123"),
+        full_name="Student Explainer",
+        role=UserRole.STUDENT,
+        is_active=True,
+    )
+    db_session.add_all([psychologist, student])
+    db_session.commit()
+    db_session.add(
+        RiskSummary(
+            user_id=student.id,
+            current_risk_level="High",
+            prediction_confidence=0.9,
+            model_features=STUDENT_FEATURES,
+        )
+    )
+    db_session.commit()
+
+    token = create_access_token(psychologist.id, role=psychologist.role.value)
+    r = client.get(
+        f"/api/v1/students/{student.id}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert r.status_code == 200
+    factors = r.json()["risk_factors"]
+    assert np.allclose(
+        [factors[name] for name in FACTOR_NAMES], _expected(model, STUDENT_FEATURES)
+    )
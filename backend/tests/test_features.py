@@ -0,0 +1,207 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.core.security import create_access_token, get_password_hash
+from app.ml.features import WINDOW_SIZE, feature_store
+from app.models.assessment import Assessment
+from app.models.emotional_checkin import EmotionalCheckin
+from app.models.student_features import StudentFeatures
+from app.models.user import User, UserRole
+from tests.conftest import engine
+
+
+def _student(db_session, email="student_features@gmail.com"):
+    student = User(
+        email=email,
+        hashed_password=get_password_hash("student123"),
+        full_name="Student Features",
+        role=UserRole.STUDENT,
+        is_active=True,
+    )
+    db_session.add(student)
+    db_session.commit()
+    return student
+
+
+def _expected_vector(checkins):
+    """
+    The per-request aggregation AssessmentService used to run.
+    """
+    last = checkins[-WINDOW_SIZE:]
+    if not last:
+        return 3.0, 0, 3.0
+    mood = sum(c.mood_score for c in last) / len(last)
+    bad_days = len([c for c in last if c.mood_score < 3])
+    pressure = sum(
+        c.academic_pressure for c in last if c.academic_pressure is not None
+    ) / len(last)
+    return mood, bad_days, pressure
+
+
+def test_rolling_window_matches_recomputation(db_session):
+    student = _student(db_session)
+    rng = random.Random(7)
+    started = datetime.now(timezone.utc)
+    checkins = []
+
+    assert tuple(feature_store.get_vector(db_session, student.id)) == (3.0, 0, 3.0)
+
+    for day in range(25):
+        checkin = EmotionalCheckin(
+            user_id=student.id,
+            mood_score=rng.randint(1, 5),
+            academic_pressure=rng.choice([None, 1, 2, 3, 4, 5]),
+            created_at=started + timedelta(days=day),
+        )
+        db_session.add(checkin)
+        feature_store.record_checkin(db_session, checkin)
+        db_session.commit()
+        checkins.append(checkin)
+
+        assert tuple(feature_store.get_vector(db_session, student.id)) == (
+            _expected_vector(checkins)
+        )
+
+    row = db_session.get(StudentFeatures, student.id)
+    assert row.checkin_count == WINDOW_SIZE
+    assert row.recent_moods == [c.mood_score for c in checkins[-WINDOW_SIZE:]]
+
+
+def test_missing_row_is_rebuilt_from_history(db_session):
+    student = _student(db_session)
+    started = datetime.now(timezone.utc)
+    checkins = [
+        EmotionalCheckin(
+            user_id=student.id,
+            mood_score=mood,
+            academic_pressure=pressure,
+            created_at=started + timedelta(days=i),
+        )
+        for i, (mood, pressure) in enumerate(
+            [(1, 5), (2, None), (5, 1), (3, 3), (4, 2), (1, 4), (2, 5), (5, 5), (2, 1)]
+        )
+    ]
+    db_session.add_all(checkins)
+    db_session.commit()
+
+    matrix = feature_store.feature_matrix(db_session, [student.id])
+    vector = feature_store.get_vector(db_session, student.id)
+    db_session.commit()
+
+    # Reads compute the window without writing the row
+    assert tuple(matrix[0]) == tuple(vector) == _expected_vector(checkins)
+    assert db_session.get(StudentFeatures, student.id) is None
+
+    # Upserted: a row written meanwhile by another transaction is reused
+    with engine.begin() as conn:
+        conn.execute(
+            StudentFeatures.__table__.insert().values(
+                user_id=student.id, recent_moods=[], recent_pressures=[]
+            )
+        )
+    feature_store.rebuild(db_session, student.id)
+    db_session.commit()
+    features = db_session.get(StudentFeatures, student.id)
+    assert features.recent_moods == [c.mood_score for c in checkins[-WINDOW_SIZE:]]
+    assert tuple(feature_store.get_vector(db_session, student.id)) == tuple(vector)
+
+
+def test_assessment_reads_features_without_checkin_query(client, db_session):
+    student = _student(db_session)
+    pss = Assessment(
+        title="PSS-10 Features",
+        type="PSS-10",
+        items=[{"id": f"q{i}", "text": "..."} for i in range(1, 11)],
+    )
+    db_session.add(pss)
+    db_session.commit()
+    headers = {
+        "Authorization": "Bearer "
+        + create_access_token(student.id, role=student.role.value)
+    }
+
+    for mood in (1, 2, 4):
+        r = client.post(
+            "/api/v1/checkins/",
+            json={"mood_score": mood, "academic_pressure": 4},
+            headers=headers,
+        )
+        assert r.status_code == 200
+
+    row = db_session.get(StudentFeatures, student.id)
+    assert (row.checkin_count, row.mood_sum, row.bad_days) == (3, 7, 2)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.post(
+            "/api/v1/assessments/responses",
+            json={
+                "assessment_id": pss.id,
+                "answers": {f"q{i}": 2 for i in range(1, 11)},
+            },
+            headers=headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert r.status_code == 200
+    assert not any("FROM emotional_checkins" in s for s in statements)
+
+
+def test_missing_rows_are_computed_and_backfilled_in_bulk(db_session):
+    rng = random.Random(3)
+    started = datetime.now(timezone.utc)
+    students = [
+        _student(db_session, f"student_features_{i}@gmail.com") for i in range(6)
+    ]
+    history = {}
+    for n, student in enumerate(students):
+        # From no check-ins to more than a full window
+        history[student.id] = [
+            EmotionalCheckin(
+                user_id=student.id,
+                mood_score=rng.randint(1, 5),
+                academic_pressure=rng.choice([None, 1, 3, 5]),
+                created_at=started + timedelta(days=day),
+            )
+            for day in range(n * 2)
+        ]
+        db_session.add_all(history[student.id])
+    db_session.commit()
+    user_ids = [s.id for s in students]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        matrix = feature_store.feature_matrix(db_session, user_ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 2
+    assert [tuple(v) for v in matrix.tolist()] == [
+        _expected_vector(history[user_id]) for user_id in user_ids
+    ]
+    assert db_session.query(StudentFeatures).count() == 0
+
+    assert feature_store.backfill(db_session, user_ids[:3]) == 3
+    assert feature_store.backfill(db_session, user_ids) == 3
+    db_session.commit()
+    for user_id in user_ids:
+        row = db_session.get(StudentFeatures, user_id)
+        last = history[user_id][-WINDOW_SIZE:]
+        assert row.recent_moods == [c.mood_score for c in last]
+        assert row.checkin_count == len(last)
+    assert [tuple(v) for v in feature_store.feature_matrix(db_session, user_ids)] == [
+        tuple(v) for v in matrix
+    ]
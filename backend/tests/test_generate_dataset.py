@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.generate_enhanced_dataset import (
+    generate_student_data,
+    iter_chunks,
+    write_dataset,
+)
+
+COLUMNS = ["pss_score", "mood_avg", "bad_days_freq", "study_pressure", "risk_level"]
+
+
+def test_rows_columns_and_ranges():
+    data = generate_student_data(n=2000, seed=7)
+
+    assert len(data) == 2000
+    assert list(data.columns) == COLUMNS
+    assert data["pss_score"].between(0, 40).all()
+    assert data["mood_avg"].between(1, 5).all()
+    assert data["bad_days_freq"].between(0, 7).all()
+    assert data["study_pressure"].between(1, 5).all()
+    assert set(data["risk_level"]) <= {0, 1, 2}
+
+
+def test_fixed_seed_is_deterministic():
+    pd.testing.assert_frame_equal(
+        generate_student_data(n=500, seed=3), generate_student_data(n=500, seed=3)
+    )
+    assert not generate_student_data(n=500, seed=3).equals(
+        generate_student_data(n=500, seed=4)
+    )
+    first, second = (
+        pd.concat(iter_chunks(1001, seed=3, chunk_size=250)) for _ in range(2)
+    )
+    assert len(first) == 1001
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_class_mix_is_followed():
+    data = generate_student_data(n=20000, seed=11, class_mix=(1, 0, 1))
+
+    counts = np.bincount(data["risk_level"], minlength=3)
+    assert counts[1] == 0
+    assert abs(counts[0] / len(data) - 0.5) < 0.02
+    with pytest.raises(ValueError):
+        generate_student_data(n=10, class_mix=(1, 1))
+
+
+def test_written_csv_matches_the_chunks(tmp_path):
+    path = str(tmp_path / "train.csv")
+
+    counts = write_dataset(path, n=1200, seed=5, chunk_size=500)
+
+    written = pd.read_csv(path)
+    expected = pd.concat(iter_chunks(1200, seed=5, chunk_size=500), ignore_index=True)
+    assert list(written.columns) == COLUMNS
+    pd.testing.assert_frame_equal(written, expected)
+    assert counts.tolist() == np.bincount(written["risk_level"], minlength=3).tolist()
@@ -0,0 +1,196 @@
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.ml.model_loader import ModelIntegrityError, ModelRegistry
+from app.ml.risk_classifier import FEATURE_COLUMNS, RiskClassifier
+from app.models.user import User, UserRole
+
+
+def _model_file(tmp_path, name, seed):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.uniform(0, 10, (100, 4)), columns=FEATURE_COLUMNS)
+    y = rng.integers(0, 3, 100)
+    model = RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, y)
+    path = tmp_path / name
+    joblib.dump(model, path)
+    return str(path)
+
+
+def test_publish_activate_and_load(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    assert registry.active_version() is None
+
+    version = registry.publish(_model_file(tmp_path, "a.pkl", 0), version="v1")
+    assert registry.list_versions() == ["v1"]
+    assert registry.active_version() is None
+
+    registry.activate("v1")
+    assert registry.active_version() == "v1"
+    assert registry.load(version) is not None
+
+    with pytest.raises(FileExistsError):
+        registry.publish(_model_file(tmp_path, "b.pkl", 1), version="v1")
+    with pytest.raises(FileNotFoundError):
+        registry.activate("v9")
+
+
+def test_load_rejects_tampered_artifact(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish(_model_file(tmp_path, "a.pkl", 0), version="v1")
+
+    with open(registry.artifact_path("v1"), "ab") as f:
+        f.write(b"tampered")
+
+    with pytest.raises(ModelIntegrityError):
+        registry.load("v1")
+
+
+def test_classifier_hot_swaps_active_version(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish(_model_file(tmp_path, "a.pkl", 0), version="v1", activate=True)
+
+    classifier = RiskClassifier(use_lookup_table=False, registry=registry)
+    assert classifier.active.version == "v1"
+    assert classifier.active.source == "registry"
+    old_snapshot = classifier.active
+
+    registry.publish(_model_file(tmp_path, "b.pkl", 1), version="v2", activate=True)
+    monkeypatch.setattr(settings, "ML_MODEL_CHECK_INTERVAL", 0.0)
+    classifier.predict_risk(0.5, 3.0, 2, 3.0)
+    classifier.wait_for_reload(5)
+
+    assert classifier.active.version == "v2"
+    # A reader holding the old snapshot still sees a consistent old model
+    assert old_snapshot.version == "v1"
+    assert old_snapshot.model is not classifier.model
+
+
+def test_classifier_keeps_serving_when_new_version_is_corrupt(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish(_model_file(tmp_path, "a.pkl", 0), version="v1", activate=True)
+    classifier = RiskClassifier(use_lookup_table=False, registry=registry)
+    assert classifier.active.version == "v1"
+
+    registry.publish(_model_file(tmp_path, "b.pkl", 1), version="v2")
+    with open(registry.artifact_path("v2"), "ab") as f:
+        f.write(b"tampered")
+    registry.activate("v2")
+    monkeypatch.setattr(settings, "ML_MODEL_CHECK_INTERVAL", 0.0)
+    classifier.predict_risk(0.5, 3.0, 2, 3.0)
+    classifier.wait_for_reload(5)
+
+    assert classifier.active.version == "v1"
+
+
+def test_reload_never_blocks_predictions(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish(_model_file(tmp_path, "a.pkl", 0), version="v1", activate=True)
+    classifier = RiskClassifier(use_lookup_table=False, registry=registry)
+    assert classifier.active.version == "v1"
+    registry.publish(_model_file(tmp_path, "b.pkl", 1), version="v2", activate=True)
+    monkeypatch.setattr(settings, "ML_MODEL_CHECK_INTERVAL", 0.0)
+
+    # Another thread is reloading: predictions keep the current model and
+    # start no second reload
+    with classifier._reload_lock:
+        classifier.predict_risk(0.5, 3.0, 2, 3.0)
+        assert classifier._reloader is None
+        assert classifier.active.version == "v1"
+
+    classifier.predict_risk(0.5, 3.0, 2, 3.0)
+    classifier.wait_for_reload(5)
+    assert classifier.active.version == "v2"
+
+
+def test_legacy_model_file_is_hashed_once(tmp_path, monkeypatch):
+    from app.ml import model_loader, risk_classifier
+
+    hashed = []
+    file_sha256 = model_loader.file_sha256
+
+    def counting_sha256(path):
+        hashed.append(path)
+        return file_sha256(path)
+
+    monkeypatch.setattr(risk_classifier, "file_sha256", counting_sha256)
+    monkeypatch.setattr(model_loader, "file_sha256", counting_sha256)
+    classifier = RiskClassifier(
+        use_lookup_table=False, registry=ModelRegistry(str(tmp_path / "registry"))
+    )
+    classifier.model_path = _model_file(tmp_path, "legacy.pkl", 0)
+
+    assert classifier.active.source == "file"
+    assert len(hashed) == 1
+
+
+def test_model_endpoint_requires_admin(client, db_session):
+    admin = User(
+        email="admin_model@gmail.com",
+        hashed_password=get_password_hash("admin123"),
+        full_name="Admin Model",
+        role=UserRole.ADMIN,
+        is_active=True,
+    )
+    student = User(
+        email="student_model@gmail.com",
+        hashed_password=get_password_hash("student123"),
+        full_name="Student Model",
+        role=UserRole.STUDENT,
+        is_active=True,
+    )
+    db_session.add_all([admin, student])
+    db_session.commit()
+
+    # Tokens are minted directly to stay clear of the login rate limit
+    token = create_access_token(student.id, role=student.role.value)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/risk/model", headers=headers).status_code == 403
+
+    token = create_access_token(admin.id, role=admin.role.value)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.get("/api/v1/risk/model", headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert "version" in body
+    assert body["source"] in ("registry", "file", "memory", "none")
+
+
+def test_classifier_loads_lazily(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish(_model_file(tmp_path, "a.pkl", 0), version="v1", activate=True)
+
+    classifier = RiskClassifier(use_lookup_table=False, registry=registry)
+    assert not classifier.is_ready
+
+    classifier.warm_up()
+    assert classifier.is_ready
+    assert classifier.load_seconds is not None
+    assert classifier.active.version == "v1"
+
+
+def test_app_import_does_not_load_ml_stack():
+    code = (
+        "import sys, app.main; "
+        "print(any(m in sys.modules for m in ('pandas', 'sklearn', 'joblib')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_health_reports_startup(client):
+    r = client.get("/health")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ok"
+    assert body["startup_seconds"] >= 0
+    assert "model_ready" in body
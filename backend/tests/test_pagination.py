@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.models.audit_log import AuditLog
+from app.models.student_dashboard import StudentDashboard
+from app.utils.pagination import keyset_after
+from tests.conftest import engine
+
+
+def test_keyset_is_a_row_comparison():
+    after = keyset_after(
+        [StudentDashboard.last_assessment_date, StudentDashboard.user_id],
+        [datetime.now(timezone.utc), 5],
+    )
+    before = keyset_after(
+        [AuditLog.timestamp, AuditLog.id], [datetime.now(timezone.utc), 5], True
+    )
+
+    dialect = postgresql.dialect()
+    assert str(after.compile(dialect=dialect)) == (
+        "(student_dashboard.last_assessment_date, student_dashboard.user_id) "
+        "> (%(param_1)s, %(param_2)s)"
+    )
+    assert str(before.compile(dialect=dialect)).startswith(
+        "(audit_logs.timestamp, audit_logs.id) < ("
+    )
+    single = keyset_after([AuditLog.id], [5])
+    assert str(single.compile(dialect=dialect)) == "audit_logs.id > %(id_1)s"
+
+
+def test_deep_page_is_an_index_range(db_session):
+    # Audit log, newest first: the page after a cursor starts inside the
+    # (timestamp, id) index instead of scanning it from the beginning
+    statement = (
+        select(AuditLog.id)
+        .where(
+            keyset_after(
+                [AuditLog.timestamp, AuditLog.id],
+                [datetime.now(timezone.utc), 5],
+                descending=True,
+            )
+        )
+        .order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+        .limit(50)
+    )
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+
+    with engine.connect() as conn:
+        plan = " ".join(
+            row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        )
+
+    assert "SEARCH audit_logs" in plan
+    assert "ix_audit_logs_timestamp_id (timestamp<?)" in plan
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.password_pool import PasswordPool, PasswordPoolBusy, password_pool
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    verify_and_update_password,
+)
+from app.models.user import User
+
+
+def test_hashing_runs_in_worker_processes():
+    before = password_pool.metrics()["completed"]
+
+    hashed = get_password_hash("Password123")
+    assert hashed.startswith("$argon2")
+    assert verify_and_update_password("Password123", hashed) == (True, None)
+    assert verify_and_update_password("otra", hashed) == (False, None)
+
+    metrics = password_pool.metrics()
+    assert metrics["workers"] >= 1
+    assert metrics["completed"] == before + 3
+    assert metrics["hash_p50_ms"] > 0
+
+
+def test_saturated_pool_sheds_calls():
+    pool = PasswordPool(workers=0, max_pending=1)
+    release, running = threading.Event(), threading.Event()
+
+    def slow():
+        running.set()
+        release.wait(5)
+        return "ok"
+
+    thread = threading.Thread(target=lambda: pool.run(slow))
+    thread.start()
+    try:
+        assert running.wait(5)
+        with pytest.raises(PasswordPoolBusy):
+            pool.run(str, "x")
+    finally:
+        release.set()
+        thread.join(5)
+
+    assert pool.run(str, "x") == "x"
+    metrics = pool.metrics()
+    assert (metrics["completed"], metrics["rejected"]) == (2, 1)
+
+
+def test_timed_out_call_answers_busy_and_keeps_its_slot():
+    pool = PasswordPool(workers=1, max_pending=1, timeout=0.2)
+    try:
+        pool.start()
+        with pytest.raises(PasswordPoolBusy):
+            pool.run(time.sleep, 1)
+        # Still running in the worker: the bound holds
+        with pytest.raises(PasswordPoolBusy):
+            pool.run(str, "x")
+        assert pool.metrics()["in_flight"] == 1
+
+        time.sleep(1.5)
+        assert pool.run(str, "x") == "x"
+        metrics = pool.metrics()
+        assert (metrics["timed_out"], metrics["rejected"]) == (1, 1)
+    finally:
+        pool.shutdown()
+
+
+def test_run_async_awaits_the_worker():
+    pool = PasswordPool(workers=1, max_pending=2, timeout=0.2)
+    pool.start()
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        background = asyncio.create_task(ticker())
+        result = await pool.run_async(str, "x")
+        with pytest.raises(PasswordPoolBusy):
+            await pool.run_async(time.sleep, 1)
+        background.cancel()
+        return result, ticks
+
+    try:
+        result, ticks = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert result == "x"
+    # The loop kept running while the worker slept
+    assert ticks >= 10
+
+
+@contextmanager
+def _saturated():
+    for _ in range(password_pool.max_pending):
+        password_pool._slots.acquire()
+    try:
+        yield
+    finally:
+        for _ in range(password_pool.max_pending):
+            password_pool._slots.release()
+
+
+def test_login_answers_503_when_hashing_is_saturated(client, db_session):
+    db_session.add(
+        User(
+            email="storm@gmail.com",
+            hashed_password=get_password_hash("Password123"),
+            full_name="Storm",
+            is_active=True,
+        )
+    )
+    db_session.commit()
+    login = {"username": "storm@gmail.com", "password": "Password123"}
+
+    with _saturated():
+        r = client.post("/api/v1/auth/login", data=login)
+
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert client.post("/api/v1/auth/login", data=login).status_code == 200
+
+
+def test_password_changes_answer_503_when_hashing_is_saturated(client, db_session):
+    user = User(
+        email="changer@gmail.com",
+        hashed_password="x",
+        full_name="Changer",
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    headers = {
+        "Authorization": f"Bearer {create_access_token(user.id, role='student')}"
+    }
+
+    with _saturated():
+        reset = client.post(
+            "/api/v1/auth/reset-password",
+            json={"token": "cualquiera", "new_password": "Password123!"},
+        )
+        update = client.put(
+            "/api/v1/users/me", json={"password": "Password123!"}, headers=headers
+        )
+
+    assert (reset.status_code, update.status_code) == (503, 503)
+    assert update.headers["Retry-After"] == "1"
+    db_session.refresh(user)
+    assert user.hashed_password == "x"
@@ -0,0 +1,78 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.ml.model_loader import ModelRegistry
+from app.ml.pipelines import (
+    REPORT_NAME,
+    CandidateResult,
+    select_candidate,
+    train_pipeline,
+)
+from app.ml.risk_classifier import RiskClassifier
+
+
+def _training_csv(tmp_path, n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "pss_score": rng.integers(0, 41, n),
+            "mood_avg": np.round(rng.uniform(1, 5, n), 2),
+            "bad_days_freq": rng.integers(0, 8, n),
+            "study_pressure": np.round(rng.uniform(1, 10, n), 1),
+        }
+    )
+    df["risk_level"] = np.digitize(df["pss_score"], [14, 27])
+    path = tmp_path / "train.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _candidate(n_estimators, accuracy, p99):
+    return CandidateResult(n_estimators, 4, accuracy, 0.0, p99 / 2, p99, 0.1)
+
+
+def test_select_candidate_respects_latency_budget():
+    results = [
+        _candidate(200, 0.95, 2.0),
+        _candidate(50, 0.93, 0.6),
+        _candidate(25, 0.93, 0.4),
+        _candidate(10, 0.80, 0.1),
+    ]
+
+    assert select_candidate(results).n_estimators == 200
+    assert select_candidate(results, p99_budget_ms=1.0).n_estimators == 25
+    assert select_candidate(results, p99_budget_ms=0.01).n_estimators == 10
+
+
+def test_train_pipeline_publishes_version_with_report(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+
+    report = train_pipeline(
+        _training_csv(tmp_path),
+        param_grid={"n_estimators": [5, 10], "max_depth": [2, None]},
+        cv=2,
+        n_jobs=2,
+        version="v1",
+        activate=True,
+        registry=registry,
+    )
+
+    assert report["version"] == "v1"
+    assert len(report["candidates"]) == 4
+    for candidate in report["candidates"]:
+        assert 0.0 <= candidate["cv_accuracy"] <= 1.0
+        assert 0.0 < candidate["latency_p50_ms"] <= candidate["latency_p99_ms"]
+
+    manifest = registry.manifest("v1")
+    assert manifest["artifact"] == "model.npz"
+    assert manifest["params"]["n_estimators"] == report["selected"]["n_estimators"]
+    with open(os.path.join(registry.root, "v1", REPORT_NAME)) as f:
+        assert json.load(f)["test_accuracy"] == report["test_accuracy"]
+
+    classifier = RiskClassifier(use_lookup_table=False, registry=registry)
+    assert classifier.active.version == "v1"
+    level, _ = classifier.predict_risk(0.9, 1.5, 6, 4.5)
+    assert level == "High"
@@ -0,0 +1,114 @@
+import time
+
+from sqlalchemy import event
+
+from app.core.principal_cache import PrincipalCache, principal_cache
+from app.core.security import create_access_token
+from app.models.tokens import PasswordResetToken
+from app.models.user import User, UserRole
+from app.services.auth_service import auth_service
+from tests.conftest import async_engine, engine
+
+
+def _user(db_session, email, role):
+    user = User(
+        email=email,
+        hashed_password="x",
+        full_name=email.split("@")[0],
+        role=role,
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(user.id, role=user.role.value)
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+def _user_selects(client, url, headers):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # /users/me is an async endpoint
+    engines = (engine, async_engine.sync_engine)
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    try:
+        r = client.get(url, headers=headers)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", record)
+    return r, sum(1 for s in statements if "FROM users" in s)
+
+
+def test_principal_is_read_once_per_token(client, db_session):
+    user, headers = _user(db_session, "student_cache@gmail.com", UserRole.STUDENT)
+
+    r, first = _user_selects(client, "/api/v1/users/me", headers)
+    assert r.status_code == 200 and first == 1
+    r, second = _user_selects(client, "/api/v1/users/me", headers)
+    assert r.status_code == 200 and second == 0
+    assert r.json()["email"] == user.email
+
+    # The cached user is attached to the request session and can be updated
+    r = client.put("/api/v1/users/me", json={"full_name": "Nuevo"}, headers=headers)
+    assert r.status_code == 200
+    r = client.get("/api/v1/users/me", headers=headers)
+    assert r.json()["full_name"] == "Nuevo"
+
+
+def test_admin_changes_invalidate_the_principal(client, db_session):
+    _, admin_headers = _user(db_session, "admin_cache@gmail.com", UserRole.ADMIN)
+    psychologist, headers = _user(
+        db_session, "psy_cache@gmail.com", UserRole.PSYCHOLOGIST
+    )
+    assert client.get("/api/v1/students/", headers=headers).status_code == 200
+
+    r = client.patch(
+        f"/api/v1/users/{psychologist.id}/role",
+        params={"role": "student"},
+        headers=admin_headers,
+    )
+    assert r.status_code == 200
+    assert client.get("/api/v1/students/", headers=headers).status_code == 403
+
+    r = client.patch(f"/api/v1/users/{psychologist.id}/status", headers=admin_headers)
+    assert r.status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 400
+
+    r = client.delete(f"/api/v1/users/{psychologist.id}", headers=admin_headers)
+    assert r.status_code == 204
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 404
+
+
+def test_password_reset_invalidates_the_principal(client, db_session):
+    user, headers = _user(db_session, "student_reset@gmail.com", UserRole.STUDENT)
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    raw_token = headers["Authorization"].removeprefix("Bearer ")
+    assert principal_cache.get(db_session, user.id, raw_token)
+
+    auth_service.request_password_reset(db_session, user.email)
+    # The raw token is only emailed: replace it with a known one
+    token = auth_service._generate_token()
+    reset = db_session.query(PasswordResetToken).one()
+    reset.token_hash = auth_service._hash_token(token)
+    db_session.commit()
+    assert auth_service.reset_password(db_session, token, "new-hash")
+
+    assert principal_cache.get(db_session, user.id, raw_token) is None
+
+
+def test_entries_expire_and_are_evicted(db_session):
+    user, _ = _user(db_session, "student_ttl@gmail.com", UserRole.STUDENT)
+    cache = PrincipalCache(ttl_seconds=0.05, max_size=2)
+
+    cache.put(user.id, "a", user)
+    assert cache.get(db_session, user.id, "a") is user
+    time.sleep(0.06)
+    assert cache.get(db_session, user.id, "a") is None
+
+    for token in ("a", "b", "c"):
+        cache.put(user.id, token, user)
+    assert cache.get(db_session, user.id, "a") is None
+    assert cache.get(db_session, user.id, "c") is user
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from app.core.limiter import rate_limit_metrics
+from app.core.rate_limit import SQLiteStorage
+
+FIVE_PER_MINUTE = parse("5/minute")
+
+
+def _hits(limiter, n, key="10.0.0.1"):
+    return [limiter.hit(FIVE_PER_MINUTE, key, "login") for _ in range(n)]
+
+
+def test_sqlite_counters_are_shared_between_workers(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'limits.db'}"
+    # Two storages on one file stand for two uvicorn workers
+    worker_a = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    worker_b = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+
+    assert _hits(worker_a, 3) == [True] * 3
+    assert _hits(worker_b, 3) == [True, True, False]
+    assert _hits(worker_a, 1) == [False]
+    # Other clients have their own budget
+    assert _hits(worker_b, 1, key="10.0.0.2") == [True]
+
+    stats = worker_a.get_window_stats(FIVE_PER_MINUTE, "10.0.0.1", "login")
+    assert stats.remaining == 0
+    worker_b.clear(FIVE_PER_MINUTE, "10.0.0.1", "login")
+    assert _hits(worker_a, 1) == [True]
+
+
+def test_sqlite_storage_admits_exactly_the_limit_under_contention(tmp_path):
+    storage = SQLiteStorage(f"sqlite:///{tmp_path / 'limits.db'}")
+    limit = parse("20/minute")
+    allowed = []
+
+    def client():
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        for _ in range(10):
+            if limiter.hit(limit, "10.0.0.1"):
+                allowed.append(1)
+
+    threads = [threading.Thread(target=client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(allowed) == 20
+
+
+def test_redis_backend_is_shared():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # the limits Redis storage runs Lua scripts
+    # In-process Redis stand-in; each worker gets its own connection pool
+    server = fakeredis.FakeServer()
+
+    def worker():
+        pool = fakeredis.FakeRedis(server=server).connection_pool
+        storage = storage_from_string("redis://localhost:6379/0", connection_pool=pool)
+        return SlidingWindowCounterRateLimiter(storage)
+
+    worker_a, worker_b = worker(), worker()
+
+    assert _hits(worker_a, 4) == [True] * 4
+    assert _hits(worker_b, 2) == [True, False]
+
+
+def test_login_limit_is_counted(client):
+    rate_limit_metrics.clear()
+    form = {"username": "nadie@gmail.com", "password": "x"}
+
+    codes = [client.post("/api/v1/auth/login", data=form).status_code for _ in range(6)]
+
+    assert codes == [401] * 5 + [429]
+    [(name, counts)] = rate_limit_metrics.snapshot()["limits"].items()
+    assert "login" in name
+    assert counts == {"allowed": 5, "limited": 1}
+    assert client.get("/health").json()["rate_limits"]["storage"] == "memory"
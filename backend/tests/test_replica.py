@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.db import replica
+from app.db.base import Base
+from app.db.replica import ReplicaRouter
+from app.models.alert import Alert
+from app.models.user import User, UserRole
+
+
+def _staff_headers(db_session):
+    psychologist = User(
+        email="psy_replica@gmail.com",
+        hashed_password="x",
+        full_name="Psy Replica",
+        role=UserRole.PSYCHOLOGIST,
+        is_active=True,
+    )
+    db_session.add(psychologist)
+    db_session.commit()
+    token = create_access_token(psychologist.id, role=psychologist.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def replica_uri(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(uri)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.add(Alert(user_id=1, severity="High", message="desde la réplica"))
+        db.commit()
+    engine.dispose()
+    return uri
+
+
+@pytest.fixture
+def use_router(monkeypatch):
+    def install(router):
+        monkeypatch.setattr(deps, "replica_router", router)
+        monkeypatch.setattr(replica, "replica_router", router)
+        return router
+
+    return install
+
+
+def _messages(client, headers):
+    return [a["message"] for a in client.get("/api/v1/alerts/", headers=headers).json()]
+
+
+def test_staff_reads_use_the_replica_until_the_user_writes(
+    client, db_session, replica_uri, use_router
+):
+    router = use_router(ReplicaRouter([replica_uri], max_lag_seconds=60))
+    headers = _staff_headers(db_session)
+    alert = Alert(user_id=1, severity="High", message="en el primario")
+    db_session.add(alert)
+    db_session.commit()
+
+    assert _messages(client, headers) == ["desde la réplica"]
+
+    r = client.put(
+        f"/api/v1/alerts/{alert.id}", json={"is_resolved": True}, headers=headers
+    )
+    assert r.status_code == 200
+    # Read-your-writes: the replica may not have the change yet
+    assert _messages(client, headers) == ["en el primario"]
+    metrics = router.metrics()
+    assert (metrics["replica_reads"], metrics["primary_reads"]) == (1, 1)
+    assert metrics["pinned_users"] == 1
+
+
+def test_lagging_or_unreachable_replicas_are_skipped(replica_uri):
+    lag = {"seconds": 30.0}
+    calls = []
+
+    def probe(connection):
+        calls.append(1)
+        return lag["seconds"]
+
+    router = ReplicaRouter(
+        [replica_uri], max_lag_seconds=5, check_interval=3600, lag_probe=probe
+    )
+    assert router.session_for(1) is None
+    # The measurement is reused until the next check is due
+    lag["seconds"] = 0.0
+    assert router.session_for(1) is None
+    assert len(calls) == 1
+
+    router.check_interval = 0
+    session = router.session_for(1)
+    assert session is not None
+    session.close()
+
+    def unreachable(connection):
+        raise OSError("connection refused")
+
+    down = ReplicaRouter([replica_uri], check_interval=0, lag_probe=unreachable)
+    assert down.session_for(1) is None
+    assert down.metrics()["replicas"][0]["lag_seconds"] is None
+
+
+def test_without_replicas_reads_share_the_primary_session(client, db_session):
+    headers = _staff_headers(db_session)
+
+    r = client.get("/api/v1/reports/aggregated", headers=headers)
+
+    assert r.status_code == 200
+    assert client.get("/health").json()["db_replicas"]["replicas"] == []
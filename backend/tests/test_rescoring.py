@@ -0,0 +1,219 @@
+import json
+
+import pytest
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.alert import Alert
+from app.models.assessment import Assessment
+from app.models.assessment_response import AssessmentResponse
+from app.models.risk_summary import RiskSummary
+from app.models.student_dashboard import StudentDashboard
+from app.models.student_features import StudentFeatures
+from app.models.user import User, UserRole
+from app.services import rescoring_service as rescoring_module
+from app.services.dashboard_service import dashboard_service
+from app.services.rescoring_service import rescoring_service
+from tests.conftest import engine
+from tests.test_risk import _train_model
+
+
+@pytest.fixture
+def model_classifier(monkeypatch):
+    from app.ml.risk_classifier import RiskClassifier
+
+    classifier = RiskClassifier(use_lookup_table=False)
+    classifier.set_model(_train_model(), version="v2")
+    monkeypatch.setattr(rescoring_module, "risk_classifier", classifier)
+    return classifier
+
+
+def _students(db_session, n=7):
+    """
+    Students with a stored prediction (all "Low") and rolling features that
+    range from calm to very bad weeks.
+    """
+    students = []
+    for i in range(n):
+        student = User(
+            email=f"student_rescore_{i}@gmail.com",
+            hashed_password="x",
+            full_name=f"Student {i}",
+            role=UserRole.STUDENT,
+            is_active=True,
+        )
+        db_session.add(student)
+        students.append(student)
+    db_session.commit()
+
+    for i, student in enumerate(students):
+        bad_days = i % 8
+        moods = [1] * bad_days + [5] * (7 - bad_days)
+        db_session.add(
+            StudentFeatures(
+                user_id=student.id,
+                checkin_count=7,
+                mood_sum=sum(moods),
+                bad_days=bad_days,
+                pressure_sum=28,
+                recent_moods=moods,
+                recent_pressures=[4] * 7,
+            )
+        )
+        db_session.add(
+            RiskSummary(
+                user_id=student.id,
+                current_risk_level="Low",
+                prediction_confidence=1.0,
+                model_features=[i / (n - 1), 3.0, 0, 3.0],
+            )
+        )
+    db_session.commit()
+    return students
+
+
+def test_rescore_all_updates_summaries_and_alerts(db_session, model_classifier):
+    students = _students(db_session)
+
+    # Some students already have a dashboard row, the rest are rebuilt
+    dashboard_service.rebuild(db_session, [s.id for s in students[::2]])
+    db_session.commit()
+
+    result = rescoring_service.rescore_all(db_session, chunk_size=3)
+
+    assert result["processed"] == len(students)
+    assert result["completed"]
+    new_high = 0
+    for i, student in enumerate(students):
+        summary = (
+            db_session.query(RiskSummary)
+            .filter(RiskSummary.user_id == student.id)
+            .one()
+        )
+        features = db_session.get(StudentFeatures, student.id)
+        expected = [
+            i / (len(students) - 1),
+            features.mood_sum / 7,
+            features.bad_days,
+            features.pressure_sum / 7,
+        ]
+        level, confidence = model_classifier.predict_risk(*expected)
+        assert summary.current_risk_level == level
+        assert summary.prediction_confidence == confidence
+        assert summary.model_features == expected
+        new_high += level == "High"
+
+    assert new_high > 0
+    assert result["alerts"] == new_high
+    assert db_session.query(Alert).filter(Alert.severity == "High").count() == new_high
+
+    # The staff dashboard follows the new levels and alerts
+    db_session.expire_all()
+    for student in students:
+        summary = (
+            db_session.query(RiskSummary)
+            .filter(RiskSummary.user_id == student.id)
+            .one()
+        )
+        row = db_session.get(StudentDashboard, student.id)
+        if row is None:
+            # Students without a row are only rebuilt when their level changes
+            assert summary.current_risk_level == "Low"
+            continue
+        assert row.risk_level == summary.current_risk_level
+        assert row.active_alerts == (summary.current_risk_level == "High")
+
+    # Nothing changed: a second pass writes nothing
+    again = rescoring_service.rescore_all(db_session, chunk_size=3)
+    assert again["updated"] == 0 and again["alerts"] == 0
+
+
+def test_legacy_summary_uses_latest_pss_response(db_session, model_classifier):
+    student = _students(db_session, n=2)[1]
+    pss = Assessment(title="PSS-10 Rescore", type="PSS-10", items=[])
+    db_session.add(pss)
+    db_session.commit()
+    db_session.add(
+        AssessmentResponse(
+            user_id=student.id,
+            assessment_id=pss.id,
+            answers={},
+            total_score=36.0,
+            risk_level="High",
+        )
+    )
+    summary = (
+        db_session.query(RiskSummary).filter(RiskSummary.user_id == student.id).one()
+    )
+    summary.model_features = None
+    db_session.commit()
+
+    rescoring_service.rescore_all(db_session)
+
+    db_session.refresh(summary)
+    assert summary.model_features[0] == 36.0 / 40.0
+
+
+def test_interrupted_run_resumes_from_checkpoint(
+    db_session, model_classifier, tmp_path
+):
+    students = _students(db_session)
+    checkpoint = str(tmp_path / "rescore.json")
+
+    def interrupt(report):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        rescoring_service.rescore_all(
+            db_session, chunk_size=3, checkpoint_path=checkpoint, progress=interrupt
+        )
+    with open(checkpoint) as f:
+        saved = json.load(f)
+    assert saved["processed"] == 3 and saved["model_version"] == "v2"
+
+    reports = []
+    result = rescoring_service.rescore_all(
+        db_session, chunk_size=3, checkpoint_path=checkpoint, progress=reports.append
+    )
+
+    assert result["processed"] == len(students)
+    assert [r["processed"] for r in reports] == [6, 7]
+    assert reports[-1]["total"] == len(students)
+    # A finished run for the same model version is not repeated
+    assert rescoring_service.rescore_all(
+        db_session, checkpoint_path=checkpoint
+    ) == dict(result, completed=True)
+
+
+def test_rescore_endpoint_requires_admin(client, db_session, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        rescoring_module.rescoring_service, "rescore_all", lambda db: calls.append(db)
+    )
+    admin = User(
+        email="admin_rescore@gmail.com",
+        hashed_password=get_password_hash("admin123"),
+        full_name="Admin Rescore",
+        role=UserRole.ADMIN,
+        is_active=True,
+    )
+    db_session.add(admin)
+    db_session.commit()
+    token = create_access_token(admin.id, role=admin.role.value)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post("/api/v1/risk/rescore", headers=headers)
+
+    assert r.status_code == 202
+    assert r.json()["status"] == "scheduled"
+    assert len(calls) == 1
+
+    # A run in progress (here, the script's) rejects a second one; the lock
+    # is released when the background run ends
+    assert rescoring_service.acquire_run_lock(engine)
+    try:
+        r = client.post("/api/v1/risk/rescore", headers=headers)
+        assert r.status_code == 409
+    finally:
+        rescoring_service.release_run_lock()
+    r = client.post("/api/v1/risk/rescore", headers=headers)
+    assert r.status_code == 202 and len(calls) == 2
@@ -1,4 +1,12 @@
-from app.ml.risk_classifier import risk_classifier
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.core.config import settings
+from app.ml.lookup_table import feature_grid
+from app.ml.risk_classifier import FEATURE_COLUMNS, RiskClassifier, risk_classifier
 
 
 def test_risk_low():
@@ -28,3 +36,143 @@ def test_risk_medium():
     # = 0.15 + 0.15 + 0.084 + 0.1 = 0.484
     # Should be Medium (0.3 < x < 0.6)
     assert risk == "Medium"
+
+
+def _train_model(seed=0):
+    # Small forest on synthetic data so the ML path runs without risk_model.pkl
+    rng = np.random.default_rng(seed)
+    n = 300
+    df = pd.DataFrame(
+        {
+            "pss_score": rng.integers(0, 41, n),
+            "mood_avg": rng.uniform(1, 5, n),
+            "bad_days_freq": rng.integers(0, 8, n),
+            "study_pressure": rng.uniform(2, 10, n),
+        }
+    )
+    y = np.digitize(df["pss_score"] / 40 + df["bad_days_freq"] / 7, [0.7, 1.2])
+    model = RandomForestClassifier(n_estimators=10, max_depth=5, random_state=seed)
+    model.fit(df[FEATURE_COLUMNS], y)
+    return model
+
+
+@pytest.fixture(scope="module")
+def trained_classifier():
+    classifier = RiskClassifier(use_lookup_table=False)
+    classifier.set_model(_train_model())
+    return classifier
+
+
+def _random_rows(n=50, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.column_stack(
+        [
+            rng.integers(0, 41, n) / 40.0,
+            rng.uniform(1, 5, n),
+            rng.integers(0, 8, n),
+            rng.uniform(1, 5, n),
+        ]
+    )
+
+
+def test_batch_matches_single_heuristic():
+    classifier = RiskClassifier()
+    classifier.set_model(None)
+    rows = _random_rows()
+
+    levels, confidences = classifier.predict_risk_batch(rows)
+
+    for row, level, conf in zip(rows, levels, confidences):
+        expected = classifier.predict_risk(*row)
+        assert (level, conf) == expected
+
+
+def test_batch_matches_sklearn_predict(trained_classifier):
+    rows = _random_rows()
+
+    levels, confidences = trained_classifier.predict_risk_batch(rows)
+
+    model_input = pd.DataFrame(
+        np.column_stack(
+            [
+                np.trunc(rows[:, 0] * 40),
+                rows[:, 1],
+                rows[:, 2],
+                rows[:, 3] * 2.0,
+            ]
+        ),
+        columns=FEATURE_COLUMNS,
+    )
+    expected_classes = trained_classifier.model.predict(model_input)
+    expected_probas = trained_classifier.model.predict_proba(model_input)
+
+    assert list(levels) == [["Low", "Medium", "High"][c] for c in expected_classes]
+    assert np.array_equal(
+        confidences, expected_probas[np.arange(len(rows)), expected_classes]
+    )
+
+
+def test_batch_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        risk_classifier.predict_risk_batch(np.zeros((3, 2)))
+
+
+def test_batch_empty():
+    levels, confidences = risk_classifier.predict_risk_batch(np.zeros((0, 4)))
+    assert len(levels) == 0
+    assert len(confidences) == 0
+
+
+def _grid_rows(n=20000, seed=2):
+    # API-scale rows drawn from the discrete grid the lookup table covers
+    pss, mood, bad_days, pressure = feature_grid()
+    rng = np.random.default_rng(seed)
+    return np.column_stack(
+        [
+            rng.choice(pss, n) / 40.0,
+            rng.choice(mood, n),
+            rng.choice(bad_days, n),
+            rng.choice(pressure, n) / 2.0,
+        ]
+    )
+
+
+def test_lookup_table_parity(trained_classifier):
+    table_classifier = RiskClassifier(use_lookup_table=True)
+    table_classifier.set_model(trained_classifier.model)
+    assert table_classifier.lookup_table is not None
+
+    rows = np.vstack([_grid_rows(), _random_rows()])
+    levels, confidences = table_classifier.predict_risk_batch(rows)
+    expected_levels, expected_confidences = trained_classifier.predict_risk_batch(rows)
+
+    assert np.array_equal(levels, expected_levels)
+    assert np.array_equal(confidences, expected_confidences)
+
+
+def test_lookup_table_rebuilt_when_model_file_changes(tmp_path, monkeypatch):
+    model_file = tmp_path / "risk_model.pkl"
+    joblib.dump(_train_model(seed=0), model_file)
+
+    classifier = RiskClassifier(use_lookup_table=True)
+    classifier.model_path = str(model_file)
+    classifier._load_model()
+    first_table = classifier.lookup_table
+    assert first_table is not None
+
+    new_model = _train_model(seed=1)
+    joblib.dump(new_model, model_file)
+    monkeypatch.setattr(settings, "ML_MODEL_CHECK_INTERVAL", 0.0)
+
+    rows = _grid_rows(n=2000)
+    # Triggers the reload; predictions use the old model until the swap
+    classifier.predict_risk_batch(rows)
+    classifier.wait_for_reload(5)
+    levels, confidences = classifier.predict_risk_batch(rows)
+
+    assert classifier.lookup_table is not first_table
+    reference = RiskClassifier(use_lookup_table=False)
+    reference.set_model(new_model)
+    expected_levels, expected_confidences = reference.predict_risk_batch(rows)
+    assert np.array_equal(levels, expected_levels)
+    assert np.array_equal(confidences, expected_confidences)
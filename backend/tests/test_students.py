@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.core.security import create_access_token
+from app.models.alert import Alert
+from app.models.assessment import Assessment
+from app.models.assessment_response import AssessmentResponse
+from app.models.audit_log import AuditLog
+from app.models.risk_summary import RiskSummary
+from app.models.user import User, UserRole
+from app.services.audit_service import audit_writer
+from app.services.dashboard_service import dashboard_service
+from tests.conftest import engine
+
+
+def _staff_headers(db_session):
+    psychologist = User(
+        email="psy_roster@gmail.com",
+        hashed_password="x",
+        full_name="Psy Roster",
+        role=UserRole.PSYCHOLOGIST,
+        is_active=True,
+    )
+    db_session.add(psychologist)
+    db_session.commit()
+    token = create_access_token(psychologist.id, role=psychologist.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _add_students(db_session, n, start=0):
+    """
+    Student i has risk "High" when i is odd, i % 3 unresolved alerts plus one
+    resolved alert, and i assessment responses (the latest i days ago).
+    """
+    assessment = db_session.query(Assessment).first()
+    if assessment is None:
+        assessment = Assessment(title="PSS-10 Roster", type="PSS-10", items=[])
+        db_session.add(assessment)
+        db_session.commit()
+
+    now = datetime.now(timezone.utc)
+    students = []
+    for i in range(start, start + n):
+        student = User(
+            email=f"student_roster_{i}@gmail.com",
+            hashed_password="x",
+            full_name=f"Student {i}",
+            role=UserRole.STUDENT,
+            is_active=True,
+        )
+        db_session.add(student)
+        db_session.flush()
+        if i % 2:
+            db_session.add(RiskSummary(user_id=student.id, current_risk_level="High"))
+        for _ in range(i % 3):
+            db_session.add(Alert(user_id=student.id, severity="High", message="m"))
+        db_session.add(
+            Alert(user_id=student.id, severity="High", message="m", is_resolved=True)
+        )
+        for days_ago in range(i, 2 * i):
+            db_session.add(
+                AssessmentResponse(
+                    user_id=student.id,
+                    assessment_id=assessment.id,
+                    answers={},
+                    total_score=10.0,
+                    risk_level="Low",
+                    created_at=now - timedelta(days=days_ago),
+                )
+            )
+        students.append(student)
+    # Direct inserts bypass the write paths that maintain the dashboard
+    dashboard_service.rebuild(db_session, [s.id for s in students])
+    db_session.commit()
+    return students
+
+
+def _count_queries(client, url, headers):
+    # Authenticate once first, so the principal comes from the cache
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert r.status_code == 200
+    return r, len(statements)
+
+
+def test_roster_summaries(client, db_session):
+    headers = _staff_headers(db_session)
+    students = _add_students(db_session, 4)
+
+    r = client.get("/api/v1/students/?include_total=true", headers=headers)
+
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["total"], body["page"], body["pages"]) == (4, 1, 1)
+    assert body["next_cursor"] is None
+    rows = {row["id"]: row for row in body["items"]}
+    assert set(rows) == {s.id for s in students}
+    for i, student in enumerate(students):
+        row = rows[student.id]
+        assert row["email"] == student.email
+        assert row["risk_level"] == ("High" if i % 2 else "Low")
+        assert row["active_alerts"] == i % 3
+        assert (row["last_assessment_date"] is None) == (i == 0)
+
+
+def test_roster_query_count_does_not_grow_with_students(client, db_session):
+    url = "/api/v1/students/"
+    headers = _staff_headers(db_session)
+    _add_students(db_session, 3)
+    _, small = _count_queries(client, url, headers)
+
+    _add_students(db_session, 30, start=3)
+    _, large = _count_queries(client, url, headers)
+
+    # One roster query (the principal is cached); no count unless asked for
+    assert small == large == 1
+    r, counted = _count_queries(client, url + "?include_total=true", headers)
+    assert counted == 2 and r.json()["total"] == 33
+
+
+def _all_pages(client, headers, **params):
+    ids, pages, cursor = [], [], None
+    while True:
+        query = dict(params, limit=4)
+        if cursor:
+            query["cursor"] = cursor
+        r = client.get("/api/v1/students/", params=query, headers=headers)
+        assert r.status_code == 200
+        body = r.json()
+        ids += [row["id"] for row in body["items"]]
+        pages.append(body["page"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages, body
+
+
+def test_roster_keyset_pages_filters_and_sorts(client, db_session):
+    headers = _staff_headers(db_session)
+    students = _add_students(db_session, 11)
+    ids = [s.id for s in students]
+
+    paged, pages, last = _all_pages(client, headers)
+    assert paged == ids
+    assert pages == [1, 2, 3] and last["pages"] is None and last["total"] is None
+    paged, _, last = _all_pages(client, headers, include_total=True)
+    assert paged == ids and last["pages"] == 3 and last["total"] == 11
+
+    # Most recent assessment first (student i was assessed i days ago); the
+    # student without assessments goes last
+    paged, _, _ = _all_pages(client, headers, sort="last_assessment_desc")
+    assert paged == ids[1:] + ids[:1]
+    paged, _, _ = _all_pages(client, headers, sort="last_assessment_asc")
+    assert paged == ids[:1] + ids[1:][::-1]
+
+    paged, _, last = _all_pages(
+        client, headers, risk_level="High", has_active_alerts=True, include_total=True
+    )
+    expected = [ids[i] for i in range(11) if i % 2 and i % 3]
+    assert paged == expected and last["total"] == len(expected)
+    paged, _, _ = _all_pages(client, headers, has_active_alerts=False)
+    assert paged == [ids[i] for i in range(11) if i % 3 == 0]
+
+
+def test_roster_rejects_bad_cursor_and_filters(client, db_session):
+    headers = _staff_headers(db_session)
+    _add_students(db_session, 5)
+    r = client.get("/api/v1/students/", params={"limit": 2}, headers=headers)
+    cursor = r.json()["next_cursor"]
+
+    for params in (
+        {"cursor": "not-a-cursor"},
+        {"cursor": cursor, "sort": "last_assessment_desc"},
+        {"risk_level": "Extreme"},
+    ):
+        r = client.get("/api/v1/students/", params=params, headers=headers)
+        assert r.status_code == 400
+
+
+def test_detail_caps_history_and_queues_the_audit_entry(client, db_session):
+    headers = _staff_headers(db_session)
+    student = _add_students(db_session, 6)[5]
+    for _ in range(8):
+        db_session.add(Alert(user_id=student.id, severity="High", message="m"))
+    db_session.commit()
+    dashboard_service.rebuild(db_session, [student.id])
+    db_session.commit()
+    url = f"/api/v1/students/{student.id}?alerts_limit=3&responses_limit=2"
+
+    r, small = _count_queries(client, url, headers)
+
+    body = r.json()
+    # 8 + 2 unresolved alerts, 1 resolved, 5 responses
+    assert body["active_alerts"] == 10
+    assert [len(body["alerts"]), body["has_more_alerts"]] == [3, True]
+    assert len(body["assessment_responses"]) == 2
+    assert body["has_more_assessment_responses"]
+    latest = body["assessment_responses"][0]["created_at"]
+    assert body["last_assessment_date"] == latest
+    audit_writer.flush()
+    entry = db_session.query(AuditLog).one()
+    assert (entry.action, entry.resource_id) == (
+        "VIEW_STUDENT_PROFILE",
+        str(student.id),
+    )
+
+    # The statement count does not depend on the history size
+    for _ in range(20):
+        db_session.add(Alert(user_id=student.id, severity="High", message="m"))
+    db_session.commit()
+    _, large = _count_queries(client, url, headers)
+    assert small == large
@@ -0,0 +1,126 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml.model_loader import ModelRegistry, load_model
+from app.ml.risk_classifier import FEATURE_COLUMNS, RiskClassifier
+from app.ml.tree_ensemble import CompiledForest
+
+
+def _fit_forest(seed=0, labels=(0, 1, 2), **params):
+    rng = np.random.default_rng(seed)
+    n = 400
+    X = pd.DataFrame(
+        np.column_stack(
+            [
+                rng.integers(0, 41, n),
+                np.round(rng.uniform(1, 5, n), 2),
+                rng.integers(0, 8, n),
+                np.round(rng.uniform(1, 10, n), 1),
+            ]
+        ),
+        columns=FEATURE_COLUMNS,
+    )
+    y = np.asarray(labels)[rng.integers(0, len(labels), n)]
+    return RandomForestClassifier(random_state=seed, **params).fit(X, y)
+
+
+def _query_rows(n=3000, seed=5):
+    rng = np.random.default_rng(seed)
+    return np.column_stack(
+        [
+            rng.integers(0, 41, n),
+            rng.uniform(0, 6, n),
+            rng.integers(0, 8, n),
+            rng.uniform(0, 11, n),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"n_estimators": 25, "max_depth": 10},
+        {"n_estimators": 10, "max_depth": None},
+        {"n_estimators": 5, "max_depth": 3, "min_samples_leaf": 5},
+    ],
+)
+def test_predict_proba_is_bit_identical(params):
+    forest = _fit_forest(**params)
+    compiled = CompiledForest.from_sklearn(forest)
+    X = _query_rows()
+
+    expected = forest.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    assert np.array_equal(compiled.predict_proba(X), expected)
+    assert np.array_equal(compiled.predict(X), forest.predict(X))
+
+
+def test_non_contiguous_class_labels():
+    forest = _fit_forest(labels=(2, 5, 9), n_estimators=8)
+    compiled = CompiledForest.from_sklearn(forest)
+    X = _query_rows(500)
+
+    assert np.array_equal(compiled.predict(X), forest.predict(X))
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    forest = _fit_forest(n_estimators=8)
+    path = str(tmp_path / "risk_model.npz")
+    CompiledForest.from_sklearn(forest).save(path)
+
+    loaded = load_model(path)
+    X = _query_rows(500)
+
+    assert isinstance(loaded, CompiledForest)
+    assert np.array_equal(loaded.predict_proba(X), forest.predict_proba(X))
+    assert np.array_equal(loaded.feature_importances_, forest.feature_importances_)
+
+
+def test_classifier_serves_compiled_registry_version(tmp_path):
+    forest = _fit_forest(n_estimators=12, max_depth=8)
+    compiled_path = str(tmp_path / "risk_model.npz")
+    CompiledForest.from_sklearn(forest).save(compiled_path)
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish(compiled_path, version="v1", activate=True)
+
+    compiled_classifier = RiskClassifier(use_lookup_table=True, registry=registry)
+    sklearn_classifier = RiskClassifier(use_lookup_table=False)
+    sklearn_classifier.set_model(forest)
+
+    rows = np.column_stack(
+        [
+            _query_rows(1000)[:, 0] / 40.0,
+            np.random.default_rng(1).integers(1, 6, 1000),
+            _query_rows(1000)[:, 2],
+            np.random.default_rng(2).integers(1, 6, 1000),
+        ]
+    )
+    levels, confidences = compiled_classifier.predict_risk_batch(rows)
+    expected_levels, expected_confidences = sklearn_classifier.predict_risk_batch(rows)
+
+    assert compiled_classifier.active.version == "v1"
+    assert compiled_classifier.lookup_table is not None
+    assert np.array_equal(levels, expected_levels)
+    assert np.array_equal(confidences, expected_confidences)
+
+
+def test_compiled_model_runs_without_sklearn(tmp_path):
+    path = str(tmp_path / "risk_model.npz")
+    CompiledForest.from_sklearn(_fit_forest(n_estimators=4)).save(path)
+
+    code = (
+        "import sys\n"
+        "import numpy as np\n"
+        "from app.ml.model_loader import load_model\n"
+        f"model = load_model({path!r})\n"
+        "model.predict_proba(np.array([[20.0, 3.0, 2.0, 6.0]]))\n"
+        "print('sklearn' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -63,6 +63,7 @@ interface StudentDetails {
     is_resolved: boolean;
     created_at: string;
   }[];
+  has_more_alerts?: boolean;
   assessment_responses: {
     id: string;
     assessment_id: number;
@@ -70,6 +71,7 @@ interface StudentDetails {
     risk_level: string;
     created_at: string;
   }[];
+  has_more_assessment_responses?: boolean;
 }
 
 export default function StudentDetailPage() {
@@ -488,6 +490,11 @@ export default function StudentDetailPage() {
                   </div>
                 ))
               )}
+              {student.has_more_alerts && (
+                <p className="text-muted-foreground text-center text-xs">
+                  Mostrando las {student.alerts.length} alertas más recientes.
+                </p>
+              )}
             </div>
           </Card>
 
@@ -532,6 +539,11 @@ export default function StudentDetailPage() {
                 </tbody>
               </table>
             </div>
+            {student.has_more_assessment_responses && (
+              <p className="text-muted-foreground mt-4 text-center text-xs">
+                Mostrando las {student.assessment_responses.length} evaluaciones más recientes.
+              </p>
+            )}
           </Card>
         </div>
       </div>
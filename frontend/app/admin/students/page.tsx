@@ -7,12 +7,15 @@ import { apiClient } from '@/lib/api';
 import { Card } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import Link from 'next/link';
-import type { StudentSummary } from '@/lib/types';
+import type { PaginatedResponse, StudentSummary } from '@/lib/types';
 
 export default function AdminStudentsPage() {
   const { user } = useProtected();
   const [students, setStudents] = useState<StudentSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
   useEffect(() => {
@@ -20,8 +23,13 @@ export default function AdminStudentsPage() {
 
     const fetchStudents = async () => {
       try {
-        const data = await apiClient.getStudents();
-        setStudents(data);
+        // The total is only counted for the first page
+        const data: PaginatedResponse<StudentSummary> = await apiClient.getStudents({
+          include_total: true,
+        });
+        setStudents(data.items);
+        setNextCursor(data.next_cursor ?? null);
+        setTotal(data.total ?? 0);
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Error al cargar estudiantes');
       } finally {
@@ -32,6 +40,22 @@ export default function AdminStudentsPage() {
     fetchStudents();
   }, [user]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const data: PaginatedResponse<StudentSummary> = await apiClient.getStudents({
+        cursor: nextCursor,
+      });
+      setStudents((prev) => [...prev, ...data.items]);
+      setNextCursor(data.next_cursor ?? null);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Error al cargar estudiantes');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <Layout>
@@ -82,7 +106,7 @@ export default function AdminStudentsPage() {
         <div>
           <h1 className="text-foreground font-serif text-4xl font-bold">Estudiantes</h1>
           <p className="text-muted-foreground mt-2">
-            Listado de estudiantes y su nivel de riesgo actual
+            Listado de estudiantes y su nivel de riesgo actual ({total})
           </p>
         </div>
 
@@ -135,6 +159,14 @@ export default function AdminStudentsPage() {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="flex justify-center">
+            <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? 'Cargando...' : 'Cargar más'}
+            </Button>
+          </div>
+        )}
       </div>
     </Layout>
   );
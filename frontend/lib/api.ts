@@ -198,8 +198,12 @@ class APIClient {
     return this.request('GET', `/alerts/?${params.toString()}`);
   }
 
-  async getStudents() {
-    return this.request('GET', '/students/');
+  async getStudents(params?: Record<string, unknown>) {
+    const query = new URLSearchParams();
+    Object.entries(params || {}).forEach(([key, value]) => {
+      if (value !== undefined && value !== null) query.append(key, String(value));
+    });
+    return this.request('GET', `/students/?${query.toString()}`);
   }
 
   async getUsers() {
@@ -64,6 +64,15 @@ export interface RiskSummary {
   active_alerts: number;
 }
 
+export interface PaginatedResponse<T> {
+  items: T[];
+  total?: number | null;
+  page: number;
+  size: number;
+  pages?: number | null;
+  next_cursor?: string | null;
+}
+
 export interface StudentSummary {
   id: string;
   email: string;